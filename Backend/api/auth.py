@@ -8,6 +8,8 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from Backend.database import models
@@ -33,6 +35,11 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with models.AsyncSessionLocal() as db:
+        yield db
+
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -58,6 +65,16 @@ def get_user(db: Session, username: str = None, email: str = None):
     return None
 
 
+async def get_user_async(db: AsyncSession, username: str = None, email: str = None):
+    if username:
+        column, value = models.User.username, username
+    elif email:
+        column, value = models.User.email, email
+    else:
+        return None
+    return await db.scalar(select(models.User).where(column == value).limit(1))
+
+
 def authenticate_user(db: Session, email: str, password: str):
     user = get_user(db, None, email)
     if not user or not verify_password(password, user.hashed_password):
@@ -65,23 +82,40 @@ def authenticate_user(db: Session, email: str, password: str):
     return user
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def token_username(token: str) -> str:
+    """The username a bearer token was issued to; raises a 401 if invalid."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise credentials_exception()
         token_data = TokenData(username=username)
     except JWTError:
-        raise credentials_exception
-    user = get_user(db, username=token_data.username)
+        raise credentials_exception()
+    return token_data.username
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+):
+    user = get_user(db, username=token_username(token))
+    if user is None:
+        raise credentials_exception()
+    return user
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+):
+    user = await get_user_async(db, username=token_username(token))
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
     return user
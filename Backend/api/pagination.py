@@ -0,0 +1,81 @@
+# Backend/api/pagination.py
+"""
+Keyset pagination for the list routes (/courses, /gigs, /history).
+
+A page is read after the key of the previous page's last row, so it reaches
+its first row through the primary key (or an index ending in it) instead of
+walking and discarding the skip rows before it: page N costs what page 1 does.
+When a page is full, the route sets the X-Next-Cursor header to an opaque
+cursor for the next one; the last page has no cursor.
+
+The old skip parameter still works and is used when no cursor is given.
+"""
+
+import base64
+import json
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(order: str, key: int) -> str:
+    raw = json.dumps([order, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str) -> int:
+    """
+    The key in cursor. Raises a 400 if cursor is malformed or was issued for
+    a differently ordered listing, e.g. another search.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, key = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_order != order or type(key) is not int or key < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def page_query(
+    query,
+    id_column,
+    cursor: str | None,
+    skip: int,
+    limit: int,
+    order: str = "id",
+):
+    """
+    (page query, offset) for one page of query, an ORM Query or a select()
+    whose rows have id_column as "id". order is how query is ordered, as
+    fulltext.search_query() reports it: "id" (ascending, applied here),
+    "newest" (id descending) or "rank".
+    """
+    if order == "rank":
+        # bm25-ranked search results are keyed by offset: the ranked matches
+        # are capped at fulltext.RANKED_MATCHES and all scored for any page,
+        # so the offset adds nothing that page 1 does not already pay.
+        start = decode_cursor(cursor, order) if cursor else skip
+        return query.offset(start).limit(limit), start
+    if order == "id":
+        query = query.order_by(id_column)
+    if cursor:
+        after = decode_cursor(cursor, order)
+        query = query.filter(
+            id_column < after if order == "newest" else id_column > after
+        )
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit), skip
+
+
+def set_next_cursor(
+    response: Response, rows, start: int, limit: int, order: str = "id"
+):
+    """Sets the X-Next-Cursor header for the page after rows, if it is full."""
+    if not rows or len(rows) < limit:
+        return
+    next_key = start + len(rows) if order == "rank" else rows[-1].id
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(order, next_key)
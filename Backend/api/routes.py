@@ -1,22 +1,28 @@
 import json
+from contextlib import asynccontextmanager
 from typing import List, Optional
 
-import numpy as np
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import func
+from fastapi.responses import JSONResponse
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from Backend.api import auth
-from Backend.api.auth import get_current_user
+from Backend.api.auth import get_current_user, get_current_user_async
+from Backend.api.pagination import NEXT_CURSOR_HEADER, page_query, set_next_cursor
 from Backend.api.schemas import (
     CareerCreate,
     CareerRead,
     CourseCreate,
     CourseRead,
+    CourseSearchResult,
     DashboardSummary,
     GigCreate,
     GigRead,
+    GigSearchResult,
     LoginRequest,
     ProfileCreate,
     RecommendRequest,
@@ -25,16 +31,31 @@ from Backend.api.schemas import (
     UserCreate,
 )
 from Backend.database import models
+from Backend.database.fulltext import search_query_async
+from Backend.database.migrations import run_migrations
 from Backend.database.models import Quiz, Recommendation
-from model.recommender import get_recommendations, recommender
+from model.encoder import EncoderSaturated
+from model.service import RecommenderNotReady, get_recommendations_async, service
 
-app = FastAPI(title="AI Career Recommendation (Semantic + Auth)")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model in the background so /health answers immediately and
+    # /ready flips once recommendations can be served.
+    run_migrations(models.engine)
+    service.start_warmup()
+    yield
+    service.close()
+
+
+app = FastAPI(title="AI Career Recommendation (Semantic + Auth)", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "X-Reindex-Job"],
 )
 
 
@@ -143,40 +164,175 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready():
+    """
+    Readiness probe: 200 once the recommender model and embeddings are loaded,
+    503 while they are still loading or if loading failed.
+    """
+    readiness = service.readiness()
+    return JSONResponse(readiness, status_code=200 if service.ready else 503)
+
+
+def commit_unique(db: Session, detail: str):
+    """Commits, answering 409 if a unique key (career name, course/gig url) clashes."""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=detail)
+
+
+async def count_rows(db: AsyncSession, query) -> int:
+    return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+
 # Career Endpoints
 
 
+def career_columns(career: CareerCreate) -> dict:
+    columns = career.dict()
+    if columns["resources"] is not None:
+        columns["resources"] = json.dumps(columns["resources"])
+    return columns
+
+
+def career_read(db_career: models.Career) -> models.Career:
+    if isinstance(db_career.resources, str):
+        try:
+            db_career.resources = json.loads(db_career.resources)
+        except Exception:
+            db_career.resources = {}
+    elif db_career.resources is None:
+        db_career.resources = {}
+    return db_career
+
+
+def load_career_records():
+    """The careers table in the shape of data/careers.csv rows."""
+    with models.SessionLocal() as db:
+        careers = db.query(models.Career).order_by(models.Career.id).all()
+        return [
+            {
+                "career_id": career.id,
+                "career_title": career.name,
+                "description": career.description,
+                "skills": career.skills,
+                "personality_match": career.personality_match,
+                "education_requirement": career.education_required,
+                "average_salary_usd": career.salary,
+                "job_outlook": career.job_outlook,
+                "learning_resources": career.resources,
+            }
+            for career in careers
+        ]
+
+
+service.register_career_source(load_career_records)
+
+
+def queue_career_reindex(response: Response, action: str):
+    # The index is rebuilt off the request path; the job id lets clients poll
+    # GET /careers/reindex/{job_id} until the change is searchable.
+    job = service.reindex_careers(action)
+    if job is not None:
+        response.headers["X-Reindex-Job"] = str(job.id)
+
+
 @app.post("/careers", response_model=CareerRead)
-def create_career(career: CareerCreate, db: Session = Depends(auth.get_db)):
-    db_career = models.Career(**career.dict())
+def create_career(
+    career: CareerCreate, response: Response, db: Session = Depends(auth.get_db)
+):
+    db_career = models.Career(**career_columns(career))
     db.add(db_career)
-    db.commit()
+    commit_unique(db, "A career with this name already exists")
     db.refresh(db_career)
-    return db_career
+    queue_career_reindex(response, "create")
+    return career_read(db_career)
+
+
+@app.put("/careers/{career_id}", response_model=CareerRead)
+def update_career(
+    career_id: int,
+    career: CareerCreate,
+    response: Response,
+    db: Session = Depends(auth.get_db),
+):
+    db_career = db.query(models.Career).filter(models.Career.id == career_id).first()
+    if not db_career:
+        raise HTTPException(status_code=404, detail="Career not found")
+    for key, value in career_columns(career).items():
+        setattr(db_career, key, value)
+    commit_unique(db, "A career with this name already exists")
+    db.refresh(db_career)
+    queue_career_reindex(response, "update")
+    return career_read(db_career)
+
+
+@app.delete("/careers/{career_id}", response_model=CareerRead)
+def delete_career(
+    career_id: int,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(auth.get_db),
+):
+    db_career = db.query(models.Career).filter(models.Career.id == career_id).first()
+    if not db_career:
+        raise HTTPException(status_code=404, detail="Career not found")
+    # History keeps the recommendations, no longer pointing at the career.
+    db.execute(
+        update(Recommendation)
+        .where(Recommendation.career_id == career_id)
+        .values(career_id=None)
+    )
+    db.delete(db_career)
+    db.commit()
+    queue_career_reindex(response, "delete")
+    # The career's courses and gigs are deleted with it.
+    background_tasks.add_task(service.refresh_search, "course")
+    background_tasks.add_task(service.refresh_search, "gig")
+    return career_read(db_career)
+
+
+@app.get("/careers/reindex")
+def get_reindex_jobs(limit: int = Query(20, ge=1, le=100)):
+    """Most recent career re-index jobs, newest first."""
+    if service.reindexer is None:
+        return []
+    return [job.to_dict() for job in service.reindexer.recent(limit)]
+
+
+@app.get("/careers/reindex/{job_id}")
+def get_reindex_job(job_id: int):
+    """
+    Status of a career re-index job: queued, running, done or failed, with the
+    rows reused/encoded/dropped by the rebuild that covered it.
+    """
+    job = service.reindexer.get(job_id) if service.reindexer else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Re-index job not found")
+    return job.to_dict()
 
 
 @app.get("/careers", response_model=List[CareerRead])
-def get_careers(db: Session = Depends(auth.get_db)):
-    careers = db.query(models.Career).all()
-    for career in careers:
-        if isinstance(career.resources, str):
-            try:
-                career.resources = json.loads(career.resources)
-            except Exception:
-                career.resources = {}
-        elif career.resources is None:
-            career.resources = {}
-    return careers
+async def get_careers(db: AsyncSession = Depends(auth.get_async_db)):
+    careers = await db.scalars(select(models.Career))
+    return [career_read(career) for career in careers]
 
 
 @app.post("/courses", response_model=CourseRead)
-def create_course(course: CourseCreate, db: Session = Depends(auth.get_db)):
+def create_course(
+    course: CourseCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(auth.get_db),
+):
     tags_string = ", ".join(course.tags) if course.tags else None
 
     db_course = models.Course(**course.dict(exclude={"tags"}), tags=tags_string)
     db.add(db_course)
-    db.commit()
+    commit_unique(db, "This career already has a course with this url")
     db.refresh(db_course)
+    background_tasks.add_task(service.refresh_search, "course")
 
     db_course.tags = parse_tags_string(db_course.tags)
 
@@ -184,8 +340,9 @@ def create_course(course: CourseCreate, db: Session = Depends(auth.get_db)):
 
 
 @app.get("/courses", response_model=List[CourseRead])
-def get_courses(
-    db: Session = Depends(auth.get_db),
+async def get_courses(
+    response: Response,
+    db: AsyncSession = Depends(auth.get_async_db),
     search: Optional[str] = Query(
         None, description="Search term for course title or tags"
     ),
@@ -195,54 +352,58 @@ def get_courses(
     cost_type: Optional[str] = Query(
         None, description="Filter by cost type (e.g., 'Free', 'Paid')"
     ),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor of the previous page; replaces skip"
+    ),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
 ):
     try:
-        courses = db.query(models.Course)
-        print(f"Courses fetched successfully: {courses.count()}")
+        courses = select(models.Course)
+        order = "id"
 
         # Apply filters
         if search:
-            search_term = f"%{search.lower()}%"
-            courses = courses.filter(
-                (func.lower(models.Course.title).like(search_term))
-                | (func.lower(models.Course.tags).like(search_term))
+            courses, order = await search_query_async(
+                db, courses, models.Course, search
             )
-            print(f"After search filter '{search}': {courses.count()}")
 
         if level:
             courses = courses.filter(models.Course.level == level)
-            print(f"After level filter '{level}': {courses.count()}")
 
         if cost_type:
             courses = courses.filter(models.Course.cost_type == cost_type)
-            # print(f"After cost_type filter '{cost_type}': {courses.count()}")
-
-        final_courses = courses.offset(skip).limit(limit).all()
 
-        print(f"Final courses returned: {len(final_courses)}")
+        page, start = page_query(courses, models.Course.id, cursor, skip, limit, order)
+        final_courses = (await db.scalars(page)).all()
+        set_next_cursor(response, final_courses, start, limit, order)
 
         # Convert tags
         for course in final_courses:
             course.tags = parse_tags_string(course.tags)
 
         return final_courses
+    except HTTPException:
+        raise
     except Exception as e:
         print(e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/courses/count")
-def get_courses_count(db: Session = Depends(auth.get_db)):
-    total_courses = db.query(models.Course).count()
+async def get_courses_count(db: AsyncSession = Depends(auth.get_async_db)):
+    total_courses = await count_rows(db, select(models.Course))
     return {"total_courses": total_courses}
 
 
 # get endpoint to retrieve a single course by title
 @app.get("/courses/{title}", response_model=CourseRead)
-def get_course_by_title(title: str, db: Session = Depends(auth.get_db)):
-    course = db.query(models.Course).filter(models.Course.title == title).first()
+async def get_course_by_title(
+    title: str, db: AsyncSession = Depends(auth.get_async_db)
+):
+    course = await db.scalar(
+        select(models.Course).where(models.Course.title == title).limit(1)
+    )
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     course.tags = parse_tags_string(course.tags)
@@ -252,8 +413,8 @@ def get_course_by_title(title: str, db: Session = Depends(auth.get_db)):
 
 # get endpoint to retrieve a course by ID
 @app.get("/courses/{course_id}", response_model=CourseRead)
-def get_course(course_id: int, db: Session = Depends(auth.get_db)):
-    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+async def get_course(course_id: int, db: AsyncSession = Depends(auth.get_async_db)):
+    course = await db.get(models.Course, course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     course.tags = parse_tags_string(course.tags)
@@ -264,7 +425,10 @@ def get_course(course_id: int, db: Session = Depends(auth.get_db)):
 # post endpoint to update a course by ID
 @app.put("/courses/{course_id}", response_model=CourseRead)
 def update_course(
-    course_id: int, course: CourseCreate, db: Session = Depends(auth.get_db)
+    course_id: int,
+    course: CourseCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(auth.get_db),
 ):
     db_course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not db_course:
@@ -273,22 +437,63 @@ def update_course(
     for key, value in course.dict(exclude={"tags"}).items():
         setattr(db_course, key, value)
     db_course.tags = tags_string
-    db.commit()
+    commit_unique(db, "This career already has a course with this url")
     db.refresh(db_course)
+    background_tasks.add_task(service.refresh_search, "course")
     db_course.tags = parse_tags_string(db_course.tags)
     return db_course
 
 
 @app.delete("/courses/{course_id}", response_model=CourseRead)
-def delete_course(course_id: int, db: Session = Depends(auth.get_db)):
+def delete_course(
+    course_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(auth.get_db),
+):
     db_course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not db_course:
         raise HTTPException(status_code=404, detail="Course not found")
     db.delete(db_course)
     db.commit()
+    background_tasks.add_task(service.refresh_search, "course")
+    db_course.tags = parse_tags_string(db_course.tags)
     return db_course
 
 
+def add_link(
+    db: Session, link_table, row_column, row_id: int, counter, user_id, detail
+):
+    """
+    Links user_id to a course or gig with one INSERT into link_table and bumps
+    the row's counter in the same transaction; 400 if the link exists already.
+    """
+    try:
+        db.execute(insert(link_table).values({"user_id": user_id, row_column: row_id}))
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=detail)
+    model = counter.class_
+    db.execute(
+        update(model)
+        .where(model.id == row_id)
+        .values({counter.key: func.coalesce(counter, 0) + 1})
+    )
+    db.commit()
+
+
+def enroll_user(db: Session, course: models.Course, user: models.User):
+    add_link(
+        db,
+        models.user_courses_table,
+        "course_id",
+        course.id,
+        models.Course.count_students,
+        user.id,
+        "User already enrolled in this course",
+    )
+    return {"message": "User enrolled successfully"}
+
+
 @app.post("/courses/{course_title}/enroll")
 def enroll_in_course_by_title(
     course_title: str,
@@ -298,30 +503,7 @@ def enroll_in_course_by_title(
     course = db.query(models.Course).filter(models.Course.title == course_title).first()
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-
-    if isinstance(course.students_enrolled, str):
-        try:
-            course.students_enrolled = json.loads(course.students_enrolled)
-        except json.JSONDecodeError:
-            course.students_enrolled = []
-    elif course.students_enrolled is None:
-        course.students_enrolled = []
-    if not isinstance(course.students_enrolled, list):
-        raise HTTPException(
-            status_code=500, detail="Invalid students_enrolled format in course data"
-        )
-
-    # Check if the user is already enrolled
-    if current_user.id in course.students_enrolled:
-        raise HTTPException(
-            status_code=400, detail="User already enrolled in this course"
-        )
-    course.students_enrolled.append(current_user.id)
-    course.students_enrolled = json.dumps(course.students_enrolled)
-    db.add(course)
-    db.commit()
-
-    return {"message": "User enrolled successfully"}
+    return enroll_user(db, course, current_user)
 
 
 # post endpoint for user enrollment
@@ -334,70 +516,40 @@ def enroll_in_course(
     course = db.query(models.Course).filter(models.Course.id == course_id).first()
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-
-    if isinstance(course.students_enrolled, str):
-        try:
-            course.students_enrolled = json.loads(course.students_enrolled)
-        except json.JSONDecodeError:
-            course.students_enrolled = []
-    elif course.students_enrolled is None:
-        course.students_enrolled = []
-    if not isinstance(course.students_enrolled, list):
-        raise HTTPException(
-            status_code=500, detail="Invalid students_enrolled format in course data"
-        )
-    if current_user.id in course.students_enrolled:
-        raise HTTPException(
-            status_code=400, detail="User already enrolled in this course"
-        )
-
-    # Enroll the user
-    course.students_enrolled.append(current_user.username)
-    course.students_enrolled = json.dumps(course.students_enrolled)
-    db.add(course)
-    db.commit()
-
-    return {"message": "User enrolled successfully"}
+    return enroll_user(db, course, current_user)
 
 
-@app.get("/users/{user_id}/courses", response_model=List[CourseRead])
-def get_user_courses(user_id: int, db: Session = Depends(auth.get_db)):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # Assuming students_enrolled is a list of user IDs in the Course model
+def enrolled_courses(db: Session, user_id: int) -> list[models.Course]:
+    """A user's courses, looked up through the user_courses primary key."""
     courses = (
         db.query(models.Course)
-        .filter(models.Course.students_enrolled.contains(user_id))
+        .join(
+            models.user_courses_table,
+            models.user_courses_table.c.course_id == models.Course.id,
+        )
+        .filter(models.user_courses_table.c.user_id == user_id)
         .all()
     )
-
     # Convert tags string to list for response
     for course in courses:
         course.tags = parse_tags_string(course.tags)
-
     return courses
 
 
+@app.get("/users/{user_id}/courses", response_model=List[CourseRead])
+def get_user_courses(user_id: int, db: Session = Depends(auth.get_db)):
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return enrolled_courses(db, user.id)
+
+
 @app.get("/users/{username}/courses")
 def get_user_courses_by_username(username: str, db: Session = Depends(auth.get_db)):
     user = db.query(models.User).filter(models.User.username == username).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-
-    # Assuming students_enrolled is a list of user IDs in the Course model
-    courses = (
-        db.query(models.Course)
-        .filter(models.Course.students_enrolled.contains(user.id))
-        .all()
-    )
-
-    # Convert tags string to list for response
-    for course in courses:
-        course.tags = parse_tags_string(course.tags)
-
-    return courses
+    return enrolled_courses(db, user.id)
 
 
 # Ratings & ReviewS
@@ -433,17 +585,23 @@ def get_course_rating(course_title: int, db: Session = Depends(auth.get_db)):
 
 # Gig Endpoints
 @app.post("/gigs", response_model=GigRead)
-def create_gig(gig: GigCreate, db: Session = Depends(auth.get_db)):
+def create_gig(
+    gig: GigCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(auth.get_db),
+):
     db_gig = models.Gig(**gig.dict())
     db.add(db_gig)
-    db.commit()
+    commit_unique(db, "This career already has a gig with this url")
     db.refresh(db_gig)
+    background_tasks.add_task(service.refresh_search, "gig")
     return db_gig
 
 
 @app.get("/gigs", response_model=List[GigRead])
-def get_gigs(
-    db: Session = Depends(auth.get_db),
+async def get_gigs(
+    response: Response,
+    db: AsyncSession = Depends(auth.get_async_db),
     search: Optional[str] = Query(
         None, description="Search term for gig title, description, or required skills"
     ),
@@ -453,45 +611,61 @@ def get_gigs(
     location: Optional[str] = Query(
         None, description="Filter by gig location (e.g., 'Remote', 'New York')"
     ),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor of the previous page; replaces skip"
+    ),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
 ):
-    gigs = db.query(models.Gig)
+    gigs = select(models.Gig)
+    order = "id"
     if search:
-        search_term = f"%{search.lower()}%"
-        gigs = gigs.filter(
-            (func.lower(models.Gig.title).like(search_term))
-            | (func.lower(models.Gig.description).like(search_term))
-            | (func.lower(models.Gig.required_skills).like(search_term))
-        )
+        gigs, order = await search_query_async(db, gigs, models.Gig, search)
     if category:
         gigs = gigs.filter(models.Gig.category == category)
     if location:
         gigs = gigs.filter(models.Gig.location.ilike(f"%{location}%"))
-    gigs = gigs.offset(skip).limit(limit).all()
+    page, start = page_query(gigs, models.Gig.id, cursor, skip, limit, order)
+    gigs = (await db.scalars(page)).all()
+    set_next_cursor(response, gigs, start, limit, order)
     return gigs
 
 
 @app.get("/gigs/id/{gig_id}", response_model=GigRead)
-def get_gig(gig_id: int, db: Session = Depends(auth.get_db)):
-    gig = db.query(models.Gig).filter(models.Gig.id == gig_id).first()
+async def get_gig(gig_id: int, db: AsyncSession = Depends(auth.get_async_db)):
+    gig = await db.get(models.Gig, gig_id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
     return gig
 
 
 @app.get("/gigs/title/{gig_title}", response_model=GigRead)
-def get_gig_by_title(gig_title: str, db: Session = Depends(auth.get_db)):
-    gig = (
-        db.query(models.Gig)
-        .filter(func.lower(models.Gig.title) == gig_title.lower())
-        .first()
+async def get_gig_by_title(
+    gig_title: str, db: AsyncSession = Depends(auth.get_async_db)
+):
+    gig = await db.scalar(
+        select(models.Gig)
+        .where(func.lower(models.Gig.title) == gig_title.lower())
+        .limit(1)
     )
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
     return gig
 
 
+def apply_user(db: Session, gig: models.Gig, user: models.User):
+    add_link(
+        db,
+        models.gig_applications_table,
+        "gig_id",
+        gig.id,
+        models.Gig.count_applicants,
+        user.id,
+        "User has already applied for this gig",
+    )
+    return {"message": f"Successfully applied for gig '{gig.title}'"}
+
+
 # POST ENDPOINT FOR USER TO APPLY FOR A GIG
 @app.post("/gigs/id/{gig_id}/apply")
 def apply_for_gig(
@@ -502,25 +676,7 @@ def apply_for_gig(
     gig = db.query(models.Gig).filter(models.Gig.id == gig_id).first()
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
-
-    applicants_list = (
-        [applicant.strip() for applicant in gig.applicants.split(",")]
-        if gig.applicants
-        else []
-    )
-
-    if current_user.username in applicants_list:
-        raise HTTPException(
-            status_code=400, detail="User has already applied for this gig"
-        )
-
-    applicants_list.append(current_user.username)
-    gig.applicants = ", ".join(applicants_list)
-    db.add(gig)
-    db.commit()
-    db.refresh(gig)
-
-    return {"message": f"Successfully applied for gig '{gig.title}'"}
+    return apply_user(db, gig, current_user)
 
 
 @app.post("/gigs/title/{gig_title}/apply")
@@ -532,23 +688,7 @@ def apply_for_gig_by_title(
     gig = db.query(models.Gig).filter(models.Gig.title == gig_title).first()
     if not gig:
         raise HTTPException(status_code=404, detail=f"Gig '{gig_title}' not found")
-    applicants_list = (
-        [applicant.strip() for applicant in gig.applicants.split(",")]
-        if gig.applicants
-        else []
-    )
-
-    if current_user.username in applicants_list:
-        raise HTTPException(
-            status_code=400, detail="User has already applied for this gig"
-        )
-
-    applicants_list.append(current_user.username)
-    gig.applicants = ", ".join(applicants_list)
-    db.add(gig)
-    db.commit()
-    db.refresh(gig)
-    return {"message": f"Successfully applied for gig '{gig.title}'"}
+    return apply_user(db, gig, current_user)
 
 
 @app.get("/users/{user_id}/gigs", response_model=List[GigRead])
@@ -556,170 +696,318 @@ def get_user_gigs(user_id: int, db: Session = Depends(auth.get_db)):
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    # Index lookup on the gig_applications primary key (user_id, gig_id).
     gigs = (
         db.query(models.Gig)
-        .filter(models.Gig.applicants.ilike(f"%{user.username}%"))
+        .join(
+            models.gig_applications_table,
+            models.gig_applications_table.c.gig_id == models.Gig.id,
+        )
+        .filter(models.gig_applications_table.c.user_id == user.id)
         .all()
     )
     if not gigs:
         raise HTTPException(status_code=404, detail="No gigs found for this user")
-    for gig in gigs:
-        if gig.applicants:
-            gig.applicants_list = [
-                applicant.strip() for applicant in gig.applicants.split(",")
-            ]
-        else:
-            gig.applicants_list = []
     return gigs
 
 
 # Dashboard Endpoints
+
+
+def dashboard_summary_query(user_id: int):
+    """
+    The business dashboard of user_id as one aggregate over the gigs they
+    posted: statuses are counted with conditional sums and applicants come
+    from each gig's maintained count_applicants, so no gig is loaded into
+    Python.
+    """
+    gig = models.Gig
+    completed = gig.status == "Completed"
+    return (
+        select(
+            func.count(gig.id).label("posted_gigs"),
+            func.coalesce(func.sum(gig.count_applicants), 0).label("total_applicants"),
+            func.coalesce(
+                func.sum(case((gig.status == "Active", 1), else_=0)), 0
+            ).label("active_gigs"),
+            func.coalesce(func.sum(case((completed, 1), else_=0)), 0).label(
+                "completed_gigs"
+            ),
+            func.coalesce(func.sum(case((completed, gig.budget_max_usd))), 0).label(
+                "total_revenue"
+            ),
+        )
+        .select_from(models.user_gigs_table)
+        .join(gig, gig.id == models.user_gigs_table.c.gig_id)
+        .where(models.user_gigs_table.c.user_id == user_id)
+    )
+
+
 @app.get("/Userdashboard/summary", response_model=DashboardSummary)
-def get_dashboard_summary(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(auth.get_db),
+async def get_dashboard_summary(
+    current_user: models.User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(auth.get_async_db),
 ):
-    from Backend.database.models import user_gigs_table  # Import association table
-
     """
     Retrieves summary statistics for the user's dashboard.
     Includes total posted gigs, total applicants, active gigs, completed gigs,
     total revenue, and average rating.
     """
-
     if current_user.type.lower() != "business":
         raise HTTPException(
             status_code=403,
             detail="Access denied. This endpoint is for business users only.",
         )
 
-    posted_gigs_query = (
-        db.query(models.Gig)
-        .join(user_gigs_table, models.Gig.id == user_gigs_table.c.gig_id)
-        .filter(user_gigs_table.c.user_id == current_user.id)
-    )
+    summary = (await db.execute(dashboard_summary_query(current_user.id))).one()
+    return {
+        **summary._asdict(),
+        # Gigs are not rated yet; there is no rating column to average.
+        "avg_rating": 0.0,
+    }
 
-    posted_gigs_list = posted_gigs_query.all()
-    posted_gigs_count = len(posted_gigs_list)
 
-    active_gigs_count = (
-        db.query(models.Gig)
-        .join(user_gigs_table, models.Gig.id == user_gigs_table.c.gig_id)
-        .filter(
-            user_gigs_table.c.user_id == current_user.id,
-            models.Gig.status == "Active",
-        )
-        .count()
+@app.get("/dashboard/my_gigs", response_model=List[GigRead])
+async def get_my_gigs(
+    db: AsyncSession = Depends(auth.get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+):
+    """
+    Retrieves all gigs posted by the currently authenticated user.
+    """
+    gigs = await db.scalars(
+        select(models.Gig).where(models.Gig.company == current_user.username)
     )
+    return gigs.all()
 
-    total_applicants = 0
-    for gig in posted_gigs_list:
-        applicants_list = (
-            [a.strip() for a in gig.applicants.split(",")] if gig.applicants else []
-        )
-        total_applicants += len(applicants_list)
 
-    completed_gigs_count = (
-        db.query(models.Gig)
-        .join(user_gigs_table, models.Gig.id == user_gigs_table.c.gig_id)
-        .filter(
-            user_gigs_table.c.user_id == current_user.id,
-            models.Gig.status == "Completed",
-        )
-        .count()
-    )
+# Semantic Search Endpoints
 
-    total_invested = (
-        db.query(func.sum(models.Gig.budget_max_usd))
-        .join(user_gigs_table, models.Gig.id == user_gigs_table.c.gig_id)
-        .filter(
-            user_gigs_table.c.user_id == current_user.id,
-            models.Gig.status == "Completed",
-        )
-        .scalar()
-        or 0
-    )
 
-    average_rating = (
-        np.mean([gig.rating for gig in posted_gigs_list if gig.rating is not None])
-        if posted_gigs_list
-        else 0.0
-    )
+def load_course_search_rows():
+    with models.SessionLocal() as db:
+        rows = db.query(
+            models.Course.id,
+            models.Course.title,
+            models.Course.description,
+            models.Course.tags,
+            models.Course.level,
+        ).all()
+    return [
+        (row.id, " ".join(str(value) for value in row[1:] if value)) for row in rows
+    ]
 
-    return {
-        "posted_gigs": posted_gigs_count,
-        "total_applicants": total_applicants,
-        "active_gigs": active_gigs_count,
-        "completed_gigs": completed_gigs_count,
-        "total_revenue": total_invested,
-        "avg_rating": average_rating,
+
+def load_gig_search_rows():
+    with models.SessionLocal() as db:
+        rows = db.query(
+            models.Gig.id,
+            models.Gig.title,
+            models.Gig.description,
+            models.Gig.required_skills,
+            models.Gig.category,
+        ).all()
+    return [
+        (row.id, " ".join(str(value) for value in row[1:] if value)) for row in rows
+    ]
+
+
+service.register_search_source("course", load_course_search_rows)
+service.register_search_source("gig", load_gig_search_rows)
+
+
+async def ranked_rows(name: str, model, q: str, limit: int, db: AsyncSession):
+    """
+    (row, similarity_score) pairs of the `limit` rows of `model` most similar
+    to q, best first. Rows deleted since the index was built are skipped.
+    """
+    try:
+        ranked = await service.search_async(name, q, limit)
+    except RecommenderNotReady:
+        raise HTTPException(
+            status_code=503, detail="Search index not loaded. Please try again later."
+        )
+    except EncoderSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Search service is busy. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    ids = [row_id for row_id, _ in ranked]
+    rows = {
+        row.id: row for row in await db.scalars(select(model).where(model.id.in_(ids)))
     }
+    return [(rows[row_id], score) for row_id, score in ranked if row_id in rows]
 
 
-@app.get("/dashboard/my_gigs", response_model=List[GigRead])
-def get_my_gigs(
-    db: Session = Depends(auth.get_db),
-    current_user: models.User = Depends(get_current_user),
+@app.get("/search/courses", response_model=List[CourseSearchResult])
+async def search_courses(
+    q: str = Query(..., min_length=1, description="Free-text description"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(auth.get_async_db),
 ):
     """
-    Retrieves all gigs posted by the currently authenticated user.
+    Courses ranked by semantic similarity to q (title, description, tags and
+    level are embedded), instead of a LIKE scan over the table.
     """
-    gigs = (
-        db.query(models.Gig).filter(models.Gig.company == current_user.username).all()
-    )
-    return gigs
+    results = []
+    for course, score in await ranked_rows("course", models.Course, q, limit, db):
+        course.tags = parse_tags_string(course.tags)
+        results.append(
+            {
+                **CourseRead.model_validate(course).model_dump(),
+                "similarity_score": score,
+            }
+        )
+    return results
+
+
+@app.get("/search/gigs", response_model=List[GigSearchResult])
+async def search_gigs(
+    q: str = Query(..., min_length=1, description="Free-text description"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(auth.get_async_db),
+):
+    """
+    Gigs ranked by semantic similarity to q (title, description, required
+    skills and category are embedded).
+    """
+    return [
+        {**GigRead.model_validate(gig).model_dump(), "similarity_score": score}
+        for gig, score in await ranked_rows("gig", models.Gig, q, limit, db)
+    ]
 
 
 # Recommendation Endpoints
 
+# /history title of a recommendation whose career has since been deleted.
+DELETED_CAREER_TITLE = "Career no longer available"
+
+
+async def save_recommendations(db: AsyncSession, user_id: int, quiz_answers: str, recs):
+    quiz_entry = Quiz(quiz_answers=quiz_answers, user_id=user_id)
+    db.add(quiz_entry)
+    await db.flush()
+
+    # Only a reference to each career is stored; /history joins the rest.
+    rows = [
+        {
+            "user_id": user_id,
+            "quiz_id": quiz_entry.id,
+            "career_id": rec["career_id"],
+            "rank": rank,
+            "similarity_score": rec["similarity_score"],
+        }
+        for rank, rec in enumerate(recs, start=1)
+        if rec.get("career_id") is not None
+    ]
+    if rows:
+        await db.execute(insert(Recommendation), rows)
+    await db.commit()
+
 
 @app.post("/recommend", response_model=RecommendResponse)
-def recommend(
+async def recommend(
     payload: RecommendRequest,
-    db: Session = Depends(auth.get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(auth.get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ):
     if not payload.quiz_answers.strip():
         raise HTTPException(status_code=400, detail="quiz_answers required")
 
-    # Use the pre-initialized recommender instance here!
-    if recommender is None:
+    # Awaited rather than run in the threadpool: encoding happens in the
+    # encoder service, so this request holds no worker thread meanwhile.
+    try:
+        recs = await get_recommendations_async(
+            payload.quiz_answers,
+            top_n=5,
+            filters=(
+                payload.filters.model_dump(exclude_none=True)
+                if payload.filters
+                else None
+            ),
+            field_weights=(
+                payload.field_weights.model_dump(exclude_none=True)
+                if payload.field_weights
+                else None
+            ),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RecommenderNotReady:
         raise HTTPException(
             status_code=503,
             detail="Recommender model not loaded. Please try again later.",
         )
+    except EncoderSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Recommendation service is busy. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
 
-    recs = get_recommendations(payload.quiz_answers, top_n=5)
-
-    quiz_entry = Quiz(quiz_answers=payload.quiz_answers, user_id=current_user.id)
-    db.add(quiz_entry)
-    db.commit()
-    db.refresh(quiz_entry)
+    await save_recommendations(db, current_user.id, payload.quiz_answers, recs)
+    return {"recommendations": recs}
 
-    for rec in recs:
-        rec["learning_resources"] = json.dumps(rec.get("learning_resources", {}))
-        db.add(Recommendation(user_id=current_user.id, quiz_id=quiz_entry.id, **rec))
-    db.commit()
 
-    return {"recommendations": recs}
+@app.get("/recommend/stats")
+def recommend_stats():
+    """
+    Batch-size and queue-wait histograms of the recommendation micro-batcher,
+    hit/miss/eviction counters of the quiz-text query cache and encoder load.
+    """
+    if not service.ready:
+        raise HTTPException(status_code=503, detail="Recommender model not loaded.")
+    return {
+        **service.batcher.stats(),
+        "query_cache": service.recommender.query_cache.stats(),
+        "encoder": service.encoder.stats(),
+        "search": service.index_manager.stats(),
+    }
 
 
 @app.get("/history")
-def get_user_history(
-    db: Session = Depends(auth.get_db),
-    current_user: models.User = Depends(get_current_user),
+async def get_user_history(
+    response: Response,
+    db: AsyncSession = Depends(auth.get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor of the previous page; replaces skip"
+    ),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
 ):
     history = (
-        db.query(Recommendation).filter(Recommendation.user_id == current_user.id).all()
+        select(
+            Recommendation.id,
+            Recommendation.career_id,
+            Recommendation.rank,
+            Recommendation.similarity_score,
+            models.Career.name,
+            models.Career.description,
+            models.Career.salary,
+        )
+        # Outer join, so rows whose career has since been deleted still show.
+        .outerjoin(models.Career, Recommendation.career_id == models.Career.id)
+        .where(Recommendation.user_id == current_user.id)
     )
+    page, start = page_query(history, Recommendation.id, cursor, skip, limit)
+    history = (await db.execute(page)).all()
+    set_next_cursor(response, history, start, limit)
 
     results = []
     for rec in history:
         results.append(
             {
-                "career_title": rec.career_title,
+                "career_id": rec.career_id,
+                "career_title": (
+                    rec.name if rec.name is not None else DELETED_CAREER_TITLE
+                ),
                 "description": rec.description,
-                "salary": rec.average_salary_usd,
+                "salary": rec.salary,
+                "rank": rec.rank,
+                "similarity_score": rec.similarity_score,
             }
         )
     return results
@@ -1,14 +1,40 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class RecommendFilters(BaseModel):
+    min_salary: Optional[float] = None
+    max_salary: Optional[float] = None
+    # Lowest degree the career accepts, e.g. max_education="master" excludes
+    # careers that require a doctorate.
+    min_education: Optional[
+        Literal["high_school", "associate", "bachelor", "master", "doctorate"]
+    ] = None
+    max_education: Optional[
+        Literal["high_school", "associate", "bachelor", "master", "doctorate"]
+    ] = None
+    min_outlook: Optional[
+        Literal["limited", "varies", "steady", "growing", "high", "very_high"]
+    ] = None
+
+
+class FieldWeights(BaseModel):
+    # Relative weights; they are scaled to sum to 1 before scoring.
+    description: Optional[float] = Field(None, ge=0)
+    skills: Optional[float] = Field(None, ge=0)
+    personality_match: Optional[float] = Field(None, ge=0)
 
 
 class RecommendRequest(BaseModel):
     quiz_answers: str
     top_n: int = 5
+    filters: Optional[RecommendFilters] = None
+    field_weights: Optional[FieldWeights] = None
 
 
 class CareerItem(BaseModel):
+    career_id: Optional[int] = None
     career_title: str
     description: str
     skills: str
@@ -47,6 +73,10 @@ class CareerBase(BaseModel):
     description: str
     salary: Optional[float] = None
     resources: Optional[Dict] = None
+    skills: Optional[str] = None
+    personality_match: Optional[str] = None
+    education_required: Optional[str] = None
+    job_outlook: Optional[str] = None
 
 
 class CareerCreate(CareerBase):
@@ -68,7 +98,6 @@ class CourseBase(BaseModel):
     description: str
     tags: Optional[List[str]] = None
     rating: Optional[float] = None
-    students_enrolled: Optional[str | int] = None
     count_students: Optional[int] = None  # Added count_students_enrolled field
     duration_weeks: Optional[int] = None
     cost_type: Optional[str] = None
@@ -88,6 +117,10 @@ class CourseRead(CourseBase):
         from_attributes = True
 
 
+class CourseSearchResult(CourseRead):
+    similarity_score: float
+
+
 # ----------------------------------------
 # UPDATED GIG SCHEMAS TO MATCH YOUR MODEL
 # ----------------------------------------
@@ -99,7 +132,6 @@ class GigBase(BaseModel):
     budget_max_usd: Optional[float] = None
     duration_weeks: Optional[int | str] = None
     location: Optional[str | int] = None  # Updated to be optional as per your model
-    applicants: Optional[int | str] = None
     count_applicants: Optional[int | str] = None
     required_skills: Optional[str | int] = None
     category: Optional[str | int] = None
@@ -120,6 +152,10 @@ class GigRead(GigBase):
         from_attributes = True
 
 
+class GigSearchResult(GigRead):
+    similarity_score: float
+
+
 class QuizResponseBase(BaseModel):
     user_id: int
     answers: str  # Change to string to match quiz_answers field
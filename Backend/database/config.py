@@ -0,0 +1,228 @@
+# Backend/database/config.py
+"""
+Database engine configuration.
+
+DATABASE_URL picks the database (the bundled SQLite file by default). SQLite
+connections get a set of pragmas on connect, chosen by DB_PROFILE:
+
+  * "tuned" (default): WAL journal, so readers never block the writer and
+    vice versa; synchronous=NORMAL, which in WAL mode is still crash-safe and
+    only syncs on checkpoints; a memory-mapped file and a larger page cache;
+    and a busy timeout, so a writer waits for the lock instead of failing
+    with "database is locked".
+  * "stock": SQLite's own defaults (rollback journal, synchronous=FULL), as
+    the app used before; kept for comparison in benchmarks/db_profiles.py.
+
+Every pragma can also be overridden on its own (DB_SQLITE_*, DB_BUSY_TIMEOUT_MS).
+Connection pool size, overflow, timeout and recycle come from DB_POOL_*; they
+apply to every backend except in-memory SQLite, which has a single connection.
+
+create_async_db_engine() builds the asyncio engine the async routes use, on
+the same database and with the same settings, through the backend's async
+driver (aiosqlite for SQLite).
+"""
+
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "app.db")
+DEFAULT_DATABASE_URL = f"sqlite:///{DB_PATH}"
+
+# Async DBAPI driver per backend, for DatabaseSettings.async_url.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+# Pragma values per profile; None leaves SQLite's default in place.
+SQLITE_PROFILES = {
+    "tuned": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_mb": 256,
+        "cache_mb": 64,
+        "busy_timeout_ms": 5000,
+    },
+    "stock": {
+        "journal_mode": None,
+        "synchronous": None,
+        "mmap_mb": None,
+        "cache_mb": None,
+        "busy_timeout_ms": None,
+    },
+}
+
+
+class DatabaseSettings:
+    """Everything create_db_engine() needs; see the module docstring."""
+
+    __slots__ = (
+        "url",
+        "profile",
+        "journal_mode",
+        "synchronous",
+        "mmap_mb",
+        "cache_mb",
+        "busy_timeout_ms",
+        "pool_size",
+        "max_overflow",
+        "pool_timeout",
+        "pool_recycle",
+        "echo",
+    )
+
+    def __init__(
+        self,
+        url: str = DEFAULT_DATABASE_URL,
+        profile: str = "tuned",
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+        echo: bool = False,
+        **pragmas,
+    ):
+        if profile not in SQLITE_PROFILES:
+            raise ValueError(
+                f"Unknown DB_PROFILE {profile!r}; expected one of "
+                f"{list(SQLITE_PROFILES)}"
+            )
+        unknown = set(pragmas) - set(SQLITE_PROFILES[profile])
+        if unknown:
+            raise TypeError(f"Unknown SQLite settings: {sorted(unknown)}")
+        self.url = url
+        self.profile = profile
+        for name, default in SQLITE_PROFILES[profile].items():
+            setattr(self, name, pragmas.get(name, default))
+        for name in ("journal_mode", "synchronous"):
+            value = getattr(self, name)
+            # Interpolated into a PRAGMA, so only bare keywords are accepted.
+            if value is not None and not str(value).isalpha():
+                raise ValueError(f"Invalid SQLite {name}: {value!r}")
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.echo = echo
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        pragmas = {}
+        for name, env, parse in (
+            ("journal_mode", "DB_SQLITE_JOURNAL_MODE", str),
+            ("synchronous", "DB_SQLITE_SYNCHRONOUS", str),
+            ("mmap_mb", "DB_SQLITE_MMAP_MB", int),
+            ("cache_mb", "DB_SQLITE_CACHE_MB", int),
+            ("busy_timeout_ms", "DB_BUSY_TIMEOUT_MS", int),
+        ):
+            value = os.getenv(env)
+            if value:
+                pragmas[name] = parse(value)
+        return cls(
+            url=os.getenv("DATABASE_URL") or DEFAULT_DATABASE_URL,
+            profile=os.getenv("DB_PROFILE", "tuned"),
+            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            echo=os.getenv("DB_ECHO", "0") == "1",
+            **pragmas,
+        )
+
+    @property
+    def is_sqlite(self) -> bool:
+        return make_url(self.url).get_backend_name() == "sqlite"
+
+    @property
+    def is_memory(self) -> bool:
+        return self.is_sqlite and make_url(self.url).database in (None, "", ":memory:")
+
+    @property
+    def async_url(self) -> str:
+        """url with the backend's async driver, e.g. sqlite+aiosqlite:///..."""
+        url = make_url(self.url)
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"No async driver known for {backend!r} databases")
+        if url.get_driver_name() not in ASYNC_DRIVERS.values():
+            url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+        return url.render_as_string(hide_password=False)
+
+    def sqlite_pragmas(self) -> list[str]:
+        """PRAGMA statements run on every new SQLite connection, in order."""
+        pragmas = []
+        if self.busy_timeout_ms is not None:
+            # First, so that switching the journal mode also waits for locks.
+            pragmas.append(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if self.journal_mode is not None and not self.is_memory:
+            pragmas.append(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.synchronous is not None:
+            pragmas.append(f"PRAGMA synchronous = {self.synchronous}")
+        if self.mmap_mb is not None:
+            pragmas.append(f"PRAGMA mmap_size = {int(self.mmap_mb) * 1024 * 1024}")
+        if self.cache_mb is not None:
+            # Negative values are KiB rather than pages.
+            pragmas.append(f"PRAGMA cache_size = {-int(self.cache_mb) * 1024}")
+        return pragmas
+
+    def describe(self) -> dict:
+        """Settings with the password masked, for logs and benchmarks."""
+        described = {
+            name: getattr(self, name) for name in self.__slots__ if name != "url"
+        }
+        return {
+            "url": make_url(self.url).render_as_string(hide_password=True),
+            **described,
+        }
+
+
+def _engine_options(settings: DatabaseSettings) -> dict:
+    options = {"echo": settings.echo}
+    if not settings.is_memory:
+        options.update(
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+        )
+    if not settings.is_sqlite:
+        options["pool_pre_ping"] = True
+    return options
+
+
+def _apply_pragmas(engine, settings: DatabaseSettings):
+    """Runs settings' SQLite pragmas on every new connection of engine."""
+    pragmas = settings.sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def create_db_engine(settings: DatabaseSettings | None = None):
+    """An Engine for `settings` (DatabaseSettings.from_env() when omitted)."""
+    settings = settings or DatabaseSettings.from_env()
+    engine = create_engine(settings.url, **_engine_options(settings))
+    if settings.is_sqlite:
+        _apply_pragmas(engine, settings)
+    return engine
+
+
+def create_async_db_engine(settings: DatabaseSettings | None = None):
+    """
+    An AsyncEngine for `settings` (DatabaseSettings.from_env() when omitted),
+    with the same pool options and pragmas as create_db_engine().
+    """
+    settings = settings or DatabaseSettings.from_env()
+    engine = create_async_engine(settings.async_url, **_engine_options(settings))
+    if settings.is_sqlite:
+        # Connect events are sync-only; the aiosqlite connection they receive
+        # runs the pragmas through SQLAlchemy's sync adapter.
+        _apply_pragmas(engine.sync_engine, settings)
+    return engine
@@ -0,0 +1,214 @@
+# Backend/database/fulltext.py
+"""
+SQLite FTS5 search for the /courses and /gigs search parameter.
+
+courses_fts and gigs_fts are external-content FTS5 tables over the columns
+the routes search (course title and tags; gig title, description and
+required skills). They store only the inverted index; triggers on the base
+tables keep it in step with every insert, delete and update of those columns.
+A search matches every word of the query as a prefix ("data sci" finds "Data
+Science") and ranks by bm25 with the title weighted above the other fields.
+Words are cut to their first PREFIX_LENGTHS[-1] characters ("developer" also
+finds "development"): FTS5 only reads a prefix's matches lazily, in rowid
+order, when it has a prefix index of that length; for any other length it
+first merges the matches of every word sharing the prefix.
+
+Other databases, and SQLite builds without FTS5, keep the LIKE search.
+"""
+
+import re
+
+from sqlalchemy import (
+    column,
+    false,
+    func,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+
+# base table -> (FTS table, searched columns, bm25 weight per column)
+FTS_TABLES = {
+    "courses": ("courses_fts", ("title", "tags"), (5.0, 1.0)),
+    "gigs": ("gigs_fts", ("title", "description", "required_skills"), (5.0, 1.0, 2.0)),
+}
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Prefix lengths the FTS tables keep an index for.
+PREFIX_LENGTHS = (2, 3, 4, 5, 6)
+
+# Searches matching more rows than this are not ranked by bm25, which reads
+# every match of each word; they list their newest RANKED_MATCHES matches
+# newest first instead, so their cost does not grow with the table.
+RANKED_MATCHES = 5000
+
+# (engine url, base table) -> whether its FTS table exists; checked once.
+_ready = {}
+
+
+def fts5_supported(conn) -> bool:
+    if conn.dialect.name != "sqlite":
+        return False
+    return bool(
+        conn.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar()
+    )
+
+
+def create_fts_table(conn, base: str):
+    """
+    Creates base's FTS table and sync triggers if missing, and indexes the
+    rows already in base. The rebuild reads the whole table, so it is only
+    run when the FTS table is new.
+    """
+    name, columns, weights = FTS_TABLES[base]
+    if inspect(conn).has_table(name):
+        return
+    listed = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    conn.execute(
+        text(
+            f"CREATE VIRTUAL TABLE {name} USING fts5({listed}, content='{base}', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2', "
+            f"prefix='{' '.join(map(str, PREFIX_LENGTHS))}')"
+        )
+    )
+    conn.execute(
+        text(
+            f"INSERT INTO {name} ({name}, rank) VALUES "
+            f"('rank', 'bm25({', '.join(str(weight) for weight in weights)})')"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {base} BEGIN "
+            f"INSERT INTO {name} (rowid, {listed}) VALUES (new.id, {new_values}); "
+            "END"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {base} BEGIN "
+            f"INSERT INTO {name} ({name}, rowid, {listed}) "
+            f"VALUES ('delete', old.id, {old_values}); END"
+        )
+    )
+    # Only edits of the searched columns touch the index, not e.g. the
+    # applicant and enrollment counters.
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {listed} "
+            f"ON {base} BEGIN "
+            f"INSERT INTO {name} ({name}, rowid, {listed}) "
+            f"VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {name} (rowid, {listed}) VALUES (new.id, {new_values}); "
+            "END"
+        )
+    )
+    conn.execute(text(f"INSERT INTO {name} ({name}) VALUES ('rebuild')"))
+
+
+def drop_fts_table(conn, base: str):
+    """Drops base's FTS table and its sync triggers."""
+    name = FTS_TABLES[base][0]
+    for suffix in ("ai", "ad", "au"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}_{suffix}"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+
+def fts_table_current(conn, base: str) -> bool:
+    """Whether base's FTS table exists with the current prefix indexes."""
+    sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE name = :name"),
+        {"name": FTS_TABLES[base][0]},
+    ).scalar()
+    return sql is not None and f"prefix='{' '.join(map(str, PREFIX_LENGTHS))}'" in sql
+
+
+def match_expression(search: str) -> str | None:
+    """
+    FTS5 query matching every word of search, cut to PREFIX_LENGTHS[-1]
+    characters, as a prefix: 'data scientist' -> '"data"* AND "scient"*'.
+    None when search has no words.
+    """
+    words = _WORD.findall(search)
+    if not words:
+        return None
+    return " AND ".join(f'"{word[: PREFIX_LENGTHS[-1]]}"*' for word in words)
+
+
+def fts_ready(db, base: str) -> bool:
+    bind = db.get_bind()
+    key = (str(bind.engine.url), base)
+    if key not in _ready:
+        _ready[key] = bind.dialect.name == "sqlite" and inspect(bind).has_table(
+            FTS_TABLES[base][0]
+        )
+    return _ready[key]
+
+
+def like_search(query, model, search: str):
+    """The LIKE search: search anywhere in any of the columns, no ranking."""
+    term = f"%{search.lower()}%"
+    columns = FTS_TABLES[model.__tablename__][1]
+    return query.filter(
+        or_(*(getattr(model, column).ilike(term) for column in columns))
+    )
+
+
+def search_query(db, query, model, search: str):
+    """
+    Narrows query, an ORM Query or a select() on model (Course or Gig), to
+    rows matching search through its FTS table when there is one, falling
+    back to like_search() otherwise. Returns (query, order), order being how
+    the query is ordered: "rank" (best bm25 match first), "newest" (id
+    descending, for a search matching over RANKED_MATCHES rows, of which only
+    the newest RANKED_MATCHES are searched) or "id" (unordered LIKE search,
+    or a search without words, which matches nothing; left to the caller to
+    order by id).
+    """
+    base = model.__tablename__
+    if not fts_ready(db, base):
+        return like_search(query, model, search), "id"
+
+    expression = match_expression(search)
+    if expression is None:
+        return query.filter(false()), "id"
+    name = FTS_TABLES[base][0]
+    fts = table(name, column("rowid"), column("rank"))
+    match = literal_column(name).op("MATCH")(expression)
+    # The prefix indexes let FTS5 stop reading matches at the limit, so this
+    # count costs the same on any table size.
+    matched = db.execute(
+        select(func.count()).select_from(
+            select(fts.c.rowid).where(match).limit(RANKED_MATCHES + 1).subquery()
+        )
+    ).scalar()
+    if matched > RANKED_MATCHES:
+        # Bounded on the FTS side, so other filters (e.g. a category) that
+        # pass few of the matches cannot make this walk all of them.
+        newest = (
+            select(fts.c.rowid.label("id"))
+            .where(match)
+            .order_by(fts.c.rowid.desc())
+            .limit(RANKED_MATCHES)
+            .subquery()
+        )
+        query = query.join(newest, newest.c.id == model.id)
+        return query.order_by(newest.c.id.desc()), "newest"
+    matches = (
+        select(fts.c.rowid.label("id"), fts.c.rank.label("rank"))
+        .where(match)
+        .subquery()
+    )
+    query = query.join(matches, matches.c.id == model.id)
+    return query.order_by(matches.c.rank, matches.c.id), "rank"
+
+
+async def search_query_async(db, query, model, search: str):
+    """search_query() for an AsyncSession and a select() on model."""
+    return await db.run_sync(search_query, query, model, search)
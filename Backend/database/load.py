@@ -1,280 +1,375 @@
+"""
+Loads data/careers.csv, courses.csv and gigs.csv into the database.
+
+The CSVs are streamed in chunks of --chunk-rows and written with one
+executemany per --batch-rows rows, each batch in its own transaction. Career
+titles are resolved to ids through one in-memory map read after the careers
+are loaded, instead of a query per course or gig. Rows are upserted on their
+natural keys (careers by name, courses and gigs by career and url), so a rerun
+updates rows in place rather than duplicating them. The simulated enrollment
+and applicant counts and statuses come from a generator seeded by --seed, so
+the same files always load the same data; since the app changes those
+columns, they are only set on insert.
+
+Run from the project root:
+    python -m Backend.database.load --data-dir data --batch-rows 10000
+"""
+
+import argparse
+import os
 import random
+import time
 
 import pandas as pd
 from dotenv import load_dotenv
-from models import Career, Course, Gig, SessionLocal, create_db_tables
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from Backend.database.migrations import run_migrations
+from Backend.database.models import Career, Course, Gig, create_db_tables, engine
 
 load_dotenv()
 
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+
+# Upper bounds of the simulated enrollment and applicant counts.
+MAX_SIMULATED_STUDENTS = 24
+MAX_SIMULATED_APPLICANTS = 20
 
-def load_data_from_csvs():
+# Gig category for each career title; other careers get "General".
+CATEGORY_MAPPING = {
+    "Data Scientist": "Data Science",
+    "AI Engineer": "Artificial Intelligence",
+    "Cybersecurity Analyst": "Cybersecurity",
+    "UX/UI Designer": "Design",
+    "Cloud Solutions Architect": "Cloud Computing",
+    "Blockchain Developer": "Blockchain",
+    "Game Developer": "Game Development",
+    "Digital Marketing Specialist": "Digital Marketing",
+    "Robotics Engineer": "Robotics",
+    "Mobile App Developer": "Mobile Development",
+    "Data Analyst": "Data Analysis",
+    "Full Stack Developer": "Web Development",
+    "Product Manager": "Product Management",
+    "Bioinformatics Scientist": "Biotechnology",
+    "Embedded Systems Engineer": "Hardware Engineering",
+    "Machine Learning Engineer": "Machine Learning",
+    "Network Engineer": "Networking",
+    "DevOps Engineer": "DevOps",
+    "AR/VR Developer": "AR/VR",
+    "Ethical Hacker": "Cybersecurity",
+    "Full-Stack Developer": "Web Development",
+    "Data Engineer": "Data Engineering",
+    "UX Researcher": "User Research",
+    "IoT Developer": "Internet of Things",
+    "Cloud Security Engineer": "Cloud Security",
+    "Technical Writer": "Technical Writing",
+    "Site Reliability Engineer (SRE)": "Site Reliability",
+    "Financial Analyst": "Finance",
+    "Quantum Computing Engineer": "Quantum Computing",
+    "Database Administrator": "Database Management",
+    "Aerospace Engineer": "Aerospace",
+    "Human Resources Manager": "Human Resources",
+    "Project Manager": "Project Management",
+    "Social Media Manager": "Social Media",
+    "Electrical Engineer": "Electrical Engineering",
+    "Business Analyst": "Business Analysis",
+    "Robotics Process Automation (RPA) Developer": "Process Automation",
+    "Game Designer": "Game Design",
+    "Data Visualization Specialist": "Data Visualization",
+    "Network Security Engineer": "Network Security",
+    "Systems Analyst": "Systems Analysis",
+    "Content Strategist": "Content Strategy",
+    "UX Writer": "UX Writing",
+    "Podiatrist": "Healthcare",
+    "Urban Planner": "Urban Planning",
+    "Dietetic Technician": "Healthcare",
+    "Forensic Scientist": "Forensic Science",
+    "Chiropractor": "Healthcare",
+    "Copywriter": "Copywriting",
+    "Optometrist": "Healthcare",
+    "Industrial Designer": "Industrial Design",
+    "Public Relations Specialist": "Public Relations",
+    "Occupational Therapist": "Healthcare",
+    "Linguist": "Linguistics",
+    "Animator": "Animation",
+    "Medical Assistant": "Healthcare",
+    "Curator": "Arts & Culture",
+    "Biomedical Engineer": "Biomedical Engineering",
+    "Forest Ranger": "Environmental Science",
+    "Financial Quantitative Analyst": "Quantitative Finance",
+    "Marine Biologist": "Marine Biology",
+    "Travel Agent": "Travel & Tourism",
+    "Pharmacist": "Healthcare",
+    "Market Research Analyst": "Market Research",
+    "School Counselor": "Education",
+    "Urban Farmer": "Agriculture",
+    "Event Planner": "Event Management",
+    "Interior Designer": "Interior Design",
+    "Graphic Designer": "Graphic Design",
+}
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE.
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def upsert_statement(table, key_columns, insert_only=()):
     """
-    Loads data from careers.csv, gigs.csv, and courses.csv into the database.
-    This function assumes the tables are already created.
+    INSERT that updates the existing row when key_columns clash; columns in
+    insert_only keep their stored value on update.
     """
-    session = SessionLocal()
-
-    # List of random names for students
-    student_names = [
-        "Liam Johnson",
-        "Olivia Smith",
-        "Noah Williams",
-        "Emma Brown",
-        "Oliver Davis",
-        "Ava Miller",
-        "Elijah Wilson",
-        "Charlotte Moore",
-        "James Taylor",
-        "Amelia Anderson",
-        "Benjamin Thomas",
-        "Isabella Jackson",
-        "Lucas White",
-        "Mia Harris",
-        "Mason Martin",
-        "Harper Thompson",
-        "Ethan Garcia",
-        "Evelyn Martinez",
-        "Alexander Robinson",
-        "Abigail Clark",
-        "Henry Rodriguez",
-        "Elizabeth Lewis",
-        "Sebastian Lee",
-        "Sofia Walker",
-    ]
-
-    try:
-        # Load Careers data first, as it's the parent table
-        print("Loading data from careers.csv...")
-        file_path = r"C:\Users\ayemi\Documents\CareerHub\data\careers.csv"
-        careers_df = pd.read_csv(file_path)
-        for index, row in careers_df.iterrows():
-            career = Career(
-                name=row["career_title"],
-                skills=row["skills"],
-                personality_match=row["personality_match"],
-                education_required=row["education_requirement"],
-                description=row["description"],
-                salary=row["average_salary_usd"],
-                job_outlook=row["job_outlook"],
-                resources=row["learning_resources"],
-            )
-            session.add(career)
-        session.commit()
-        print(f"Successfully loaded {len(careers_df)} careers.")
-
-        # Load Courses data
-        print("Loading data from courses.csv...")
-        file_path = r"C:\Users\ayemi\Documents\CareerHub\data\courses.csv"
-        courses_df = pd.read_csv(file_path)
-        for index, row in courses_df.iterrows():
-            # Find the parent Career based on career_title
-            parent_career = (
-                session.query(Career).filter_by(name=row["career_title"]).first()
-            )
-            if parent_career:
-                # Join the list of tags into a single string
-                tags_list = (
-                    [tag.strip() for tag in row["tags"].split(",")]
-                    if pd.notna(row["tags"])
-                    else []
-                )
-                tags_string = ", ".join(tags_list)
-
-                # Generate a random number of students enrolled and join them into a string
-                num_students = random.randint(0, len(student_names))
-                students_list = random.sample(student_names, num_students)
-                students_string = ", ".join(students_list)
-
-                course = Course(
-                    career_id=parent_career.id,
-                    title=row["course_title"],
-                    provider=row["provider"],
-                    description=row["description"],
-                    tags=tags_string,
-                    rating=row["rating"],
-                    students_enrolled=students_string,
-                    count_students=len(students_list),
-                    duration_weeks=row["duration_weeks"],
-                    cost_type=row["cost_type"],
-                    level=row["level"],
-                    url=row["url"],
-                    course_image_url=row["course_image_url"],
-                )
-                session.add(course)
-
-        session.commit()  # Commit courses before loading gigs
-        print(f"Successfully loaded {len(courses_df)} courses.")
-
-        # Load Gigs data
-        print("Loading data from gigs.csv...")
-        file_path = r"C:\Users\ayemi\Documents\CareerHub\data\gigs.csv"
-        gigs_df = pd.read_csv(file_path)
-
-        # Define category mapping based on career titles in the dataset
-        category_mapping = {
-            "Data Scientist": "Data Science",
-            "AI Engineer": "Artificial Intelligence",
-            "Cybersecurity Analyst": "Cybersecurity",
-            "UX/UI Designer": "Design",
-            "Cloud Solutions Architect": "Cloud Computing",
-            "Blockchain Developer": "Blockchain",
-            "Game Developer": "Game Development",
-            "Digital Marketing Specialist": "Digital Marketing",
-            "Robotics Engineer": "Robotics",
-            "Mobile App Developer": "Mobile Development",
-            "Data Analyst": "Data Analysis",
-            "Full Stack Developer": "Web Development",
-            "Product Manager": "Product Management",
-            "Bioinformatics Scientist": "Biotechnology",
-            "Embedded Systems Engineer": "Hardware Engineering",
-            "Machine Learning Engineer": "Machine Learning",
-            "Network Engineer": "Networking",
-            "DevOps Engineer": "DevOps",
-            "AR/VR Developer": "AR/VR",
-            "Ethical Hacker": "Cybersecurity",
-            "Full-Stack Developer": "Web Development",
-            "Data Engineer": "Data Engineering",
-            "UX Researcher": "User Research",
-            "IoT Developer": "Internet of Things",
-            "Cloud Security Engineer": "Cloud Security",
-            "Technical Writer": "Technical Writing",
-            "Site Reliability Engineer (SRE)": "Site Reliability",
-            "Financial Analyst": "Finance",
-            "Quantum Computing Engineer": "Quantum Computing",
-            "Database Administrator": "Database Management",
-            "Aerospace Engineer": "Aerospace",
-            "Human Resources Manager": "Human Resources",
-            "Project Manager": "Project Management",
-            "Social Media Manager": "Social Media",
-            "Electrical Engineer": "Electrical Engineering",
-            "Business Analyst": "Business Analysis",
-            "Robotics Process Automation (RPA) Developer": "Process Automation",
-            "Game Designer": "Game Design",
-            "Data Visualization Specialist": "Data Visualization",
-            "Network Security Engineer": "Network Security",
-            "Systems Analyst": "Systems Analysis",
-            "Content Strategist": "Content Strategy",
-            "UX Writer": "UX Writing",
-            "Podiatrist": "Healthcare",
-            "Urban Planner": "Urban Planning",
-            "Dietetic Technician": "Healthcare",
-            "Forensic Scientist": "Forensic Science",
-            "Chiropractor": "Healthcare",
-            "Copywriter": "Copywriting",
-            "Optometrist": "Healthcare",
-            "Industrial Designer": "Industrial Design",
-            "Public Relations Specialist": "Public Relations",
-            "Occupational Therapist": "Healthcare",
-            "Linguist": "Linguistics",
-            "Animator": "Animation",
-            "Medical Assistant": "Healthcare",
-            "Curator": "Arts & Culture",
-            "Biomedical Engineer": "Biomedical Engineering",
-            "Forest Ranger": "Environmental Science",
-            "Financial Quantitative Analyst": "Quantitative Finance",
-            "Marine Biologist": "Marine Biology",
-            "Travel Agent": "Travel & Tourism",
-            "Pharmacist": "Healthcare",
-            "Market Research Analyst": "Market Research",
-            "School Counselor": "Education",
-            "Urban Farmer": "Agriculture",
-            "Event Planner": "Event Management",
-            "Interior Designer": "Interior Design",
-            "Graphic Designer": "Graphic Design",
+    insert = _UPSERT_INSERTS.get(engine.dialect.name)
+    if insert is None:
+        raise RuntimeError(f"Upserts are not supported on {engine.dialect.name}")
+    statement = insert(table)
+    skip = set(key_columns) | set(insert_only) | {"id"}
+    return statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={
+            column.name: statement.excluded[column.name]
+            for column in table.columns
+            if column.name not in skip
+        },
+    )
+
+
+def _value(value):
+    return None if pd.isna(value) else value
+
+
+def career_rows(chunk: pd.DataFrame, career_ids=None, rng=None):
+    rows = []
+    for row in chunk.itertuples(index=False):
+        rows.append(
+            {
+                "name": row.career_title,
+                "skills": _value(row.skills),
+                "personality_match": _value(row.personality_match),
+                "education_required": _value(row.education_requirement),
+                "description": _value(row.description),
+                "salary": _value(row.average_salary_usd),
+                "job_outlook": _value(row.job_outlook),
+                "resources": _value(row.learning_resources),
+            }
+        )
+    return rows, 0
+
+
+def course_rows(chunk: pd.DataFrame, career_ids: dict, rng: random.Random):
+    rows = []
+    skipped = 0
+    for row in chunk.itertuples(index=False):
+        career_id = career_ids.get(row.career_title)
+        if career_id is None:
+            skipped += 1
+            continue
+        tags = (
+            ", ".join(tag.strip() for tag in row.tags.split(","))
+            if pd.notna(row.tags)
+            else ""
+        )
+        rows.append(
+            {
+                "career_id": career_id,
+                "title": row.course_title,
+                "provider": row.provider,
+                "description": row.description,
+                "tags": tags,
+                "rating": _value(row.rating),
+                "count_students": rng.randint(0, MAX_SIMULATED_STUDENTS),
+                "duration_weeks": _value(row.duration_weeks),
+                "cost_type": _value(row.cost_type),
+                "level": _value(row.level),
+                "url": row.url,
+                "course_image_url": _value(row.course_image_url),
+            }
+        )
+    return rows, skipped
+
+
+def gig_rows(chunk: pd.DataFrame, career_ids: dict, rng: random.Random):
+    rows = []
+    skipped = 0
+    for row in chunk.itertuples(index=False):
+        career_id = career_ids.get(row.career_title)
+        if career_id is None:
+            skipped += 1
+            continue
+        rows.append(
+            {
+                "career_id": career_id,
+                "title": row.gig_title,
+                "company": row.company,
+                "description": row.description,
+                "budget_min_usd": _value(row.budget_min_usd),
+                "budget_max_usd": _value(row.budget_max_usd),
+                "duration_weeks": f"{row.duration_weeks} weeks",
+                "location": _value(row.location),
+                "count_applicants": rng.randint(0, MAX_SIMULATED_APPLICANTS),
+                "required_skills": _value(row.required_skills),
+                "category": CATEGORY_MAPPING.get(row.career_title, "General"),
+                "posted_hours_ago": rng.randint(1, 720),
+                "url": row.url,
+                "status": rng.choice(["Active", "Completed"]),
+            }
+        )
+    return rows, skipped
+
+
+class LoadReport:
+    """Row counts and throughput of one CSV load, printed as it goes."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.read = 0
+        self.written = 0
+        self.skipped = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+
+    @property
+    def seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def progress(self):
+        print(
+            f"  {self.name}: {self.read} read, {self.written} upserted, "
+            f"{self.skipped} skipped, {self.written / self.seconds:,.0f} rows/s"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "read": self.read,
+            "upserted": self.written,
+            "skipped": self.skipped,
+            "batches": self.batches,
+            "seconds": self.seconds,
+            "rows_per_second": self.written / self.seconds if self.seconds else 0.0,
         }
 
-        # List of random names to use for applicants
-        applicant_names = [
-            "John Doe",
-            "Jane Smith",
-            "Peter Jones",
-            "Mary Brown",
-            "Alex Williams",
-            "Sarah Miller",
-            "Michael Davis",
-            "Jessica Garcia",
-            "David Rodriguez",
-            "Laura Wilson",
-            "James Martinez",
-            "Patricia Anderson",
-            "Robert Thomas",
-            "Jennifer Jackson",
-            "Charles White",
-            "Linda Harris",
-            "Daniel Martin",
-            "Elizabeth Thompson",
-            "Joseph Garcia",
-            "Susan Robinson",
-        ]
-
-        gigs_added = 0
-        for index, row in gigs_df.iterrows():
-            # Find the parent Career based on career_title
-            parent_career = (
-                session.query(Career).filter_by(name=row["career_title"]).first()
-            )
-            if parent_career:
-                # Get category based on career title mapping
-                category = category_mapping.get(row["career_title"], "General")
-
-                # Generate a random number of applicants (between 0 and the number of names)
-                num_applicants = random.randint(0, len(applicant_names))
-                # Select a random sample of names and join them into a string
-                applicants_list = random.sample(applicant_names, num_applicants)
-                applicants_string = ", ".join(applicants_list)
-
-                # Generate a random status for the gig
-                gig_status = random.choice(["Active", "Completed"])
-
-                gig = Gig(
-                    career_id=parent_career.id,
-                    title=row["gig_title"],
-                    company=row["company"],
-                    description=row["description"],
-                    budget_min_usd=row["budget_min_usd"],
-                    budget_max_usd=row["budget_max_usd"],
-                    # Append " weeks" to the duration and convert to string
-                    duration_weeks=f"{row['duration_weeks']} weeks",
-                    location=row["location"],
-                    applicants=applicants_string,
-                    count_applicants=len(applicants_list),
-                    required_skills=row["required_skills"],
-                    category=category,  # Category mapped from career_title
-                    posted_hours_ago=random.randint(
-                        1, 720
-                    ),  # Random hours ago between 1-720 (30 days)
-                    url=row["url"],
-                    status=gig_status,
-                )
-                session.add(gig)
-                gigs_added += 1
-                print(
-                    f"Added gig: {row['gig_title']} with category: {category} and status: {gig_status}"
-                )
-            else:
-                print(f"Warning: No career found for '{row['career_title']}'")
-
-        session.commit()  # Commit all gigs
-        print(f"Successfully loaded {gigs_added} gigs.")
-
-    except IntegrityError as e:
-        session.rollback()
-        print(f"Database integrity error: {e}")
-        raise
-    except Exception as e:
-        session.rollback()
-        print(f"An error occurred: {e}")
-        raise
-    finally:
-        session.close()
 
+def load_csv(
+    path: str,
+    table,
+    key_columns,
+    to_rows,
+    career_ids=None,
+    insert_only=(),
+    chunk_rows: int = 5000,
+    batch_rows: int = 10000,
+    seed: int = 0,
+) -> LoadReport:
+    """
+    Streams path through to_rows() and upserts the rows into table, one
+    executemany and transaction per batch_rows rows.
+    """
+    statement = upsert_statement(table, key_columns, insert_only)
+    report = LoadReport(os.path.basename(path))
+    # One generator per file: the same file and seed give the same rows.
+    rng = random.Random(f"{seed}:{table.name}")
+    print(f"Loading {path}...")
+    # Keyed so a repeated row within a batch is written once (the last copy
+    # wins, as it would row by row); PostgreSQL rejects a batch that upserts
+    # the same key twice.
+    pending = {}
+
+    def flush():
+        with engine.begin() as conn:
+            conn.execute(statement, list(pending.values()))
+        report.written += len(pending)
+        report.batches += 1
+        pending.clear()
+        report.progress()
+
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        rows, skipped = to_rows(chunk, career_ids, rng)
+        report.read += len(chunk)
+        report.skipped += skipped
+        for row in rows:
+            pending[tuple(row[column] for column in key_columns)] = row
+        if len(pending) >= batch_rows:
+            flush()
+    if pending:
+        flush()
+    return report
+
+
+def career_id_map() -> dict[str, int]:
+    """career title -> id, read once for resolving every course and gig."""
+    with engine.connect() as conn:
+        return dict(conn.execute(select(Career.name, Career.id)).all())
+
+
+def load_data_from_csvs(
+    careers_path: str = os.path.join(DATA_DIR, "careers.csv"),
+    courses_path: str = os.path.join(DATA_DIR, "courses.csv"),
+    gigs_path: str = os.path.join(DATA_DIR, "gigs.csv"),
+    chunk_rows: int = 5000,
+    batch_rows: int = 10000,
+    seed: int = 0,
+) -> dict:
+    """
+    Upserts the three CSVs, careers first since courses and gigs reference
+    them. Returns a LoadReport.to_dict() per file.
+    """
+    options = {"chunk_rows": chunk_rows, "batch_rows": batch_rows, "seed": seed}
+    reports = {
+        "careers": load_csv(
+            careers_path, Career.__table__, ["name"], career_rows, **options
+        )
+    }
+    career_ids = career_id_map()
+    reports["courses"] = load_csv(
+        courses_path,
+        Course.__table__,
+        ["career_id", "url"],
+        course_rows,
+        career_ids,
+        insert_only=["count_students"],
+        **options,
+    )
+    reports["gigs"] = load_csv(
+        gigs_path,
+        Gig.__table__,
+        ["career_id", "url"],
+        gig_rows,
+        career_ids,
+        insert_only=["count_applicants", "posted_hours_ago", "status"],
+        **options,
+    )
+    return {name: report.to_dict() for name, report in reports.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--careers", help="defaults to <data-dir>/careers.csv")
+    parser.add_argument("--courses", help="defaults to <data-dir>/courses.csv")
+    parser.add_argument("--gigs", help="defaults to <data-dir>/gigs.csv")
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    parser.add_argument("--batch-rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
 
-if __name__ == "__main__":
-    # print("Dropping existing database tables and recreating them...")
-    # drop_db_tables()
     create_db_tables()
-    print("Database tables created successfully.")
+    run_migrations(engine)
+    reports = load_data_from_csvs(
+        careers_path=args.careers or os.path.join(args.data_dir, "careers.csv"),
+        courses_path=args.courses or os.path.join(args.data_dir, "courses.csv"),
+        gigs_path=args.gigs or os.path.join(args.data_dir, "gigs.csv"),
+        chunk_rows=args.chunk_rows,
+        batch_rows=args.batch_rows,
+        seed=args.seed,
+    )
+    for name, report in reports.items():
+        print(
+            f"{name}: {report['upserted']} upserted, {report['skipped']} skipped "
+            f"in {report['seconds']:.1f}s ({report['rows_per_second']:,.0f} rows/s)"
+        )
 
-    # # Load initial data from CSV files
-    load_data_from_csvs()
+
+if __name__ == "__main__":
+    main()
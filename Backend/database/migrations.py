@@ -0,0 +1,418 @@
+# Backend/database/migrations.py
+"""
+Schema migrations for databases created before a model change.
+
+Each migration runs once, in its own transaction, and is recorded in the
+schema_migrations table. Migrations inspect the live schema before changing
+it, so they are safe to re-run after an interruption and on databases that
+create_db_tables() built with the current models.
+"""
+
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect, text
+
+from Backend.database.fulltext import (
+    FTS_TABLES,
+    create_fts_table,
+    drop_fts_table,
+    fts5_supported,
+    fts_table_current,
+)
+
+MIGRATIONS_TABLE = "schema_migrations"
+# Career columns recommendations rows used to copy, dropped by migration 0001.
+_COPIED_CAREER_COLUMNS = (
+    "description",
+    "skills",
+    "personality_match",
+    "education_required",
+    "average_salary_usd",
+    "job_outlook",
+    "learning_resources",
+    "career_title",
+)
+
+
+def _columns(conn, table: str) -> set[str]:
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def recommendations_career_reference(conn):
+    """
+    Recommendation rows used to copy the whole career (title, description,
+    skills, resources, ...). They now keep career_id, rank and
+    similarity_score only: career_id is backfilled by matching the copied
+    title (and description, when several careers share a title), rank by
+    insertion order within each quiz, then the copied columns are dropped
+    (ALTER TABLE DROP COLUMN, SQLite 3.35+).
+    """
+    columns = _columns(conn, "recommendations")
+    if "career_title" in columns:
+        if "career_id" not in columns:
+            conn.execute(
+                text(
+                    "ALTER TABLE recommendations ADD COLUMN career_id INTEGER "
+                    "REFERENCES careers (id) ON DELETE SET NULL"
+                )
+            )
+        if "rank" not in columns:
+            conn.execute(text("ALTER TABLE recommendations ADD COLUMN rank INTEGER"))
+        conn.execute(
+            text(
+                """
+                UPDATE recommendations SET career_id = COALESCE(
+                    (SELECT MIN(c.id) FROM careers c
+                     WHERE c.name = recommendations.career_title
+                       AND c.description = recommendations.description),
+                    (SELECT MIN(c.id) FROM careers c
+                     WHERE c.name = recommendations.career_title)
+                )
+                WHERE career_id IS NULL
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                UPDATE recommendations SET rank = (
+                    SELECT COUNT(*) FROM recommendations r
+                    WHERE r.quiz_id IS recommendations.quiz_id
+                      AND r.id <= recommendations.id
+                )
+                WHERE rank IS NULL
+                """
+            )
+        )
+    # career_title goes last: while it is there, the backfill above may still
+    # be needed.
+    for column in _COPIED_CAREER_COLUMNS:
+        if column in columns:
+            conn.execute(text(f"ALTER TABLE recommendations DROP COLUMN {column}"))
+
+
+def _dedupe(conn, table: str, key: tuple, references=(), links=()):
+    """
+    Keeps the lowest id of every group of `table` rows sharing `key` and
+    deletes the rest. Foreign keys pointing at a deleted row are moved to the
+    kept one: `references` are (table, column) pairs, `links` are association
+    tables (table, column, owner column) whose rows are dropped instead when
+    the owner already links to a lower id of the same group, so moving them
+    would duplicate a row. Plain SQL, so it runs on every supported backend.
+    """
+    same_key = " AND ".join(f"k.{column} = t.{column}" for column in key)
+    keeper = (
+        f"SELECT MIN(k.id) FROM {table} k JOIN {table} t ON {same_key} "
+        f"WHERE t.id = {{ref}}"
+    )
+    # Read through a derived table: MySQL rejects a subquery on the table
+    # being updated or deleted from unless it is materialized first.
+    duplicates = (
+        f"SELECT id FROM (SELECT id FROM {table} WHERE id NOT IN "
+        f"(SELECT MIN(id) FROM {table} GROUP BY {', '.join(key)})) duplicates"
+    )
+    for ref_table, column in references:
+        conn.execute(
+            text(
+                f"UPDATE {ref_table} SET {column} = "
+                f"({keeper.format(ref=f'{ref_table}.{column}')}) "
+                f"WHERE {column} IN ({duplicates})"
+            )
+        )
+    for link_table, column, owner in links:
+        conn.execute(
+            text(
+                f"""
+                DELETE FROM {link_table} WHERE ({owner}, {column}) IN (
+                    SELECT owner, linked FROM (
+                        SELECT l.{owner} AS owner, l.{column} AS linked
+                        FROM {link_table} l
+                        JOIN {table} t ON t.id = l.{column}
+                        JOIN {table} k ON {same_key} AND k.id < t.id
+                        JOIN {link_table} kept ON kept.{owner} = l.{owner}
+                            AND kept.{column} = k.id
+                    ) colliding
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                f"UPDATE {link_table} SET {column} = "
+                f"({keeper.format(ref=f'{link_table}.{column}')}) "
+                f"WHERE {column} IN ({duplicates})"
+            )
+        )
+    conn.execute(text(f"DELETE FROM {table} WHERE id IN ({duplicates})"))
+
+
+def natural_keys(conn):
+    """
+    Unique keys the CSV loader upserts on: careers by name, courses and gigs by
+    (career_id, url). Existing duplicates (the original loader inserted every
+    careers.csv row, including repeated careers) are merged into their
+    lowest id first.
+    """
+    tables = inspect(conn).get_table_names()
+    if "careers" in tables:
+        _dedupe(
+            conn,
+            "careers",
+            ("name",),
+            references=[
+                (table, "career_id")
+                for table in ("courses", "gigs", "recommendations")
+                if table in tables
+            ],
+        )
+        conn.execute(
+            text("CREATE UNIQUE INDEX IF NOT EXISTS uq_careers_name ON careers (name)")
+        )
+    for table, link in (("courses", "user_courses"), ("gigs", "user_gigs")):
+        if table not in tables:
+            continue
+        column = "course_id" if table == "courses" else "gig_id"
+        _dedupe(
+            conn,
+            table,
+            ("career_id", "url"),
+            links=[(link, column, "user_id")] if link in tables else [],
+        )
+        conn.execute(
+            text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table}_career_url "
+                f"ON {table} (career_id, url)"
+            )
+        )
+
+
+def _legacy_names(value) -> list:
+    """
+    Entries of a students_enrolled / applicants string: a JSON list (of user
+    ids or usernames, as the enroll routes wrote) or comma-separated names.
+    """
+    if not value:
+        return []
+    try:
+        names = json.loads(value)
+    except ValueError:
+        names = value.split(",")
+    if not isinstance(names, list):
+        names = [names]
+    return list(dict.fromkeys(str(name).strip() for name in names if str(name).strip()))
+
+
+def _move_to_links(conn, table, column, count_column, link_table, link_column):
+    """
+    Inserts a link_table row for every entry of table.column that names an
+    existing user (by id or username), raises count_column to at least the
+    number of entries, and drops the column.
+    """
+    users = {}
+    for user_id, username in conn.execute(text("SELECT id, username FROM users")):
+        users[str(user_id)] = user_id
+        users[username] = user_id
+    rows = conn.execute(
+        text(
+            f"SELECT id, {column}, {count_column} FROM {table} "
+            f"WHERE {column} IS NOT NULL AND {column} != ''"
+        )
+    ).all()
+    links = []
+    counts = []
+    for row_id, value, count in rows:
+        names = _legacy_names(value)
+        user_ids = {users[name] for name in names if name in users}
+        links.extend({"user_id": user_id, "row_id": row_id} for user_id in user_ids)
+        if len(names) > (count or 0):
+            counts.append({"count": len(names), "row_id": row_id})
+    if links:
+        conn.execute(
+            text(
+                f"INSERT INTO {link_table} (user_id, {link_column}) "
+                f"SELECT :user_id, :row_id WHERE NOT EXISTS (SELECT 1 FROM {link_table} "
+                f"WHERE user_id = :user_id AND {link_column} = :row_id)"
+            ),
+            links,
+        )
+    if counts:
+        conn.execute(
+            text(f"UPDATE {table} SET {count_column} = :count WHERE id = :row_id"),
+            counts,
+        )
+    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+    print(
+        f"{table}.{column}: {len(links)} {link_table} rows, {len(counts)} counts raised"
+    )
+
+
+def association_rows(conn):
+    """
+    Enrollments and gig applications move from strings on the course / gig
+    (students_enrolled, applicants) to user_courses and gig_applications rows.
+    user_gigs is not reused for applications: the dashboard reads it as the
+    gigs a business posted. Entries that do not name a user (such as the
+    loader's simulated names) are only kept in count_students /
+    count_applicants. The string columns are then dropped (ALTER TABLE DROP
+    COLUMN, SQLite 3.35+).
+    """
+    tables = inspect(conn).get_table_names()
+    if "gigs" in tables and "users" in tables:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS gig_applications (
+                    user_id INTEGER NOT NULL REFERENCES users (id),
+                    gig_id INTEGER NOT NULL REFERENCES gigs (id),
+                    PRIMARY KEY (user_id, gig_id)
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_gig_applications_gig_id "
+                "ON gig_applications (gig_id)"
+            )
+        )
+        if "applicants" in _columns(conn, "gigs"):
+            _move_to_links(
+                conn,
+                "gigs",
+                "applicants",
+                "count_applicants",
+                "gig_applications",
+                "gig_id",
+            )
+    if "user_courses" in tables and "students_enrolled" in _columns(conn, "courses"):
+        _move_to_links(
+            conn,
+            "courses",
+            "students_enrolled",
+            "count_students",
+            "user_courses",
+            "course_id",
+        )
+
+
+# (table, index name, columns) of the indexes behind the list / lookup routes.
+ROUTE_INDEXES = [
+    ("courses", "ix_courses_title", "title"),
+    ("courses", "ix_courses_level_cost_type", "level, cost_type"),
+    ("courses", "ix_courses_cost_type", "cost_type"),
+    ("gigs", "ix_gigs_title", "title"),
+    ("gigs", "ix_gigs_title_lower", "lower(title)"),
+    ("gigs", "ix_gigs_category", "category"),
+    ("gigs", "ix_gigs_status_category", "status, category"),
+    ("gigs", "ix_gigs_company", "company"),
+    ("recommendations", "ix_recommendations_user_id_id", "user_id, id"),
+]
+
+
+def route_indexes(conn):
+    """
+    Indexes for the columns the routes filter on: course and gig titles,
+    /courses level and cost_type, /gigs category, gig status with category,
+    a company's gigs and a user's recommendation history.
+    """
+    tables = inspect(conn).get_table_names()
+    for table, name, columns in ROUTE_INDEXES:
+        if table in tables:
+            conn.execute(
+                text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+            )
+
+
+def full_text_search(conn):
+    """
+    FTS5 tables and sync triggers behind the /courses and /gigs search (see
+    Backend/database/fulltext.py). Skipped on databases without FTS5, whose
+    search stays on LIKE. Deferred while courses or gigs do not exist yet
+    (the API started on a fresh database before the loader created them).
+    """
+    if not fts5_supported(conn):
+        return
+    tables = inspect(conn).get_table_names()
+    if any(base not in tables for base in FTS_TABLES):
+        return False
+    for base in FTS_TABLES:
+        create_fts_table(conn, base)
+
+
+def fts_prefix_indexes(conn):
+    """
+    Rebuilds FTS tables created with fewer prefix indexes than
+    fulltext.PREFIX_LENGTHS, without which a search on a common word prefix
+    read all of its matches. Deferred, like 0005, until courses and gigs exist.
+    """
+    if not fts5_supported(conn):
+        return
+    tables = inspect(conn).get_table_names()
+    if any(base not in tables for base in FTS_TABLES):
+        return False
+    for base in FTS_TABLES:
+        if not fts_table_current(conn, base):
+            drop_fts_table(conn, base)
+            create_fts_table(conn, base)
+
+
+# (version, migration), applied in this order.
+MIGRATIONS = [
+    ("0001_recommendations_career_reference", recommendations_career_reference),
+    ("0002_natural_keys", natural_keys),
+    ("0003_association_rows", association_rows),
+    ("0004_route_indexes", route_indexes),
+    ("0005_full_text_search", full_text_search),
+    ("0006_fts_prefix_indexes", fts_prefix_indexes),
+]
+
+
+def applied_migrations(conn) -> set[str]:
+    if not inspect(conn).has_table(MIGRATIONS_TABLE):
+        return set()
+    return set(conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}")).scalars())
+
+
+def run_migrations(engine) -> list[str]:
+    """
+    Applies the migrations this database has not seen yet; returns them. A
+    migration returning False could not run yet: it is not recorded, so the
+    next run tries again.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} "
+                "(version VARCHAR(255) PRIMARY KEY, applied_at DATETIME NOT NULL)"
+            )
+        )
+        done = applied_migrations(conn)
+
+    applied = []
+    for version, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            if migrate(conn) is False:
+                print("Deferred migration", version)
+                continue
+            conn.execute(
+                text(
+                    f"INSERT INTO {MIGRATIONS_TABLE} (version, applied_at) "
+                    "VALUES (:version, :applied_at)"
+                ),
+                {"version": version, "applied_at": datetime.now(timezone.utc)},
+            )
+        print("Applied migration", version)
+        applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    from Backend.database.models import engine
+
+    run_migrations(engine)
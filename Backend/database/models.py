@@ -1,5 +1,4 @@
 # Backend/models.py
-import os
 from datetime import datetime
 
 from dotenv import load_dotenv
@@ -9,12 +8,15 @@ from sqlalchemy import (
     Date,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
-    create_engine,
+    func,
+    text,
 )
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import (
     Mapped,
     declarative_base,
@@ -23,18 +25,27 @@ from sqlalchemy.orm import (
     sessionmaker,
 )
 
+from Backend.database.config import (
+    DatabaseSettings,
+    create_async_db_engine,
+    create_db_engine,
+)
+
 load_dotenv()
-# db_path = os.path.join(os.path.dirname(__file__), "../../app.db")
-# db_path = os.path.abspath(db_path)  # make sure it's an absolute path
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "app.db")
-DATABASE_URL = f"sqlite:///{DB_PATH}"
-print(f"Using database URL: {DATABASE_URL}")
+database_settings = DatabaseSettings.from_env()
+print(f"Using database URL: {database_settings.describe()['url']}")
 
-engine = create_engine(DATABASE_URL)
+engine = create_db_engine(database_settings)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)  # noqa: F811
 
+# The same database for the async routes. Objects stay readable after commit,
+# since an async session cannot lazily reload expired attributes.
+async_engine = create_async_db_engine(database_settings)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 # Association table for the many-to-many relationship between User and Course
@@ -53,6 +64,15 @@ user_gigs_table = Table(
     Column("gig_id", ForeignKey("gigs.id"), primary_key=True),
 )
 
+# Applications of users to gigs; the primary key serves "gigs of a user" and
+# ix_gig_applications_gig_id "applicants of a gig".
+gig_applications_table = Table(
+    "gig_applications",
+    Base.metadata,
+    Column("user_id", ForeignKey("users.id"), primary_key=True),
+    Column("gig_id", ForeignKey("gigs.id"), primary_key=True, index=True),
+)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -91,6 +111,9 @@ class User(Base):
     completed_gigs: Mapped[list["Gig"]] = relationship(
         secondary=user_gigs_table, back_populates="users"
     )
+    applied_gigs: Mapped[list["Gig"]] = relationship(
+        secondary=gig_applications_table, back_populates="applicant_users"
+    )
 
     quizzes: Mapped[list["Quiz"]] = relationship(back_populates="user")
     recommendations: Mapped[list["Recommendation"]] = relationship(
@@ -128,15 +151,15 @@ class Quiz(Base):
 
 class Recommendation(Base):
     __tablename__ = "recommendations"
+    # /history: a user's rows in id order, without a sort.
+    __table_args__ = (Index("ix_recommendations_user_id_id", "user_id", "id"),)
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    career_title: Mapped[str | None] = mapped_column(String(255))
-    description: Mapped[str | None] = mapped_column(Text)
-    skills: Mapped[str | None] = mapped_column(Text)
-    personality_match: Mapped[str | None] = mapped_column(String(255))
-    education_required: Mapped[str | None] = mapped_column(String(255))
-    average_salary_usd: Mapped[float | None] = mapped_column(Float)
-    job_outlook: Mapped[str | None] = mapped_column(String(255))
-    learning_resources: Mapped[str | None] = mapped_column(Text)
+    # The career itself is joined from careers rather than copied per row.
+    career_id: Mapped[int | None] = mapped_column(
+        ForeignKey("careers.id", ondelete="SET NULL")
+    )
+    rank: Mapped[int | None] = mapped_column(Integer)
     similarity_score: Mapped[float | None] = mapped_column(Float)
 
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"))
@@ -144,10 +167,13 @@ class Recommendation(Base):
 
     user: Mapped["User"] = relationship(back_populates="recommendations")
     quiz: Mapped["Quiz"] = relationship(back_populates="recommendations")
+    career: Mapped["Career"] = relationship()
 
 
 class Career(Base):
     __tablename__ = "careers"
+    # Natural keys the CSV loader upserts on (see Backend/database/load.py).
+    __table_args__ = (Index("uq_careers_name", "name", unique=True),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255))
@@ -169,6 +195,13 @@ class Career(Base):
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        Index("uq_courses_career_url", "career_id", "url", unique=True),
+        # Lookups by title and the /courses level / cost_type filters.
+        Index("ix_courses_title", "title"),
+        Index("ix_courses_level_cost_type", "level", "cost_type"),
+        Index("ix_courses_cost_type", "cost_type"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     career_id: Mapped[int] = mapped_column(ForeignKey("careers.id"))
@@ -178,8 +211,7 @@ class Course(Base):
     description: Mapped[str] = mapped_column(String(255))
     tags: Mapped[str | None] = mapped_column(String(255))
     rating: Mapped[float | None] = mapped_column(Float)
-    # Changed to String to store a comma-separated list of names
-    students_enrolled: Mapped[str | None] = mapped_column(String(255))
+    # Enrollments are user_courses rows; each one also increments this count.
     count_students: Mapped[int | None] = mapped_column(Integer, default=0)
     duration_weeks: Mapped[int | None] = mapped_column(Integer)
     cost_type: Mapped[str | None] = mapped_column(String(255))
@@ -195,6 +227,17 @@ class Course(Base):
 
 class Gig(Base):
     __tablename__ = "gigs"
+    # gigs.csv repeats some urls across careers, so the key includes career_id.
+    __table_args__ = (
+        Index("uq_gigs_career_url", "career_id", "url", unique=True),
+        # Lookups by exact and case-insensitive title, the /gigs category
+        # filter, status (dashboard) with category, and a company's gigs.
+        Index("ix_gigs_title", "title"),
+        Index("ix_gigs_title_lower", func.lower(text("title"))),
+        Index("ix_gigs_category", "category"),
+        Index("ix_gigs_status_category", "status", "category"),
+        Index("ix_gigs_company", "company"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     career_id: Mapped[int] = mapped_column(ForeignKey("careers.id"))
@@ -207,8 +250,7 @@ class Gig(Base):
     # Changed to String to include 'weeks' text
     duration_weeks: Mapped[str | None] = mapped_column(String(255))
     location: Mapped[str | None] = mapped_column(String(255))
-    # Changed to String to store a comma-separated list of names
-    applicants: Mapped[str | None] = mapped_column(String(255))
+    # Applications are gig_applications rows; each one also increments this.
     count_applicants: Mapped[int | None] = mapped_column(Integer, default=0)
     required_skills: Mapped[str | None] = mapped_column(String(255))
     category: Mapped[str | None] = mapped_column(String(255))
@@ -221,6 +263,9 @@ class Gig(Base):
     users: Mapped[list["User"]] = relationship(
         secondary=user_gigs_table, back_populates="completed_gigs"
     )
+    applicant_users: Mapped[list["User"]] = relationship(
+        secondary=gig_applications_table, back_populates="applied_gigs"
+    )
 
 
 class QuizResponse(Base):
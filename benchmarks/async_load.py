@@ -0,0 +1,203 @@
+"""
+Requests per second, latency and server thread count of the /gigs listing
+served by a sync route (blocking Session, run in FastAPI's threadpool) and by
+an async route (AsyncSession on the aiosqlite engine), under many concurrent
+clients.
+
+A fresh SQLite database is filled as benchmarks/route_indexes.py fills it,
+with --rows gigs. For each route a uvicorn server is started in a subprocess
+on that database, with the app's engine settings (DB_* environment variables
+apply). For each --concurrency entry, that many clients send requests back to
+back for --seconds; the server's thread count is sampled from /proc while
+they run (Linux only).
+
+Run from the project root:
+    python -m benchmarks.async_load --concurrency 10,100,500 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import uvicorn
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from Backend.api import auth
+from Backend.api.pagination import page_query
+from Backend.api.schemas import GigRead
+from Backend.database import models
+from Backend.database.config import DatabaseSettings, create_db_engine
+from benchmarks.route_indexes import CATEGORIES, fill
+
+ROUTES = ("sync", "async")
+
+
+def _int_list(value: str):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def build_app():
+    """The same gig listing as a sync and as an async route."""
+    app = FastAPI()
+
+    def gigs_query(category: str):
+        query = select(models.Gig).where(models.Gig.category == category)
+        return page_query(query, models.Gig.id, None, 0, 20)[0]
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/sync/gigs", response_model=list[GigRead])
+    def sync_gigs(category: str, db: Session = Depends(auth.get_db)):
+        return db.scalars(gigs_query(category)).all()
+
+    @app.get("/async/gigs", response_model=list[GigRead])
+    async def async_gigs(category: str, db: AsyncSession = Depends(auth.get_async_db)):
+        return (await db.scalars(gigs_query(category))).all()
+
+    return app
+
+
+def serve(port: int):
+    # Runs in the subprocess, whose DATABASE_URL points models at the bench
+    # database.
+    uvicorn.run(build_app(), host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def thread_count(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+async def load(base: str, route: str, concurrency: int, seconds: float, pid: int):
+    samples = []
+    errors = 0
+    threads = []
+    deadline = time.perf_counter() + seconds
+
+    async def client(number: int):
+        nonlocal errors
+        rng = random.Random(number)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await http.get(
+                    f"{base}/{route}/gigs", params={"category": rng.choice(CATEGORIES)}
+                )
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            samples.append(time.perf_counter() - started)
+
+    async def sample_threads():
+        while time.perf_counter() < deadline:
+            threads.append(thread_count(pid))
+            await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as http:
+        await asyncio.gather(
+            sample_threads(), *(client(number) for number in range(concurrency))
+        )
+
+    samples_ms = np.asarray(samples or [0.0]) * 1000
+    sampled = [count for count in threads if count is not None]
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "requests_per_second": len(samples) / seconds,
+        "p50_ms": float(np.percentile(samples_ms, 50)),
+        "p95_ms": float(np.percentile(samples_ms, 95)),
+        "p99_ms": float(np.percentile(samples_ms, 99)),
+        "server_threads_max": max(sampled) if sampled else None,
+    }
+
+
+def run_route(route: str, url: str, concurrencies, seconds: float) -> dict:
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.async_load", "--serve", str(port)],
+        env={**os.environ, "DATABASE_URL": url},
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base}/health").raise_for_status()
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        return {
+            concurrency: asyncio.run(
+                load(base, route, concurrency, seconds, server.pid)
+            )
+            for concurrency in concurrencies
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--concurrency", type=_int_list, default=[10, 100, 500])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument(
+        "--dir", default=None, help="where to create the database (default: tmp)"
+    )
+    parser.add_argument("--serve", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve is not None:
+        serve(args.serve)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="async-bench-", dir=args.dir) as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = create_db_engine(DatabaseSettings(url))
+        models.Base.metadata.create_all(engine)
+        print(f"Filling {args.rows} gigs...")
+        fill(engine, args.rows)
+        engine.dispose()
+
+        results = {
+            route: run_route(route, url, args.concurrency, args.seconds)
+            for route in ROUTES
+        }
+
+    print(
+        json.dumps(
+            {"rows": args.rows, "seconds": args.seconds, "routes": results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
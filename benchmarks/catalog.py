@@ -0,0 +1,128 @@
+"""
+Memory held by the career catalog and the time to materialize top-k results,
+for the DataFrame the recommender used to keep (plus its combined_text column,
+with results built through df.iloc) against CareerCatalog.
+
+The catalog is data/careers.csv, optionally grown to --size rows by repeating
+its careers under numbered titles.
+
+Run from the project root:
+    python -m benchmarks.catalog --size 100000 --k 5
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from model.catalog import CareerCatalog
+
+
+def dataframe_item(df, idx, score):
+    """How results were built from the DataFrame before CareerCatalog."""
+    row = df.iloc[idx]
+    return {
+        "career_title": row["career_title"],
+        "description": row.get("description", ""),
+        "skills": row.get("skills", ""),
+        "personality_match": row.get("personality_match", ""),
+        "education_required": row.get("education_required", ""),
+        "average_salary_usd": float(row.get("average_salary_usd", 0) or 0),
+        "job_outlook": row.get("job_outlook", ""),
+        "learning_resources": row.get("learning_resources", ""),
+        "similarity_score": float(score),
+    }
+
+
+def read_careers(path, size):
+    df = pd.read_csv(path)
+    if size > len(df):
+        df = df.iloc[np.arange(size) % len(df)].reset_index(drop=True)
+        df["career_title"] += " #" + pd.Series(np.arange(size), dtype=str)
+    return df
+
+
+def load_dataframe(path, size):
+    df = read_careers(path, size)
+    df["combined_text"] = df.apply(
+        lambda row: " ".join(
+            [
+                str(row.get("description", "")),
+                str(row.get("skills", "")),
+                str(row.get("personality_match", "")),
+            ]
+        ),
+        axis=1,
+    )
+    return df
+
+
+def load_catalog(path, size):
+    return CareerCatalog.from_frame(read_careers(path, size))
+
+
+def traced(build):
+    """(result, bytes still allocated by build() once it returns)."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def time_materialization(build_item, rankings, scores) -> float:
+    started = time.perf_counter()
+    for ranking, ranking_scores in zip(rankings, scores):
+        [build_item(int(idx), score) for idx, score in zip(ranking, ranking_scores)]
+    return (time.perf_counter() - started) * 1000 / len(rankings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default="data/careers.csv")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    df, df_bytes = traced(lambda: load_dataframe(args.data, args.size))
+    catalog, catalog_bytes = traced(lambda: load_catalog(args.data, args.size))
+    size = len(catalog)
+    rankings = rng.integers(size, size=(args.queries, args.k))
+    scores = rng.random((args.queries, args.k))
+
+    results = {
+        "dataframe": {
+            "bytes": df_bytes,
+            "ms_per_query": time_materialization(
+                lambda idx, score: dataframe_item(df, idx, score), rankings, scores
+            ),
+        },
+        "catalog": {
+            "bytes": catalog_bytes,
+            "ms_per_query": time_materialization(catalog.result, rankings, scores),
+        },
+    }
+    print(
+        json.dumps(
+            {
+                "catalog_size": size,
+                "k": args.k,
+                "queries": args.queries,
+                "results": results,
+                "memory_saved_pct": 100 * (1 - catalog_bytes / df_bytes),
+                "materialization_speedup": results["dataframe"]["ms_per_query"]
+                / results["catalog"]["ms_per_query"],
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Latency of /Userdashboard/summary for a business user as the number of gigs
+they posted grows: the former five-query version (every posted gig loaded,
+then separate Active / Completed counts and a revenue sum) against the single
+aggregate of routes.dashboard_summary_query().
+
+A fresh SQLite database is filled with --other-gigs gigs posted by other
+users, then, for each --sizes entry, the benchmarked business user is given
+that many more gigs. Each version runs --repeat times per size; both must
+return the same summary.
+
+Run from the project root:
+    python -m benchmarks.dashboard --sizes 100,1000,10000,50000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from Backend.api.routes import dashboard_summary_query
+from Backend.database.config import DatabaseSettings, create_db_engine
+from Backend.database.models import Base, Career, Gig, User, user_gigs_table
+
+BUSINESS_USER = 1
+OTHER_USERS = 100
+STATUSES = ["Active", "Completed", "Draft"]
+
+
+def _int_list(value: str):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def add_gigs(engine, rng, start: int, count: int, owner, chunk: int = 50000):
+    """Inserts gigs start..start+count, posted by owner(i)."""
+    for first in range(start, start + count, chunk):
+        ids = range(first, min(first + chunk, start + count))
+        with engine.begin() as conn:
+            conn.execute(
+                insert(Gig),
+                [
+                    {
+                        "id": i + 1,
+                        "career_id": 1,
+                        "title": f"Gig {i}",
+                        "company": "Bench",
+                        "description": "-",
+                        "budget_max_usd": float(rng.randrange(100, 5000)),
+                        "count_applicants": rng.randrange(30),
+                        "status": rng.choice(STATUSES),
+                        "url": f"https://example.com/gig/{i}",
+                    }
+                    for i in ids
+                ],
+            )
+            conn.execute(
+                insert(user_gigs_table),
+                [{"user_id": owner(i), "gig_id": i + 1} for i in ids],
+            )
+
+
+def former_summary(db: Session, user_id: int) -> dict:
+    """The summary as the route computed it before the single aggregate."""
+    posted = (
+        db.query(Gig)
+        .join(user_gigs_table, Gig.id == user_gigs_table.c.gig_id)
+        .filter(user_gigs_table.c.user_id == user_id)
+    )
+    gigs = posted.all()
+
+    def with_status(status: str):
+        return posted.filter(Gig.status == status)
+
+    return {
+        "posted_gigs": len(gigs),
+        "total_applicants": sum(gig.count_applicants or 0 for gig in gigs),
+        "active_gigs": with_status("Active").count(),
+        "completed_gigs": with_status("Completed").count(),
+        "total_revenue": with_status("Completed")
+        .with_entities(func.sum(Gig.budget_max_usd))
+        .scalar()
+        or 0,
+    }
+
+
+def single_summary(db: Session, user_id: int) -> dict:
+    return db.execute(dashboard_summary_query(user_id)).one()._asdict()
+
+
+def timed(db: Session, summary, repeat: int):
+    result = summary(db, BUSINESS_USER)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        summary(db, BUSINESS_USER)
+        samples.append(time.perf_counter() - started)
+        db.expunge_all()
+    samples_ms = np.asarray(samples) * 1000
+    return result, {
+        "p50_ms": float(np.percentile(samples_ms, 50)),
+        "p95_ms": float(np.percentile(samples_ms, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=_int_list, default=[100, 1000, 10000, 50000])
+    parser.add_argument("--other-gigs", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--dir", default=None, help="where to create the database (default: tmp)"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="dash-bench-", dir=args.dir) as directory:
+        engine = create_db_engine(
+            DatabaseSettings(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        )
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(Career), [{"name": "Career", "description": "-"}])
+            conn.execute(
+                insert(User),
+                [
+                    {
+                        "username": f"user{i}",
+                        "email": f"user{i}@example.com",
+                        "hashed_password": "-",
+                        "type": "Business",
+                    }
+                    for i in range(1 + OTHER_USERS)
+                ],
+            )
+        add_gigs(engine, rng, 0, args.other_gigs, lambda i: 2 + i % OTHER_USERS)
+
+        posted = 0
+        for size in sorted(args.sizes):
+            add_gigs(
+                engine,
+                rng,
+                args.other_gigs + posted,
+                size - posted,
+                lambda i: BUSINESS_USER,
+            )
+            posted = size
+            with Session(engine) as db:
+                former, former_timing = timed(db, former_summary, args.repeat)
+                single, single_timing = timed(db, single_summary, args.repeat)
+            if former != single:
+                raise AssertionError(f"summaries differ: {former} != {single}")
+            results[size] = {
+                "summary": single,
+                "five_queries": former_timing,
+                "single_query": single_timing,
+                "speedup_p50": former_timing["p50_ms"] / single_timing["p50_ms"],
+            }
+        engine.dispose()
+
+    print(
+        json.dumps(
+            {"other_gigs": args.other_gigs, "repeat": args.repeat, "sizes": results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
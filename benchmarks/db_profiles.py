@@ -0,0 +1,198 @@
+"""
+Read and write throughput of the database engine profiles in
+Backend/database/config.py under concurrent threads.
+
+For each profile a fresh SQLite file is created with the app's schema and
+seeded with --careers careers and --courses courses. Then three workloads each
+run for --seconds with --threads threads, one connection per thread:
+
+  * read:  course listings of a random career (SELECT ... LIMIT 20);
+  * write: one course inserted per transaction, as the API's create routes do;
+  * mixed: a quarter of the threads write while the rest read.
+
+Each reports operations per second, p50/p95/p99 latency per operation kind,
+and how many operations failed with "database is locked".
+
+Run from the project root:
+    python -m benchmarks.db_profiles --profiles stock,tuned --threads 8
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from Backend.database.config import DatabaseSettings, create_db_engine
+from Backend.database.models import Base, Career, Course
+from model.bench import latency_stats
+
+
+def _csv_list(value: str):
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def seed(engine, careers: int, courses: int):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Career),
+            [
+                {"name": f"Career {i}", "description": f"Career number {i}"}
+                for i in range(careers)
+            ],
+        )
+        conn.execute(
+            insert(Course),
+            [
+                {
+                    "career_id": 1 + i % careers,
+                    "title": f"Course {i}",
+                    "provider": "Bench",
+                    "description": f"Course number {i}",
+                    "rating": 4.0,
+                    "url": f"https://example.com/course/{i}",
+                }
+                for i in range(courses)
+            ],
+        )
+
+
+def read_once(conn, rng, careers: int):
+    conn.execute(
+        select(Course.id, Course.title, Course.rating)
+        .where(Course.career_id == rng.randint(1, careers))
+        .limit(20)
+    ).all()
+    conn.rollback()
+
+
+def write_once(conn, rng, careers: int):
+    with conn.begin():
+        conn.execute(
+            insert(Course).values(
+                career_id=rng.randint(1, careers),
+                title="Benchmark course",
+                provider="Bench",
+                description="Inserted by the benchmark",
+                url=f"https://example.com/new/{uuid.uuid4().hex}",
+            )
+        )
+
+
+def run_workload(engine, threads: int, writers: int, seconds: float, careers: int):
+    """Runs `writers` writing and threads - writers reading threads for `seconds`."""
+    samples = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(number: int):
+        kind = "write" if number < writers else "read"
+        operation = write_once if kind == "write" else read_once
+        rng = random.Random(number)
+        mine = []
+        failed = 0
+        with engine.connect() as conn:
+            start.wait()
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    operation(conn, rng, careers)
+                except OperationalError as e:
+                    if "locked" not in str(e):
+                        raise
+                    conn.rollback()
+                    failed += 1
+                    continue
+                mine.append(time.perf_counter() - started)
+        with lock:
+            samples[kind].extend(mine)
+            errors[kind] += failed
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    result = {}
+    for kind in ("read", "write"):
+        if samples[kind] or errors[kind]:
+            stats = latency_stats(samples[kind] or [0.0], len(samples[kind]))
+            stats["ops_per_second"] = len(samples[kind]) / seconds
+            # latency_stats' qps divides by summed latency, i.e. per thread.
+            del stats["qps"]
+            stats["locked_errors"] = errors[kind]
+            result[kind] = stats
+    return result
+
+
+def bench_profile(profile: str, args, directory: str) -> dict:
+    path = os.path.join(directory, f"{profile}.db")
+    settings = DatabaseSettings(
+        f"sqlite:///{path}",
+        profile=profile,
+        pool_size=args.threads,
+        max_overflow=0,
+    )
+    engine = create_db_engine(settings)
+    Base.metadata.create_all(engine)
+    seed(engine, args.careers, args.courses)
+
+    with engine.connect() as conn:
+        pragmas = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size")
+        }
+    workloads = {
+        "read": 0,
+        "write": args.threads,
+        "mixed": max(1, args.threads // 4),
+    }
+    results = {
+        name: run_workload(engine, args.threads, writers, args.seconds, args.careers)
+        for name, writers in workloads.items()
+    }
+    engine.dispose()
+    return {"pragmas": pragmas, **results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", type=_csv_list, default=["stock", "tuned"])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--careers", type=int, default=1000)
+    parser.add_argument("--courses", type=int, default=50000)
+    parser.add_argument(
+        "--dir", default=None, help="where to create the databases (default: tmp)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="db-bench-", dir=args.dir) as directory:
+        results = {
+            profile: bench_profile(profile, args, directory)
+            for profile in args.profiles
+        }
+    print(
+        json.dumps(
+            {
+                "threads": args.threads,
+                "seconds": args.seconds,
+                "courses": args.courses,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Per-query latency and memory of the sentence encoder's CPU inference backends.
+
+Each backend (see model.encoder.ENCODER_BACKENDS) is loaded in a fresh
+interpreter, so load time and RSS are not skewed by another backend's weights.
+The probe reports model load time, RSS after loading and after encoding,
+p50/p95 latency of single quiz texts and of batches, and saves the embeddings
+of the career texts; the parent then checks them against the torch backend.
+
+Run from the project root:
+    python -m benchmarks.encoder_backends --backends torch,torch-int8,onnx --threads 1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from model.bench import latency_stats, sample_quiz_texts
+from model.catalog import CareerCatalog
+from model.scoring import normalize_rows
+
+BACKEND_PROBE = """
+import json, resource, sys, time
+import numpy as np
+from model.encoder import create_encoder
+
+config = json.loads(sys.argv[1])
+with open(config["texts_path"]) as f:
+    texts = json.load(f)
+
+def rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+started = time.perf_counter()
+encoder = create_encoder(
+    config["model"], "local", backend=config["backend"],
+    num_threads=config["threads"],
+)
+load_seconds = time.perf_counter() - started
+rss_loaded = rss_mb()
+
+def timed(batches):
+    encoder.encode(batches[0])
+    samples = []
+    for batch in batches:
+        started = time.perf_counter()
+        encoder.encode(batch)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+queries = texts["queries"]
+size = config["batch_size"]
+single = timed([[text] for text in queries])
+batched = timed([queries[i:i + size] for i in range(0, len(queries), size)])
+np.save(config["embeddings_path"], encoder.encode(texts["careers"]))
+print(json.dumps({"load_seconds": load_seconds, "single": single,
+                  "batched": batched, "rss_loaded_mb": rss_loaded,
+                  "rss_peak_mb": rss_mb()}))
+"""
+
+
+def _csv_list(value: str):
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def run_probe(config: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", BACKEND_PROBE, json.dumps(config)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def parity(reference: np.ndarray, candidate: np.ndarray, tolerance: float) -> dict:
+    cosine = np.sum(normalize_rows(reference) * normalize_rows(candidate), axis=1)
+    return {
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "ok": bool(cosine.min() >= 1 - tolerance),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default=os.path.join("data", "careers.csv"))
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument(
+        "--backends", type=_csv_list, default=["torch", "torch-int8", "onnx"]
+    )
+    parser.add_argument(
+        "--threads", type=int, default=1, help="intra-op threads (0 = library default)"
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--tolerance", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    queries = sample_quiz_texts(pd.read_csv(args.data), args.queries, rng)
+    careers = CareerCatalog.from_csv(args.data).texts()
+    backends = list(dict.fromkeys(["torch", *args.backends]))
+
+    results = {}
+    embeddings = {}
+    with tempfile.TemporaryDirectory(prefix="encoder-bench-") as tmp:
+        texts_path = os.path.join(tmp, "texts.json")
+        with open(texts_path, "w") as f:
+            json.dump({"queries": queries, "careers": careers}, f)
+        for backend in backends:
+            embeddings_path = os.path.join(tmp, f"{backend}.npy")
+            try:
+                probe = run_probe(
+                    {
+                        "model": args.model,
+                        "backend": backend,
+                        "threads": args.threads,
+                        "batch_size": args.batch_size,
+                        "texts_path": texts_path,
+                        "embeddings_path": embeddings_path,
+                    }
+                )
+            except subprocess.CalledProcessError as e:
+                # e.g. onnx without the sentence-transformers[onnx] extra.
+                results[backend] = {"error": e.stderr.strip().splitlines()[-1]}
+                continue
+            embeddings[backend] = np.load(embeddings_path)
+            results[backend] = {
+                "load_seconds": probe["load_seconds"],
+                "rss_loaded_mb": probe["rss_loaded_mb"],
+                "rss_peak_mb": probe["rss_peak_mb"],
+                "single_query": latency_stats(probe["single"], len(queries)),
+                f"batch_{args.batch_size}": latency_stats(
+                    probe["batched"], len(queries)
+                ),
+            }
+
+    if "torch" in embeddings:
+        for backend, matrix in embeddings.items():
+            results[backend]["parity"] = parity(
+                embeddings["torch"], matrix, args.tolerance
+            )
+    print(
+        json.dumps(
+            {
+                "model": args.model,
+                "threads": args.threads,
+                "queries": len(queries),
+                "careers": len(careers),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Latency of the /gigs search (first page of 100) with the LIKE scan and with
+the FTS5 index (Backend/database/fulltext.py) as the gigs table grows.
+
+For each --sizes entry a fresh SQLite database is filled with that many gigs,
+built from data/gigs.csv rows plus a few words drawn from a --vocabulary of
+synthetic terms, so that some terms are rare and some common. The FTS table is
+then built (its build time is reported), and each query runs --repeat times
+through both searches, as the route runs it: the search, an optional
+category filter, then page_query() for the first page.
+
+Run from the project root:
+    python -m benchmarks.fulltext_search --sizes 10000,100000,1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from Backend.api.pagination import page_query
+from Backend.database.config import DatabaseSettings, create_db_engine
+from Backend.database.fulltext import create_fts_table, like_search, search_query
+from Backend.database.load import CATEGORY_MAPPING
+from Backend.database.models import Base, Career, Gig
+
+
+def _int_list(value: str):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def fill(engine, gigs: pd.DataFrame, size: int, vocabulary: int, chunk: int = 50000):
+    rng = random.Random(0)
+    titles = sorted(gigs["career_title"].unique())
+    career_ids = {title: i + 1 for i, title in enumerate(titles)}
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Career), [{"name": title, "description": "-"} for title in titles]
+        )
+    records = gigs.to_dict("records")
+    for start in range(0, size, chunk):
+        rows = []
+        for i in range(start, min(start + chunk, size)):
+            gig = records[i % len(records)]
+            extra = " ".join(f"term{rng.randrange(vocabulary)}" for _ in range(3))
+            rows.append(
+                {
+                    "career_id": career_ids[gig["career_title"]],
+                    "title": gig["gig_title"],
+                    "company": gig["company"],
+                    "description": f"{gig['description']} {extra}",
+                    "required_skills": gig["required_skills"],
+                    "category": CATEGORY_MAPPING.get(gig["career_title"], "General"),
+                    "status": "Active",
+                    "url": f"{gig['url']}#{i}",
+                }
+            )
+        with engine.begin() as conn:
+            conn.execute(insert(Gig), rows)
+
+
+def timed(session, build, repeat: int) -> dict:
+    session.scalars(build()).all()
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(session.scalars(build()).all())
+        samples.append(time.perf_counter() - started)
+        session.expunge_all()
+    samples_ms = np.asarray(samples) * 1000
+    return {
+        "rows": rows,
+        "p50_ms": float(np.percentile(samples_ms, 50)),
+        "p95_ms": float(np.percentile(samples_ms, 95)),
+    }
+
+
+def bench_size(size: int, gigs: pd.DataFrame, args, directory: str) -> dict:
+    path = os.path.join(directory, f"gigs-{size}.db")
+    engine = create_db_engine(DatabaseSettings(f"sqlite:///{path}"))
+    Base.metadata.create_all(engine)
+    fill(engine, gigs, size, args.vocabulary)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        create_fts_table(conn, "gigs")
+    build_seconds = time.perf_counter() - started
+
+    queries = {
+        "rare term": ("term123", None),
+        "no match": ("nosuchword", None),
+        "common word": ("developer", None),
+        "prefix": ("dev", None),
+        "two words": ("data sci", None),
+        "common word + category": ("expert", "Web Development"),
+    }
+    results = {}
+    with Session(engine) as session:
+        for label, (search, category) in queries.items():
+
+            def build(search_with):
+                query, order = search_with(select(Gig))
+                if category:
+                    query = query.filter(Gig.category == category)
+                return page_query(query, Gig.id, None, 0, 100, order)[0]
+
+            def like(query):
+                return like_search(query, Gig, search), "id"
+
+            def fts(query):
+                return search_query(session, query, Gig, search)
+
+            results[label] = {
+                "search": search,
+                "like": timed(session, lambda: build(like), args.repeat),
+                "fts": timed(session, lambda: build(fts), args.repeat),
+            }
+    engine.dispose()
+    return {"fts_build_seconds": build_seconds, "queries": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default=os.path.join("data", "gigs.csv"))
+    parser.add_argument("--sizes", type=_int_list, default=[10000, 100000, 1000000])
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--dir", default=None, help="where to create the databases (default: tmp)"
+    )
+    args = parser.parse_args()
+
+    gigs = pd.read_csv(args.data)
+    with tempfile.TemporaryDirectory(prefix="fts-bench-", dir=args.dir) as directory:
+        results = {size: bench_size(size, gigs, args, directory) for size in args.sizes}
+    print(json.dumps({"repeat": args.repeat, "sizes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
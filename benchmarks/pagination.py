@@ -0,0 +1,196 @@
+"""
+Latency of deep pages of /courses, /gigs and /history with skip/limit
+(OFFSET) and with the keyset cursors of Backend/api/pagination.py.
+
+A fresh SQLite database is filled with --rows courses, gigs and
+recommendations (as benchmarks/route_indexes.py fills it) and the app's
+migrations are applied. One user is given --history extra recommendations.
+Then, for each route and each page number in --pages, the page of --limit
+rows is read --repeat times both ways, through page_query() and
+set_next_cursor(), as the routes page their select(). A cursor is built untimed from the previous page's
+last row, as a client paging through would hold it.
+
+Run from the project root:
+    python -m benchmarks.pagination --rows 1000000 --pages 1,10,100,1000,5000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+from fastapi import Response
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from Backend.api.pagination import encode_cursor, page_query, set_next_cursor
+from Backend.database.config import DatabaseSettings, create_db_engine
+from Backend.database.migrations import run_migrations
+from Backend.database.models import Base, Career, Course, Gig, Recommendation
+from benchmarks.route_indexes import CAREERS, CATEGORIES, fill
+
+HISTORY_USER = 1
+
+
+def _int_list(value: str):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def add_history(engine, rows: int, chunk: int = 50000):
+    for start in range(0, rows, chunk):
+        with engine.begin() as conn:
+            conn.execute(
+                insert(Recommendation),
+                [
+                    {
+                        "career_id": 1 + i % CAREERS,
+                        "rank": 1 + i % 5,
+                        "similarity_score": 0.5,
+                        "user_id": HISTORY_USER,
+                    }
+                    for i in range(start, min(start + chunk, rows))
+                ],
+            )
+
+
+def route_queries():
+    """(route, query, id column) built the way routes.py builds them."""
+    return [
+        ("GET /courses", select(Course), Course.id),
+        (
+            "GET /courses?level&cost_type",
+            select(Course).filter(
+                Course.level == "Beginner", Course.cost_type == "Free"
+            ),
+            Course.id,
+        ),
+        ("GET /gigs", select(Gig), Gig.id),
+        (
+            "GET /gigs?category",
+            select(Gig).filter(Gig.category == CATEGORIES[0]),
+            Gig.id,
+        ),
+        (
+            "GET /history",
+            select(
+                Recommendation.id,
+                Recommendation.career_id,
+                Recommendation.rank,
+                Recommendation.similarity_score,
+                Career.name,
+                Career.description,
+                Career.salary,
+            )
+            .outerjoin(Career, Recommendation.career_id == Career.id)
+            .where(Recommendation.user_id == HISTORY_USER),
+            Recommendation.id,
+        ),
+    ]
+
+
+def fetch(session, query):
+    # Entity selects are read as the routes read them, through scalars().
+    if len(query.column_descriptions) == 1:
+        return session.scalars(query).all()
+    return session.execute(query).all()
+
+
+def read_page(session, query, id_column, cursor, skip: int, limit: int):
+    page, start = page_query(query, id_column, cursor, skip, limit)
+    rows = fetch(session, page)
+    set_next_cursor(Response(), rows, start, limit)
+    return rows
+
+
+def timed(session, read, repeat: int) -> dict:
+    read()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = read()
+        samples.append(time.perf_counter() - started)
+        session.expunge_all()
+    samples_ms = np.asarray(samples) * 1000
+    return {
+        "rows": len(rows),
+        "p50_ms": float(np.percentile(samples_ms, 50)),
+        "p95_ms": float(np.percentile(samples_ms, 95)),
+    }
+
+
+def measure(session, query, id_column, pages, limit: int, repeat: int) -> dict:
+    results = {}
+    for page in pages:
+        skip = (page - 1) * limit
+        previous = (
+            fetch(session, query.order_by(id_column).offset(skip - 1).limit(1))
+            if skip
+            else None
+        )
+        if skip and not previous:
+            break
+        cursor = encode_cursor("id", previous[0].id) if previous else None
+        results[page] = {
+            "offset": timed(
+                session,
+                lambda: read_page(session, query, id_column, None, skip, limit),
+                repeat,
+            ),
+            "cursor": timed(
+                session,
+                lambda: read_page(session, query, id_column, cursor, 0, limit),
+                repeat,
+            ),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--history", type=int, default=200000)
+    parser.add_argument("--pages", type=_int_list, default=[1, 10, 100, 1000, 5000])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--dir", default=None, help="where to create the database (default: tmp)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="page-bench-", dir=args.dir) as directory:
+        engine = create_db_engine(
+            DatabaseSettings(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        )
+        Base.metadata.create_all(engine)
+        print(f"Filling {args.rows} courses, gigs and recommendations...")
+        fill(engine, args.rows)
+        add_history(engine, args.history)
+        run_migrations(engine)
+
+        with Session(engine) as session:
+            results = {
+                route: measure(
+                    session, query, id_column, args.pages, args.limit, args.repeat
+                )
+                for route, query, id_column in route_queries()
+            }
+        engine.dispose()
+
+    print(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "history_rows": args.history,
+                "limit": args.limit,
+                "repeat": args.repeat,
+                "routes": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
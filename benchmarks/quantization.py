@@ -0,0 +1,86 @@
+"""
+Memory, latency and top-k agreement of the float16 / int8 embedding storage
+modes against the float32 baseline.
+
+The catalog is the cached career embeddings, optionally grown to --size rows by
+adding small noise to copies of the real rows; queries are perturbed rows.
+
+Run from the project root:
+    python -m benchmarks.quantization --size 200000 --k 5
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from model.index import ExactIndex
+from model.quantization import STORAGE_DTYPES
+
+
+def synthetic_catalog(base: np.ndarray, size: int, rng, noise: float = 0.05):
+    picks = rng.choice(len(base), size)
+    jitter = rng.normal(scale=noise, size=(size, base.shape[1])).astype(np.float32)
+    return base[picks] + jitter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--embeddings", default="cache/career_embeddings.npy")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    catalog = synthetic_catalog(np.load(args.embeddings), args.size, rng)
+    queries = synthetic_catalog(catalog, args.queries, rng, noise=0.2)
+
+    baseline = None
+    results = []
+    for dtype in STORAGE_DTYPES:
+        index = ExactIndex(catalog, storage=dtype)
+        index.search(queries[: args.batch], args.k)
+
+        started = time.perf_counter()
+        found = [
+            index.search(queries[start : start + args.batch], args.k)[1]
+            for start in range(0, len(queries), args.batch)
+        ]
+        elapsed = time.perf_counter() - started
+        found = np.concatenate(found)
+
+        if baseline is None:
+            baseline = (found, index.vectors.nbytes)
+        overlap = np.mean(
+            [len(np.intersect1d(a, b)) / args.k for a, b in zip(found, baseline[0])]
+        )
+        results.append(
+            {
+                "dtype": dtype,
+                "bytes": int(index.vectors.nbytes),
+                "memory_saved_pct": 100 * (1 - index.vectors.nbytes / baseline[1]),
+                "ms_per_query": elapsed * 1000 / len(queries),
+                f"top{args.k}_overlap_vs_float32": float(overlap),
+            }
+        )
+
+    print(
+        json.dumps(
+            {
+                "catalog_size": args.size,
+                "dim": int(catalog.shape[1]),
+                "queries": args.queries,
+                "batch": args.batch,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Query plans and latency of the list / lookup routes before and after the
+route indexes (migration 0004_route_indexes in Backend/database/migrations.py).
+
+A fresh SQLite database is filled with --rows courses, gigs and
+recommendations, without the route indexes. Each route's query, built the way
+routes.py builds it, is run --repeat times with random parameters and its
+EXPLAIN QUERY PLAN recorded. The migration is then applied and everything is
+measured again.
+
+Run from the project root:
+    python -m benchmarks.route_indexes --rows 1000000 --repeat 50
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import func, insert, select, text
+
+from Backend.database.config import DatabaseSettings, create_db_engine
+from Backend.database.migrations import ROUTE_INDEXES, route_indexes
+from Backend.database.models import Base, Career, Course, Gig, Recommendation
+
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+COST_TYPES = ["Free", "Paid", "Subscription"]
+CATEGORIES = [f"Category {i}" for i in range(60)]
+STATUSES = ["Active", "Completed"]
+CAREERS = 1000
+
+
+def fill(engine, rows: int, chunk: int = 50000):
+    rng = random.Random(0)
+    companies = rows // 100 or 1
+    users = rows // 10 or 1
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Career),
+            [{"name": f"Career {i}", "description": "-"} for i in range(CAREERS)],
+        )
+    for start in range(0, rows, chunk):
+        ids = range(start, min(start + chunk, rows))
+        with engine.begin() as conn:
+            conn.execute(
+                insert(Course),
+                [
+                    {
+                        "career_id": 1 + i % CAREERS,
+                        "title": f"Course {i}",
+                        "provider": "Bench",
+                        "description": "-",
+                        "level": rng.choice(LEVELS),
+                        "cost_type": rng.choice(COST_TYPES),
+                        "url": f"https://example.com/course/{i}",
+                    }
+                    for i in ids
+                ],
+            )
+            conn.execute(
+                insert(Gig),
+                [
+                    {
+                        "career_id": 1 + i % CAREERS,
+                        "title": f"Gig {i} Needed",
+                        "company": f"Company {rng.randrange(companies)}",
+                        "description": "-",
+                        "category": rng.choice(CATEGORIES),
+                        "status": rng.choice(STATUSES),
+                        "url": f"https://example.com/gig/{i}",
+                    }
+                    for i in ids
+                ],
+            )
+            conn.execute(
+                insert(Recommendation),
+                [
+                    {
+                        "career_id": 1 + rng.randrange(CAREERS),
+                        "rank": 1 + i % 5,
+                        "similarity_score": rng.random(),
+                        "user_id": 1 + rng.randrange(users),
+                    }
+                    for i in ids
+                ],
+            )
+        print(f"  {min(start + chunk, rows)} / {rows} rows")
+    return {"companies": companies, "users": users}
+
+
+def route_queries(rows: int, companies: int, users: int):
+    """(route, query, random parameters) with the queries routes.py runs."""
+    return [
+        (
+            "GET /courses/{title}",
+            lambda p: select(Course).where(Course.title == p).limit(1),
+            lambda rng: f"Course {rng.randrange(rows)}",
+        ),
+        (
+            "GET /courses?level&cost_type",
+            lambda p: (
+                select(Course)
+                .where(Course.level == p[0], Course.cost_type == p[1])
+                .offset(0)
+                .limit(100)
+            ),
+            lambda rng: (rng.choice(LEVELS), rng.choice(COST_TYPES)),
+        ),
+        (
+            # The route logs the filtered count on every request.
+            "GET /courses?level (count)",
+            lambda p: select(func.count()).select_from(Course).where(Course.level == p),
+            lambda rng: rng.choice(LEVELS),
+        ),
+        (
+            "GET /gigs/title/{title}",
+            lambda p: select(Gig).where(func.lower(Gig.title) == p.lower()).limit(1),
+            lambda rng: f"gig {rng.randrange(rows)} needed",
+        ),
+        (
+            "POST /gigs/title/{title}/apply",
+            lambda p: select(Gig).where(Gig.title == p).limit(1),
+            lambda rng: f"Gig {rng.randrange(rows)} Needed",
+        ),
+        (
+            "GET /gigs?category",
+            lambda p: select(Gig).where(Gig.category == p).offset(0).limit(100),
+            lambda rng: rng.choice(CATEGORIES),
+        ),
+        (
+            "dashboard: gigs by status and category",
+            lambda p: (
+                select(func.count())
+                .select_from(Gig)
+                .where(Gig.status == p[0], Gig.category == p[1])
+            ),
+            lambda rng: (rng.choice(STATUSES), rng.choice(CATEGORIES)),
+        ),
+        (
+            "GET /dashboard/my_gigs",
+            lambda p: select(Gig).where(Gig.company == p),
+            lambda rng: f"Company {rng.randrange(companies)}",
+        ),
+        (
+            "GET /history",
+            lambda p: (
+                select(
+                    Recommendation.career_id,
+                    Recommendation.rank,
+                    Recommendation.similarity_score,
+                    Career.name,
+                    Career.description,
+                    Career.salary,
+                )
+                .outerjoin(Career, Recommendation.career_id == Career.id)
+                .where(Recommendation.user_id == p)
+                .order_by(Recommendation.id)
+            ),
+            lambda rng: 1 + rng.randrange(users),
+        ),
+    ]
+
+
+def query_plan(conn, query) -> list[str]:
+    compiled = query.compile(conn, compile_kwargs={"literal_binds": True})
+    return [
+        row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    ]
+
+
+def measure(engine, queries, repeat: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        for route, build, params in queries:
+            rng = random.Random(route)
+            samples = []
+            for _ in range(repeat):
+                query = build(params(rng))
+                started = time.perf_counter()
+                conn.execute(query).all()
+                samples.append(time.perf_counter() - started)
+            samples_ms = np.asarray(samples) * 1000
+            results[route] = {
+                "plan": query_plan(conn, build(params(rng))),
+                "p50_ms": float(np.percentile(samples_ms, 50)),
+                "p95_ms": float(np.percentile(samples_ms, 95)),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--dir", default=None, help="where to create the database (default: tmp)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="index-bench-", dir=args.dir) as directory:
+        engine = create_db_engine(
+            DatabaseSettings(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        )
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for _, name, _ in ROUTE_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        print(f"Filling {args.rows} courses, gigs and recommendations...")
+        sizes = fill(engine, args.rows)
+        queries = route_queries(args.rows, **sizes)
+
+        before = measure(engine, queries, args.repeat)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            route_indexes(conn)
+        migrate_seconds = time.perf_counter() - started
+        after = measure(engine, queries, args.repeat)
+        engine.dispose()
+
+    print(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "repeat": args.repeat,
+                "migration_seconds": migrate_seconds,
+                "routes": {
+                    route: {
+                        "before": before[route],
+                        "after": after[route],
+                        "speedup_p50": before[route]["p50_ms"]
+                        / max(after[route]["p50_ms"], 1e-9),
+                    }
+                    for route in before
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
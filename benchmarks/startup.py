@@ -0,0 +1,89 @@
+"""
+Startup benchmark for the API.
+
+Measures, in fresh interpreters:
+  * how long `import Backend.api.routes` takes and whether it drags in torch /
+    sentence-transformers (it should not);
+  * how long the app takes to answer /health and to report /ready through its
+    lifespan (the latter includes loading the model and embeddings).
+
+Run from the project root:
+    python -m benchmarks.startup --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import Backend.api.routes
+elapsed = time.perf_counter() - started
+heavy = sorted(m for m in ("torch", "sentence_transformers", "sklearn", "pandas")
+               if m in sys.modules)
+print(json.dumps({"import_seconds": elapsed, "heavy_modules_loaded": heavy}))
+"""
+
+LIFESPAN_PROBE = """
+import json, time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from Backend.api.routes import app, service
+with TestClient(app) as client:
+    assert client.get("/health").status_code == 200
+    health = time.perf_counter() - started
+    service.wait_until_ready(timeout=600)
+    ready_status = client.get("/ready").status_code
+    ready = time.perf_counter() - started
+print(json.dumps({"health_seconds": health, "ready_seconds": ready,
+                  "ready_status": ready_status,
+                  "model_load_seconds": service.load_seconds}))
+"""
+
+
+def run_probe(code: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(samples: list[dict], key: str) -> dict:
+    values = [sample[key] for sample in samples]
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "max": max(values),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--skip-ready",
+        action="store_true",
+        help="Only measure import time and /health (no model load).",
+    )
+    args = parser.parse_args()
+
+    imports = [run_probe(IMPORT_PROBE) for _ in range(args.repeat)]
+    report = {
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "import": summarize(imports, "import_seconds"),
+        "heavy_modules_loaded_on_import": imports[-1]["heavy_modules_loaded"],
+    }
+    if not args.skip_ready:
+        lifespans = [run_probe(LIFESPAN_PROBE) for _ in range(args.repeat)]
+        report["health"] = summarize(lifespans, "health_seconds")
+        report["ready"] = summarize(lifespans, "ready_seconds")
+        report["ready_status"] = lifespans[-1]["ready_status"]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import bisect
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from model.encoder import EncoderSaturated
+
+# Upper bounds (in milliseconds) of the queue-wait histogram buckets.
+WAIT_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 250, 1000]
+
+_STOP = object()
+
+
+class _PendingRequest:
+    __slots__ = ("text", "top_n", "filters", "field_weights", "future", "enqueued_at")
+
+    def __init__(
+        self,
+        text: str,
+        top_n: int,
+        filters: dict | None = None,
+        field_weights: dict | None = None,
+    ):
+        self.text = text
+        self.top_n = top_n
+        self.filters = filters
+        self.field_weights = field_weights
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Collects concurrent recommendation requests for up to max_wait_ms (or until
+    max_batch_size requests are queued) and runs them through a single
+    recommender.recommend_batch() call, then hands each caller its own results.
+
+    `workers` batches can be in flight at once (match it to the encoder's worker
+    count). When max_queue requests are already waiting, submit() raises
+    EncoderSaturated instead of letting the backlog grow without bound.
+    """
+
+    def __init__(
+        self,
+        recommender,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+        workers: int = 1,
+        max_queue: int = 0,
+    ):
+        self.recommender = recommender
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_queue = max_queue
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._batches = 0
+        self._requests = 0
+        self._rejected = 0
+
+        self._workers = [
+            threading.Thread(
+                target=self._run, name=f"recommend-batcher-{i}", daemon=True
+            )
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        quiz_answers_text: str,
+        top_n: int = 5,
+        filters: dict | None = None,
+        field_weights: dict | None = None,
+    ) -> Future:
+        request = _PendingRequest(quiz_answers_text, top_n, filters, field_weights)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise EncoderSaturated(
+                f"{self.max_queue} recommendation requests already queued"
+            )
+        return request.future
+
+    def recommend(
+        self,
+        quiz_answers_text: str,
+        top_n: int = 5,
+        filters: dict | None = None,
+        field_weights: dict | None = None,
+    ):
+        return self.submit(quiz_answers_text, top_n, filters, field_weights).result()
+
+    def close(self):
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = first.enqueued_at + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch):
+        started = time.perf_counter()
+        self._record(batch, started)
+        top_n = max(request.top_n for request in batch)
+        try:
+            results = self.recommender.recommend_batch(
+                [request.text for request in batch],
+                top_n,
+                [request.filters for request in batch],
+                [request.field_weights for request in batch],
+            )
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        for request, recs in zip(batch, results):
+            request.future.set_result(recs[: request.top_n])
+
+    def _record(self, batch, dispatched_at):
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._batch_sizes[len(batch)] += 1
+            for request in batch:
+                waited_ms = (dispatched_at - request.enqueued_at) * 1000
+                self._wait_counts[bisect.bisect_left(WAIT_BUCKETS_MS, waited_ms)] += 1
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the batch-size and queue-wait histograms, for tuning
+        max_batch_size / max_wait_ms.
+        """
+        with self._lock:
+            wait_labels = [f"<={bound}ms" for bound in WAIT_BUCKETS_MS]
+            wait_labels.append(f">{WAIT_BUCKETS_MS[-1]}ms")
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self._batches,
+                "requests": self._requests,
+                "mean_batch_size": (
+                    self._requests / self._batches if self._batches else 0.0
+                ),
+                "batch_size_histogram": {
+                    str(size): count
+                    for size, count in sorted(self._batch_sizes.items())
+                },
+                "wait_ms_histogram": dict(zip(wait_labels, self._wait_counts)),
+                "queued": self._queue.qsize(),
+                "rejected": self._rejected,
+            }
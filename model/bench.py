@@ -0,0 +1,346 @@
+"""
+Offline benchmark of the career recommender: encode time, index scoring time,
+end-to-end recommend_batch() latency percentiles and queries/sec at several
+batch sizes, plus recall@k of every non-reference index/storage mode against
+exact float32 search. Field-weighted scoring (model.fields) is timed alongside
+the combined-text index, both on its own and end to end.
+
+Catalogs of any size are grown from data/careers.csv: the real careers are
+encoded once and extra rows are noisy copies of them (with distinct text, so
+the embedding cache keys stay unique). Queries are quiz-style answers built
+from the careers' personality traits and skills.
+
+Run from the project root:
+    python -m model.bench --sizes 1000,100000 --batch-sizes 1,8,32 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from model.catalog import CareerCatalog
+from model.embedding_cache import EmbeddingCache
+from model.encoder import create_encoder, encoder_version
+from model.fields import SCORING_FIELDS, FieldIndex, normalize_field_weights
+from model.filters import normalize_filters
+from model.index import ExactIndex, IVFIndex, recall_at_k
+from model.query_cache import QueryCache
+from model.recommender import SemanticRecommender
+
+INDEX_CLASSES = {"exact": ExactIndex, "ivf": IVFIndex}
+
+
+def _csv_list(value: str, cast=str):
+    return [cast(part) for part in value.split(",") if part.strip()]
+
+
+def _csv_list_int(value: str):
+    return _csv_list(value, int)
+
+
+def latency_stats(samples: list[float], queries: int) -> dict:
+    """Percentiles (ms) of per-call latencies and the overall queries/sec."""
+    samples_ms = np.asarray(samples) * 1000
+    total = float(np.sum(samples))
+    return {
+        "calls": len(samples),
+        "p50_ms": float(np.percentile(samples_ms, 50)),
+        "p95_ms": float(np.percentile(samples_ms, 95)),
+        "p99_ms": float(np.percentile(samples_ms, 99)),
+        "mean_ms": float(samples_ms.mean()),
+        "qps": queries / total if total else 0.0,
+    }
+
+
+def timed_batches(run, items, batch_size: int) -> dict:
+    """Calls run(batch) over items in batches of batch_size, after one warm-up."""
+    run(items[:batch_size])
+    samples = []
+    for start in range(0, len(items), batch_size):
+        started = time.perf_counter()
+        run(items[start : start + batch_size])
+        samples.append(time.perf_counter() - started)
+    return latency_stats(samples, len(items))
+
+
+def sample_quiz_texts(df: pd.DataFrame, n: int, rng) -> list[str]:
+    """Quiz-style answers mixing the traits and skills of random careers."""
+    texts = []
+    for i in rng.integers(len(df), size=n):
+        row = df.iloc[i]
+        traits = [t.strip().lower() for t in str(row["personality_match"]).split(",")]
+        skills = [s.strip() for s in str(row["skills"]).split(",")]
+        rng.shuffle(traits)
+        rng.shuffle(skills)
+        keep = rng.integers(1, len(skills) + 1)
+        texts.append(
+            f"I am {', '.join(traits)} and I enjoy {', '.join(skills[:keep])}."
+        )
+    return texts
+
+
+def synthetic_careers(df: pd.DataFrame, embeddings: np.ndarray, size: int, rng):
+    """
+    (catalog, embeddings, picks) with `size` rows: the real careers first, then
+    noisy replicas whose title and description carry a variant number. picks
+    holds the real career each row copies.
+    """
+    base = min(size, len(df))
+    picks = np.concatenate(
+        [np.arange(base), rng.integers(len(df), size=size - base)]
+    ).astype(np.int64)
+    catalog = df.iloc[picks].reset_index(drop=True)
+    vectors = embeddings[picks].astype(np.float32)
+
+    replicas = np.arange(size) >= base
+    if replicas.any():
+        suffix = pd.Series(np.arange(size), dtype=str)[replicas]
+        catalog.loc[replicas, "career_title"] += " #" + suffix
+        catalog.loc[replicas, "description"] += " (variant " + suffix + ")"
+        noise = rng.normal(scale=0.05, size=(int(replicas.sum()), vectors.shape[1]))
+        vectors[replicas] += noise.astype(np.float32)
+    return catalog, vectors, picks
+
+
+def bench_encoder(encoder, catalog_texts, queries, batch_sizes) -> dict:
+    started = time.perf_counter()
+    encoder.encode(catalog_texts)
+    catalog_seconds = time.perf_counter() - started
+    return {
+        "catalog_rows": len(catalog_texts),
+        "catalog_seconds": catalog_seconds,
+        "batches": {
+            str(b): timed_batches(encoder.encode, queries, b) for b in batch_sizes
+        },
+    }
+
+
+def bench_catalog(
+    encoder,
+    catalog,
+    vectors,
+    field_vectors,
+    queries,
+    query_vectors,
+    modes,
+    args,
+    model_name,
+) -> list[dict]:
+    reference = ExactIndex(vectors)
+    filters = normalize_filters(args.filters)
+    catalog = CareerCatalog.from_frame(catalog)
+    mask = catalog.attributes.mask(filters)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="career-bench-") as cache_dir:
+        cache = EmbeddingCache(
+            cache_dir,
+            "career_embeddings",
+            model_name=model_name,
+            model_version=encoder_version(encoder),
+        )
+        cache.prime(catalog.texts(), vectors)
+        for field, matrix in zip(SCORING_FIELDS, field_vectors):
+            EmbeddingCache(
+                cache_dir,
+                f"career_{field}_embeddings",
+                model_name=model_name,
+                model_version=encoder_version(encoder),
+            ).prime(catalog.field_texts(field), matrix)
+        weights = normalize_field_weights(args.field_weights)
+
+        for index_type, dtype in modes:
+            params = (
+                {"n_lists": args.ivf_lists, "n_probe": args.ivf_probe}
+                if index_type == "ivf"
+                else {}
+            )
+            started = time.perf_counter()
+            index = INDEX_CLASSES[index_type](vectors, storage=dtype, **params)
+            build_seconds = time.perf_counter() - started
+
+            result = {
+                "index": index_type,
+                "dtype": dtype,
+                "params": index.params(),
+                "build_seconds": build_seconds,
+                "matrix_bytes": int(index.vectors.nbytes),
+            }
+            if (index_type, dtype) != ("exact", "float32"):
+                result[f"recall@{args.k}"] = recall_at_k(
+                    index, reference, query_vectors, args.k
+                )
+            result["scoring"] = {
+                str(b): timed_batches(
+                    lambda batch: index.search(batch, args.k), query_vectors, b
+                )
+                for b in args.batch_sizes
+            }
+            if filters:
+                result["filter_selectivity"] = float(mask.mean())
+                result["scoring_filtered"] = {
+                    str(b): timed_batches(
+                        lambda batch: index.search(batch, args.k, mask),
+                        query_vectors,
+                        b,
+                    )
+                    for b in args.batch_sizes
+                }
+
+            # Field-weighted scoring: one matmul over rows three times as wide.
+            field_index = FieldIndex(field_vectors, storage=dtype)
+            result["fields_matrix_bytes"] = int(field_index.vectors.nbytes)
+            result["scoring_weighted"] = {
+                str(b): timed_batches(
+                    lambda batch: field_index.search(batch, args.k, weights=weights),
+                    query_vectors,
+                    b,
+                )
+                for b in args.batch_sizes
+            }
+
+            # The query cache is disabled so every call pays for encoding.
+            recommender = SemanticRecommender(
+                catalog,
+                model_name=model_name,
+                query_cache=QueryCache(max_entries=0),
+                index_type=index_type,
+                index_params=params,
+                cache_dir=cache_dir,
+                embedding_dtype=dtype,
+                encoder=encoder,
+            )
+            result["end_to_end"] = {
+                str(b): timed_batches(
+                    lambda batch: recommender.recommend_batch(batch, args.k),
+                    queries,
+                    b,
+                )
+                for b in args.batch_sizes
+            }
+            if filters:
+                result["end_to_end_filtered"] = {
+                    str(b): timed_batches(
+                        lambda batch: recommender.recommend_batch(
+                            batch, args.k, [args.filters] * len(batch)
+                        ),
+                        queries,
+                        b,
+                    )
+                    for b in args.batch_sizes
+                }
+            result["end_to_end_weighted"] = {
+                str(b): timed_batches(
+                    lambda batch: recommender.recommend_batch(
+                        batch, args.k, None, [args.field_weights] * len(batch)
+                    ),
+                    queries,
+                    b,
+                )
+                for b in args.batch_sizes
+            }
+            results.append(result)
+            print(f"  {index_type}/{dtype}: done")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default=os.path.join("data", "careers.csv"))
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--encoder", default="local", choices=["local", "process"])
+    parser.add_argument("--sizes", type=_csv_list_int, default=[1000, 10000, 100000])
+    parser.add_argument("--batch-sizes", type=_csv_list_int, default=[1, 8, 32])
+    parser.add_argument("--index", type=_csv_list, default=["exact", "ivf"])
+    parser.add_argument("--dtypes", type=_csv_list, default=["float32", "int8"])
+    parser.add_argument("--ivf-lists", type=int, default=None)
+    parser.add_argument("--ivf-probe", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=256)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument(
+        "--filters",
+        type=json.loads,
+        default=None,
+        help="also time filtered searches, e.g. '{\"min_salary\": 100000}'",
+    )
+    parser.add_argument(
+        "--field-weights",
+        type=json.loads,
+        default={"description": 0.2, "skills": 0.3, "personality_match": 0.5},
+        help="weights for the field-weighted timings",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    df = pd.read_csv(args.data)
+    modes = [(index_type, dtype) for index_type in args.index for dtype in args.dtypes]
+    queries = sample_quiz_texts(df, args.queries, rng)
+
+    encoder = create_encoder(args.model, args.encoder)
+    try:
+        catalog_texts = CareerCatalog.from_frame(df).texts()
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "model": args.model,
+                "encoder": encoder.stats(),
+            },
+            "config": {
+                "queries": args.queries,
+                "k": args.k,
+                "batch_sizes": args.batch_sizes,
+                "filters": args.filters,
+                "field_weights": args.field_weights,
+                "seed": args.seed,
+            },
+            "encode": bench_encoder(encoder, catalog_texts, queries, args.batch_sizes),
+            "catalogs": [],
+        }
+        base_vectors = encoder.encode(catalog_texts)
+        base_catalog = CareerCatalog.from_frame(df)
+        base_fields = [
+            encoder.encode(base_catalog.field_texts(field)) for field in SCORING_FIELDS
+        ]
+        query_vectors = encoder.encode(queries)
+
+        for size in args.sizes:
+            print(f"Benchmarking a catalog of {size} careers...")
+            catalog, vectors, picks = synthetic_careers(df, base_vectors, size, rng)
+            report["catalogs"].append(
+                {
+                    "size": size,
+                    "results": bench_catalog(
+                        encoder,
+                        catalog,
+                        vectors,
+                        [matrix[picks] for matrix in base_fields],
+                        queries,
+                        query_vectors,
+                        modes,
+                        args,
+                        args.model,
+                    ),
+                }
+            )
+    finally:
+        encoder.close()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Bulk build of a table's embedding cache for large catalogs.
+
+Texts still missing from the cache are sorted by (approximate) token length and
+cut into chunks, so each chunk pads to a similar length; the chunks are encoded
+across worker processes, longest first, and every finished chunk is written to
+<cache_dir>/<name>.build/ straight away. An interrupted build picks up from the
+chunks already on disk. The cache itself is only replaced, atomically, once all
+chunks are done.
+
+Run from the project root to prepare cache/ before starting the API (the
+combined career texts, plus one cache per field for field-weighted scoring
+unless --no-fields):
+    python -m model.build_embeddings --data data/careers.csv --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from model.catalog import CareerCatalog
+from model.embedding_cache import EmbeddingCache, _atomic_save, text_hash
+from model.encoder import _encode_in_worker, _init_worker, encoder_version
+from model.fields import SCORING_FIELDS
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def token_length(text: str) -> int:
+    """Word and punctuation count: a cheap stand-in for the tokenizer's length."""
+    return len(_TOKEN.findall(text))
+
+
+def length_buckets(texts: list[str], chunk_size: int) -> list[np.ndarray]:
+    """Positions of texts grouped into chunks of similar length, shortest first."""
+    order = np.argsort([token_length(text) for text in texts], kind="stable")
+    return [order[i : i + chunk_size] for i in range(0, len(order), chunk_size)]
+
+
+class ParallelEmbeddingBuilder:
+    """
+    An encode(texts) for EmbeddingCache.load_or_encode() that runs the bucketed,
+    chunked, resumable build described above in `workers` spawned processes.
+    Inputs of at most one chunk go to `fallback` (an already loaded encoder)
+    when one is given, since starting workers would cost more than they save.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        work_dir: str,
+        workers: int = 2,
+        chunk_size: int = 1024,
+        backend: str = "torch",
+        threads_per_worker: int = 1,
+        fallback=None,
+    ):
+        self.model_name = model_name
+        self.work_dir = work_dir
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.backend = backend
+        self.threads_per_worker = threads_per_worker
+        self.fallback = fallback
+        self.last_stats = {}
+
+    def _fingerprint(self, texts: list[str]) -> str:
+        digest = hashlib.sha1(
+            f"{self.model_name}\x1f{encoder_version(self)}\x1f{self.chunk_size}".encode()
+        )
+        for text in texts:
+            digest.update(text_hash(text).encode())
+        return digest.hexdigest()
+
+    def _prepare_work_dir(self, fingerprint: str):
+        """Keeps the chunks of an interrupted build of the same texts, else clears."""
+        marker = os.path.join(self.work_dir, "build.json")
+        if os.path.exists(marker):
+            with open(marker) as f:
+                if json.load(f).get("fingerprint") == fingerprint:
+                    return
+            shutil.rmtree(self.work_dir)
+        os.makedirs(self.work_dir, exist_ok=True)
+        with open(marker, "w") as f:
+            json.dump({"fingerprint": fingerprint, "model": self.model_name}, f)
+
+    def _chunk_path(self, number: int) -> str:
+        return os.path.join(self.work_dir, f"chunk-{number:05d}.npy")
+
+    def _load_chunk(self, number: int, rows: int):
+        try:
+            matrix = np.load(self._chunk_path(number))
+        except (OSError, ValueError):
+            return None
+        return matrix if len(matrix) == rows else None
+
+    def encode(self, texts: list[str], **kwargs) -> np.ndarray:
+        texts = list(texts)
+        if self.fallback is not None and len(texts) <= self.chunk_size:
+            return self.fallback.encode(texts, **kwargs)
+
+        started = time.perf_counter()
+        self._prepare_work_dir(self._fingerprint(texts))
+        buckets = length_buckets(texts, self.chunk_size)
+        chunks = {}
+        for number, positions in enumerate(buckets):
+            matrix = self._load_chunk(number, len(positions))
+            if matrix is not None:
+                chunks[number] = matrix
+        resumed = len(chunks)
+        todo = [number for number in range(len(buckets)) if number not in chunks]
+        print(
+            f"Encoding {len(texts)} texts in {len(buckets)} chunks "
+            f"({resumed} already on disk) with {self.workers} workers..."
+        )
+
+        if todo:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(todo)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.threads_per_worker, self.backend),
+            ) as pool:
+                # Longest chunks first so the slowest ones do not finish last.
+                futures = {
+                    pool.submit(
+                        _encode_in_worker, [texts[i] for i in buckets[number]]
+                    ): number
+                    for number in reversed(todo)
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    number = futures[future]
+                    matrix = np.asarray(future.result(), dtype=np.float32)
+                    _atomic_save(self._chunk_path(number), lambda f: np.save(f, matrix))
+                    chunks[number] = matrix
+                    print(f"  chunk {number} done ({done}/{len(todo)})")
+
+        dim = chunks[0].shape[1]
+        embeddings = np.empty((len(texts), dim), dtype=np.float32)
+        for number, positions in enumerate(buckets):
+            embeddings[positions] = chunks[number]
+        self.last_stats = {
+            "texts": len(texts),
+            "chunks": len(buckets),
+            "resumed_chunks": resumed,
+            "seconds": time.perf_counter() - started,
+        }
+        return embeddings
+
+    def finish(self):
+        """Deletes the chunk files once their embeddings are in the cache."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+def build_cache(
+    name: str,
+    texts: list[str],
+    model_name: str,
+    cache_dir: str = "cache",
+    workers: int = 2,
+    chunk_size: int = 1024,
+    backend: str = "torch",
+    threads_per_worker: int = 1,
+    fallback=None,
+) -> dict:
+    """
+    Brings cache_dir/<name>.npy up to date for texts with a
+    ParallelEmbeddingBuilder; returns the cache's stats for the build.
+    """
+    builder = ParallelEmbeddingBuilder(
+        model_name,
+        os.path.join(cache_dir, f"{name}.build"),
+        workers=workers,
+        chunk_size=chunk_size,
+        backend=backend,
+        threads_per_worker=threads_per_worker,
+        fallback=fallback,
+    )
+    cache = EmbeddingCache(
+        cache_dir, name, model_name=model_name, model_version=encoder_version(builder)
+    )
+    cache.load_or_encode(texts, builder.encode)
+    builder.finish()
+    return {**cache.last_stats, **builder.last_stats}
+
+
+def career_caches(catalog, field_scoring: bool = True) -> list[tuple]:
+    """
+    (cache name, texts) of every embedding cache the recommender reads for
+    catalog: the combined career texts and, with field_scoring, each field.
+    """
+    caches = [("career_embeddings", catalog.texts())]
+    if field_scoring:
+        caches += [
+            (f"career_{field}_embeddings", catalog.field_texts(field))
+            for field in SCORING_FIELDS
+        ]
+    return caches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default=os.path.join("data", "careers.csv"))
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--cache-dir", default="cache")
+    parser.add_argument(
+        "--fields",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="also build the per-field caches used by field-weighted scoring",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--backend", default="torch")
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    catalog = CareerCatalog.from_csv(args.data)
+    stats = {
+        name: build_cache(
+            name,
+            texts,
+            args.model,
+            cache_dir=args.cache_dir,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            backend=args.backend,
+            threads_per_worker=args.threads,
+        )
+        for name, texts in career_caches(catalog, args.fields)
+    }
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import csv
+import math
+
+from model.filters import CareerAttributes
+
+# Result fields and the catalog column each one is read from.
+RESULT_FIELDS = {
+    "career_id": "career_id",
+    "career_title": "career_title",
+    "description": "description",
+    "skills": "skills",
+    "personality_match": "personality_match",
+    "education_required": "education_requirement",
+    "average_salary_usd": "average_salary_usd",
+    "job_outlook": "job_outlook",
+    "learning_resources": "learning_resources",
+}
+
+_FIELD_NAMES = list(RESULT_FIELDS)
+_DESCRIPTION = _FIELD_NAMES.index("description")
+_SKILLS = _FIELD_NAMES.index("skills")
+_PERSONALITY = _FIELD_NAMES.index("personality_match")
+_EDUCATION = _FIELD_NAMES.index("education_required")
+_SALARY = _FIELD_NAMES.index("average_salary_usd")
+_OUTLOOK = _FIELD_NAMES.index("job_outlook")
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value)
+
+
+def _career_id(value) -> int | None:
+    # Careers read from the database carry their row id; CSV rows have none.
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _salary(value) -> float:
+    try:
+        salary = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if math.isnan(salary) else salary
+
+
+class CareerCatalog:
+    """
+    Read-only list of the careers the recommender serves, one tuple of result
+    values (in RESULT_FIELDS order) per career. Building a result is a list
+    lookup and a dict(zip()), with no DataFrame in memory; the filterable
+    fields are also held as numpy columns in `attributes`.
+    """
+
+    __slots__ = ("rows", "attributes")
+
+    def __init__(self, rows: list[tuple]):
+        self.rows = rows
+        self.attributes = CareerAttributes.parse(
+            [row[_SALARY] for row in rows],
+            [row[_EDUCATION] for row in rows],
+            [row[_OUTLOOK] for row in rows],
+        )
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds the catalog from dicts keyed by data/careers.csv column names,
+        plus "career_id" for careers read from the database. A record may carry
+        "education_required" instead of "education_requirement".
+        """
+        rows = []
+        for record in records:
+            values = {
+                field: _text(record.get(column))
+                for field, column in RESULT_FIELDS.items()
+            }
+            if not values["education_required"]:
+                values["education_required"] = _text(record.get("education_required"))
+            values["career_id"] = _career_id(record.get("career_id"))
+            values["average_salary_usd"] = _salary(record.get("average_salary_usd"))
+            rows.append(tuple(values.values()))
+        return cls(rows)
+
+    @classmethod
+    def from_csv(cls, path: str):
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls.from_records(csv.DictReader(f))
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls.from_records(df.to_dict("records"))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def texts(self) -> list[str]:
+        return [
+            " ".join((row[_DESCRIPTION], row[_SKILLS], row[_PERSONALITY]))
+            for row in self.rows
+        ]
+
+    def field_texts(self, field: str) -> list[str]:
+        position = _FIELD_NAMES.index(field)
+        return [row[position] for row in self.rows]
+
+    def result(self, idx: int, score: float) -> dict:
+        result = dict(zip(RESULT_FIELDS, self.rows[idx]))
+        result["similarity_score"] = float(score)
+        return result
@@ -0,0 +1,122 @@
+import hashlib
+import os
+
+import joblib
+import numpy as np
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def matrix_checksum(matrix: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(matrix).tobytes()).hexdigest()
+
+
+def _atomic_save(path: str, write):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding matrix whose rows are keyed by a hash of the text that
+    produced them, so a rebuild only encodes texts that are new or changed and
+    silently drops rows whose text disappeared.
+
+    Two files are written next to each other:
+      <name>.npy           the embedding matrix, one row per text
+      <name>.manifest.pkl  model name/version, per-row text hashes and a
+                           checksum tying the manifest to that exact matrix
+    """
+
+    def __init__(self, cache_dir: str, name: str, model_name: str, model_version=""):
+        self.embeddings_path = os.path.join(cache_dir, f"{name}.npy")
+        self.manifest_path = os.path.join(cache_dir, f"{name}.manifest.pkl")
+        self.model_name = model_name
+        self.model_version = model_version
+        self.last_stats = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _load_cached(self):
+        """Returns {text_hash: vector} from disk, or {} if absent/stale/corrupt."""
+        if not (
+            os.path.exists(self.embeddings_path) and os.path.exists(self.manifest_path)
+        ):
+            return {}
+        try:
+            manifest = joblib.load(self.manifest_path)
+            if (manifest["model_name"], manifest["model_version"]) != (
+                self.model_name,
+                self.model_version,
+            ):
+                print(
+                    f"Embedding cache {self.embeddings_path} was built by another model."
+                )
+                return {}
+            matrix = np.load(self.embeddings_path)
+            if (
+                len(matrix) != len(manifest["hashes"])
+                or matrix_checksum(matrix) != manifest["checksum"]
+            ):
+                raise ValueError("manifest does not match the cached embeddings")
+        except Exception as e:
+            print("Failed to load embedding cache - re-encoding:", e)
+            return {}
+        return dict(zip(manifest["hashes"], matrix))
+
+    def load_or_encode(self, texts: list[str], encode) -> np.ndarray:
+        """
+        Embeddings for texts, in order. Rows whose text hash is already cached are
+        reused; the rest are passed (deduplicated) to encode(list_of_texts).
+        The cache on disk is rewritten only when its contents changed.
+        """
+        hashes = [text_hash(text) for text in texts]
+        cached = self._load_cached()
+
+        missing = {}
+        for text, digest in zip(texts, hashes):
+            if digest not in cached and digest not in missing:
+                missing[digest] = text
+        if missing:
+            print(f"Encoding {len(missing)} new or changed texts...")
+            encoded = encode(list(missing.values()))
+            cached.update(zip(missing, encoded))
+
+        if not hashes:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        else:
+            matrix = np.stack([cached[digest] for digest in hashes]).astype(
+                np.float32, copy=False
+            )
+        current = set(hashes)
+        dropped = sum(1 for digest in cached if digest not in current)
+        self.last_stats = {
+            "rows": len(hashes),
+            "reused": sum(1 for digest in hashes if digest not in missing),
+            "encoded": len(missing),
+            "dropped": dropped,
+        }
+        if missing or dropped or not os.path.exists(self.manifest_path):
+            self._save(matrix, hashes)
+        return matrix
+
+    def prime(self, texts: list[str], matrix: np.ndarray):
+        """Writes matrix as the cached embeddings of texts without encoding."""
+        self._save(
+            np.asarray(matrix, dtype=np.float32), [text_hash(text) for text in texts]
+        )
+
+    def _save(self, matrix: np.ndarray, hashes: list[str]):
+        manifest = {
+            "model_name": self.model_name,
+            "model_version": self.model_version,
+            "hashes": hashes,
+            "checksum": matrix_checksum(matrix),
+        }
+        # Matrix first: a crash between the two writes leaves a manifest whose
+        # checksum no longer matches, which is detected and re-encoded.
+        _atomic_save(self.embeddings_path, lambda f: np.save(f, matrix))
+        _atomic_save(self.manifest_path, lambda f: joblib.dump(manifest, f))
@@ -0,0 +1,228 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from importlib.metadata import version
+
+import numpy as np
+
+from model.scoring import normalize_rows
+
+ENCODER_BACKENDS = ("torch", "torch-int8", "onnx")
+
+
+class EncoderSaturated(RuntimeError):
+    """Raised instead of queueing more work when the encoder is at capacity."""
+
+
+def load_sentence_model(model_name: str, backend: str = "torch", num_threads: int = 0):
+    """
+    Loads model_name (from the local Hugging Face cache when present) with one
+    of the CPU inference backends:
+      torch       eager PyTorch, the reference
+      torch-int8  PyTorch with every nn.Linear dynamically quantized to int8
+      onnx        ONNX Runtime graph exported from the same weights; needs
+                  the sentence-transformers[onnx] extra
+    num_threads > 0 sets the intra-op thread count.
+    """
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(
+            f"Unknown encoder backend {backend!r}; expected one of {ENCODER_BACKENDS}"
+        )
+    # Imported here so that importing this module does not pull in torch.
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    if backend == "onnx":
+        import onnxruntime
+
+        session_options = onnxruntime.SessionOptions()
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
+        return SentenceTransformer(
+            model_name,
+            backend="onnx",
+            model_kwargs={
+                "provider": "CPUExecutionProvider",
+                "session_options": session_options,
+            },
+        )
+
+    model = SentenceTransformer(model_name, device="cpu")
+    if backend == "torch-int8":
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return model
+
+
+def encoder_version(encoder) -> str:
+    """
+    sentence-transformers version, suffixed with the encoder's backend unless
+    it is the torch reference: embedding caches key on it, so vectors from
+    another backend are never mixed into theirs.
+    """
+    backend = getattr(encoder, "backend", "torch")
+    st_version = version("sentence-transformers")
+    return st_version if backend == "torch" else f"{st_version}+{backend}"
+
+
+def embedding_parity(reference, candidate, texts: list[str], tolerance=0.01) -> dict:
+    """
+    Compares the embeddings two encoders produce for texts. ok is True when
+    every pair's cosine similarity is at least 1 - tolerance.
+    """
+    expected = normalize_rows(reference.encode(texts))
+    actual = normalize_rows(candidate.encode(texts))
+    cosine = np.sum(expected * actual, axis=1)
+    return {
+        "texts": len(texts),
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "max_abs_diff": float(np.abs(expected - actual).max()),
+        "tolerance": tolerance,
+        "ok": bool(cosine.min() >= 1 - tolerance),
+    }
+
+
+class LocalEncoder:
+    """
+    Runs the sentence-transformers model in the calling process, with the
+    given inference backend (see load_sentence_model).
+    encode_async() offloads to a thread so an event loop is never blocked.
+    """
+
+    max_workers = 1
+
+    def __init__(self, model_name: str, backend: str = "torch", num_threads: int = 0):
+        self.model_name = model_name
+        self.backend = backend
+        self.num_threads = num_threads
+        print(f"Loading sentence-transformers model: {model_name} ({backend})")
+        self.model = load_sentence_model(model_name, backend, num_threads)
+
+    def encode(self, texts: list[str], **kwargs) -> np.ndarray:
+        return self.model.encode(texts, convert_to_numpy=True, **kwargs)
+
+    async def encode_async(self, texts: list[str]) -> np.ndarray:
+        return await asyncio.to_thread(self.encode, texts)
+
+    def stats(self) -> dict:
+        return {
+            "type": "local",
+            "backend": self.backend,
+            "workers": 1,
+            "threads": self.num_threads or None,
+        }
+
+    def close(self):
+        pass
+
+
+_worker_model = None
+
+
+def _init_worker(model_name: str, num_threads: int, backend: str = "torch"):
+    global _worker_model
+    _worker_model = load_sentence_model(model_name, backend, num_threads)
+
+
+def _encode_in_worker(texts: list[str]) -> np.ndarray:
+    return _worker_model.encode(texts, convert_to_numpy=True)
+
+
+class ProcessPoolEncoder:
+    """
+    Encodes in a pool of worker processes, each loading the model once, so
+    tokenization and inference never hold the API process's GIL.
+
+    At most max_pending encode calls may be queued or running at once; further
+    calls wait up to acquire_timeout seconds for a slot and then raise
+    EncoderSaturated, which the API turns into a 503. encode_async() runs on
+    the event loop, so it does not wait: it raises as soon as no slot is free.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        workers: int = 2,
+        max_pending: int | None = None,
+        acquire_timeout: float = 1.0,
+        threads_per_worker: int = 1,
+        backend: str = "torch",
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.threads_per_worker = threads_per_worker
+        self.max_workers = workers
+        self.max_pending = max_pending or 2 * workers
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+        # "spawn" so workers never inherit torch / thread state from the parent.
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, threads_per_worker, backend),
+        )
+
+    def submit(self, texts: list[str], wait: bool = True) -> Future:
+        acquired = (
+            self._slots.acquire(timeout=self.acquire_timeout)
+            if wait
+            else self._slots.acquire(blocking=False)
+        )
+        if not acquired:
+            with self._lock:
+                self._rejected += 1
+            raise EncoderSaturated(
+                f"All {self.max_pending} encoder slots are busy; try again later"
+            )
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._pool.submit(_encode_in_worker, list(texts))
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def encode(self, texts: list[str], **kwargs) -> np.ndarray:
+        return self.submit(texts).result()
+
+    async def encode_async(self, texts: list[str]) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(texts, wait=False))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "type": "process",
+                "backend": self.backend,
+                "workers": self.max_workers,
+                "threads": self.threads_per_worker,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "rejected": self._rejected,
+            }
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def create_encoder(model_name: str, kind: str = "local", **options):
+    if kind == "local":
+        return LocalEncoder(model_name, **options)
+    if kind == "process":
+        return ProcessPoolEncoder(model_name, **options)
+    raise ValueError(f"Unknown encoder type {kind!r}; expected 'local' or 'process'")
@@ -0,0 +1,101 @@
+import numpy as np
+
+from model.embedding_cache import EmbeddingCache
+from model.encoder import encoder_version
+from model.index import ExactIndex
+from model.quantization import quantize
+from model.scoring import normalize_rows
+
+# Career fields embedded on their own for field-weighted scoring, in the order
+# their blocks are laid out in FieldIndex.vectors.
+SCORING_FIELDS = ("description", "skills", "personality_match")
+
+
+def normalize_field_weights(weights: dict | None) -> tuple:
+    """
+    Hashable form of a field_weights dict: one weight per SCORING_FIELDS entry
+    (missing fields weigh 0), scaled to sum to 1. Returns () when there is
+    nothing to weigh, meaning the combined-text embedding is used. Raises
+    ValueError for unknown fields or negative weights.
+    """
+    if not weights:
+        return ()
+    for field, value in weights.items():
+        if field not in SCORING_FIELDS:
+            raise ValueError(
+                f"Unknown field {field!r}; expected one of {list(SCORING_FIELDS)}"
+            )
+        if value is not None and value < 0:
+            raise ValueError(f"Weight of {field} must not be negative")
+    values = [float(weights.get(field) or 0) for field in SCORING_FIELDS]
+    total = sum(values)
+    if total == 0:
+        return ()
+    return tuple(value / total for value in values)
+
+
+def load_field_embeddings(
+    catalog, encoder, model_name: str, cache_dir: str = "cache"
+) -> list[np.ndarray]:
+    """
+    One embedding matrix per SCORING_FIELDS entry, each with its own
+    content-hash cache (career_<field>_embeddings.npy), so only new or edited
+    field texts are encoded.
+    """
+    matrices = []
+    for field in SCORING_FIELDS:
+        cache = EmbeddingCache(
+            cache_dir,
+            f"career_{field}_embeddings",
+            model_name=model_name,
+            model_version=encoder_version(encoder),
+        )
+        matrices.append(
+            cache.load_or_encode(
+                catalog.field_texts(field),
+                lambda missing: encoder.encode(missing, show_progress_bar=True),
+            )
+        )
+        print(f"career {field} embeddings ready:", cache.last_stats)
+    return matrices
+
+
+class FieldIndex(ExactIndex):
+    """
+    Exact search over per-field career embeddings with per-query field weights.
+
+    Row i of `vectors` is career i's normalized field embeddings laid side by
+    side, [description | skills | personality_match], so it is 3 x dim wide.
+    A query is expanded the same way, each block scaled by its field's weight,
+    and a single matmul then gives sum(w_f * cos(query, field_f)) for every
+    career: one GEMM per batch, as for the combined-text index, over rows
+    three times as wide. Scores stay on the cosine scale because the weights
+    sum to 1.
+    """
+
+    kind = "fields"
+
+    def __init__(self, field_embeddings: list[np.ndarray], storage: str = "float32"):
+        self.storage = storage
+        self.n_fields = len(field_embeddings)
+        self.vectors = quantize(
+            np.hstack([normalize_rows(matrix) for matrix in field_embeddings]),
+            storage,
+        )
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        mask: np.ndarray | None = None,
+        weights=None,
+    ):
+        """weights: (n_fields,) for every query or (n_queries, n_fields)."""
+        queries = normalize_rows(queries)
+        if weights is None:
+            weights = np.full(self.n_fields, 1 / self.n_fields)
+        weights = np.broadcast_to(
+            np.asarray(weights, dtype=np.float32), (len(queries), self.n_fields)
+        )
+        expanded = (weights[:, :, None] * queries[:, None, :]).reshape(len(queries), -1)
+        return self._search_normalized(expanded, k, mask)
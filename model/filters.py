@@ -0,0 +1,130 @@
+import re
+
+import numpy as np
+
+# Ordered lowest to highest; filters compare positions in these tuples.
+EDUCATION_LEVELS = ("high_school", "associate", "bachelor", "master", "doctorate")
+OUTLOOK_LEVELS = ("limited", "varies", "steady", "growing", "high", "very_high")
+
+FILTER_FIELDS = (
+    "min_salary",
+    "max_salary",
+    "min_education",
+    "max_education",
+    "min_outlook",
+)
+
+_EDUCATION_PATTERNS = [
+    ("high_school", re.compile(r"high school", re.I)),
+    ("associate", re.compile(r"associate", re.I)),
+    ("bachelor", re.compile(r"bachelor", re.I)),
+    ("master", re.compile(r"master", re.I)),
+    ("doctorate", re.compile(r"ph\.?\s?d|doctor", re.I)),
+]
+# Matched against the start of job_outlook, first match wins.
+_OUTLOOK_PATTERNS = [
+    ("very_high", re.compile(r"very high", re.I)),
+    ("high", re.compile(r"high|rapid", re.I)),
+    ("growing", re.compile(r"growing|emerging", re.I)),
+    ("steady", re.compile(r"steady", re.I)),
+    ("varies", re.compile(r"varies", re.I)),
+    ("limited", re.compile(r"limited", re.I)),
+]
+
+
+def education_level(text) -> int:
+    """
+    Position in EDUCATION_LEVELS of the lowest degree an education_requirement
+    mentions ("Master's or Ph.D." -> master), or -1 if none is recognised.
+    """
+    levels = [
+        EDUCATION_LEVELS.index(level)
+        for level, pattern in _EDUCATION_PATTERNS
+        if pattern.search(str(text))
+    ]
+    return min(levels) if levels else -1
+
+
+def outlook_level(text) -> int:
+    """Position in OUTLOOK_LEVELS of a job_outlook description, or -1."""
+    for level, pattern in _OUTLOOK_PATTERNS:
+        if pattern.match(str(text).strip()):
+            return OUTLOOK_LEVELS.index(level)
+    return -1
+
+
+def normalize_filters(filters: dict | None) -> tuple:
+    """
+    Hashable, validated form of a filters dict: sorted (field, value) pairs with
+    None values dropped. Raises ValueError for unknown fields or levels.
+    """
+    if not filters:
+        return ()
+    items = []
+    for field, value in filters.items():
+        if value is None:
+            continue
+        if field not in FILTER_FIELDS:
+            raise ValueError(
+                f"Unknown filter {field!r}; expected one of {list(FILTER_FIELDS)}"
+            )
+        if field.endswith("_salary"):
+            value = float(value)
+        elif field.endswith("_education") and value not in EDUCATION_LEVELS:
+            raise ValueError(f"{field} must be one of {list(EDUCATION_LEVELS)}")
+        elif field == "min_outlook" and value not in OUTLOOK_LEVELS:
+            raise ValueError(f"min_outlook must be one of {list(OUTLOOK_LEVELS)}")
+        items.append((field, value))
+    return tuple(sorted(items))
+
+
+class CareerAttributes:
+    """
+    Columnar copies of the filterable career fields (salary, education ordinal,
+    outlook ordinal), parsed once so a filter is a few vectorized comparisons
+    over the whole catalog. Careers whose education or outlook text is not
+    recognised never match a filter on that field.
+    """
+
+    def __init__(self, salary: np.ndarray, education: np.ndarray, outlook: np.ndarray):
+        self.salary = salary
+        self.education = education
+        self.outlook = outlook
+
+    @classmethod
+    def parse(cls, salaries, education_texts, outlook_texts):
+        """Builds the columns from per-career salaries and free-text fields."""
+        salary = np.array(salaries, dtype=np.float32)
+        education = np.array(
+            [education_level(text) for text in education_texts], dtype=np.int8
+        )
+        outlook = np.array(
+            [outlook_level(text) for text in outlook_texts], dtype=np.int8
+        )
+        return cls(np.nan_to_num(salary), education, outlook)
+
+    def __len__(self):
+        return len(self.salary)
+
+    def mask(self, filters: tuple) -> np.ndarray | None:
+        """
+        Boolean mask of the careers matching normalized filters, or None when
+        there is nothing to filter on.
+        """
+        if not filters:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        for field, value in filters:
+            if field == "min_salary":
+                mask &= self.salary >= value
+            elif field == "max_salary":
+                mask &= self.salary <= value
+            elif field == "min_education":
+                mask &= self.education >= EDUCATION_LEVELS.index(value)
+            elif field == "max_education":
+                mask &= (self.education >= 0) & (
+                    self.education <= EDUCATION_LEVELS.index(value)
+                )
+            elif field == "min_outlook":
+                mask &= self.outlook >= OUTLOOK_LEVELS.index(value)
+        return mask
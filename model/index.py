@@ -0,0 +1,318 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from model.quantization import quantize
+from model.scoring import normalize_rows, score, top_k
+
+# A filtered exact search scores only the matching rows when they are at most
+# this fraction of the catalog; above it, scoring everything and keeping the
+# matching columns is cheaper than gathering the rows first.
+SUBSET_SCORING_MAX_FRACTION = 0.2
+
+
+class CareerIndex:
+    """
+    Nearest-neighbour index over career embeddings, scored by cosine similarity.
+    The embeddings are L2-normalized once, at construction, so search is a plain
+    dot product, and held in the requested storage dtype (float32, float16 or
+    int8, see model.quantization). search() takes a 2-D array of query vectors and returns
+    (scores, indices), each of shape (n_queries, k); slots with no candidate
+    hold index -1. An optional boolean mask restricts the search to the careers
+    where it is True.
+    """
+
+    kind = None
+
+    def __init__(self, embeddings: np.ndarray, storage: str = "float32"):
+        self.storage = storage
+        self.vectors = quantize(normalize_rows(embeddings), storage)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def search(self, queries: np.ndarray, k: int, mask: np.ndarray | None = None):
+        raise NotImplementedError
+
+    def _search_rows(self, queries: np.ndarray, rows: np.ndarray, k: int):
+        """Exact search over just the given rows (queries already normalized)."""
+        top_scores, found = top_k(score(queries, self.vectors[rows]), k)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        scores[:, : found.shape[1]] = top_scores
+        indices[:, : found.shape[1]] = rows[found]
+        return scores, indices
+
+    def params(self) -> dict:
+        return {"storage": self.storage}
+
+    def save(self, path: str, catalog_version: str):
+        """Exact search has no state beyond the embeddings themselves."""
+
+    @classmethod
+    def load(cls, path: str, embeddings: np.ndarray, catalog_version: str, **params):
+        return None
+
+
+class ExactIndex(CareerIndex):
+    """Brute-force search: every career is scored for every query."""
+
+    kind = "exact"
+
+    def search(self, queries: np.ndarray, k: int, mask: np.ndarray | None = None):
+        return self._search_normalized(normalize_rows(queries), k, mask)
+
+    def _search_normalized(self, queries: np.ndarray, k: int, mask=None):
+        if mask is None:
+            return top_k(score(queries, self.vectors), k)
+
+        rows = np.flatnonzero(mask)
+        if len(rows) <= SUBSET_SCORING_MAX_FRACTION * len(self.vectors):
+            return self._search_rows(queries, rows, k)
+        # Selecting score columns is d times cheaper than selecting embedding
+        # rows, and unlike -inf masking keeps argpartition away from ties.
+        top_scores, found = top_k(score(queries, self.vectors)[:, rows], k)
+        return top_scores, rows[found]
+
+
+class IVFIndex(CareerIndex):
+    """
+    Inverted-file index: careers are clustered around n_lists spherical k-means
+    centroids and a query only scores the careers in its n_probe closest lists.
+    Raising n_probe trades latency for recall; n_probe == n_lists is exact.
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        n_lists: int | None = None,
+        n_probe: int = 8,
+        train_iterations: int = 10,
+        seed: int = 0,
+        centroids: np.ndarray | None = None,
+        storage: str = "float32",
+    ):
+        super().__init__(embeddings, storage)
+        if n_lists is None:
+            n_lists = int(np.sqrt(len(self.vectors)))
+        self.n_lists = max(1, min(n_lists, len(self.vectors)))
+        self.n_probe = n_probe
+        self.train_iterations = train_iterations
+        self.seed = seed
+
+        if centroids is None:
+            # An empty catalog has nothing to cluster: no lists, no training.
+            centroids = (
+                self._train()
+                if len(self.vectors)
+                else np.empty((0, self.vectors.shape[1]), dtype=np.float32)
+            )
+        self.centroids = centroids
+        self.n_lists = len(centroids)
+        self._build_lists()
+
+    def _train(self) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(len(self.vectors), 64 * self.n_lists)
+        sample = self.vectors[rng.choice(len(self.vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(len(sample), self.n_lists, replace=False)]
+        for _ in range(self.train_iterations):
+            assignments = self._assign(sample, centroids)
+            counts = np.bincount(assignments, minlength=len(centroids))
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            order = np.argsort(assignments, kind="stable")
+            sums = np.empty_like(centroids)
+            empty = counts == 0
+            sums[~empty] = np.add.reduceat(sample[order], starts[~empty])
+            # Re-seed empty clusters with random points so every list stays in use.
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = normalize_rows(sums)
+        return centroids
+
+    @staticmethod
+    def _assign(vectors, centroids, chunk_size=8192):
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            block = vectors[start : start + chunk_size] @ centroids.T
+            assignments[start : start + chunk_size] = block.argmax(axis=1)
+        return assignments
+
+    def _build_lists(self):
+        assignments = self._assign(self.vectors, self.centroids)
+        self.list_ids = np.argsort(assignments, kind="stable").astype(np.int32)
+        self.list_offsets = np.searchsorted(
+            assignments[self.list_ids], np.arange(self.n_lists + 1)
+        )
+
+    def params(self) -> dict:
+        return {**super().params(), "n_lists": self.n_lists, "n_probe": self.n_probe}
+
+    def search(self, queries: np.ndarray, k: int, mask: np.ndarray | None = None):
+        queries = normalize_rows(queries)
+        if not self.n_lists:
+            return self._search_rows(queries, np.empty(0, dtype=np.int64), k)
+        n_probe = max(1, min(self.n_probe, self.n_lists))
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            # A selective filter leaves fewer careers than the probed lists
+            # would hold: scoring those exactly is both cheaper and exact.
+            if len(rows) <= n_probe * len(self.vectors) / self.n_lists:
+                return self._search_rows(queries, rows, k)
+
+        _, probes = top_k(queries @ self.centroids.T, n_probe)
+
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        for row, (query, lists) in enumerate(zip(queries, probes)):
+            candidates = np.concatenate(
+                [
+                    self.list_ids[self.list_offsets[i] : self.list_offsets[i + 1]]
+                    for i in lists
+                ]
+            )
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+            best_scores, best = top_k(self.vectors[candidates] @ query, k)
+            scores[row, : best.shape[1]] = best_scores[0]
+            indices[row, : best.shape[1]] = candidates[best[0]]
+        return scores, indices
+
+    def save(self, path: str, catalog_version: str):
+        np.savez(
+            path,
+            centroids=self.centroids,
+            catalog_version=np.array(catalog_version),
+            n_lists=np.array(self.n_lists),
+        )
+
+    @classmethod
+    def load(cls, path: str, embeddings: np.ndarray, catalog_version: str, **params):
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as saved:
+                if str(saved["catalog_version"]) != catalog_version:
+                    return None
+                if params.get("n_lists") and int(saved["n_lists"]) != params["n_lists"]:
+                    return None
+                centroids = saved["centroids"]
+        except Exception as e:
+            print("Failed to load saved IVF index - rebuilding:", e)
+            return None
+        params = {key: value for key, value in params.items() if key != "n_lists"}
+        return cls(embeddings, centroids=centroids, **params)
+
+
+INDEX_TYPES = {cls.kind: cls for cls in (ExactIndex, IVFIndex)}
+
+
+def index_path(cache_dir: str, kind: str, name: str = "career") -> str:
+    return os.path.join(cache_dir, f"{name}_index_{kind}.npz")
+
+
+def load_or_build_index(
+    kind: str,
+    embeddings: np.ndarray,
+    cache_dir: str,
+    catalog_version: str,
+    name: str = "career",
+    **params,
+) -> CareerIndex:
+    """
+    Returns an index of the given kind over embeddings, reusing the copy saved
+    next to the embeddings cache when it was built for the same catalog version.
+    """
+    if kind not in INDEX_TYPES:
+        raise ValueError(
+            f"Unknown index type {kind!r}; expected one of {list(INDEX_TYPES)}"
+        )
+    cls = INDEX_TYPES[kind]
+    path = index_path(cache_dir, kind, name)
+    index = cls.load(path, embeddings, catalog_version, **params)
+    if index is None:
+        print(f"Building {kind} {name} index over {len(embeddings)} rows...")
+        index = cls(embeddings, **params)
+        index.save(path, catalog_version)
+    return index
+
+
+def recall_at_k(index: CareerIndex, exact: CareerIndex, queries: np.ndarray, k: int):
+    """Fraction of the exact top-k neighbours that the index also returns."""
+    _, found = index.search(queries, k)
+    _, expected = exact.search(queries, k)
+    hits = sum(
+        len(np.intersect1d(got[got >= 0], want)) for got, want in zip(found, expected)
+    )
+    return hits / expected.size
+
+
+def recall_report(
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    ks=(1, 5, 10),
+    n_lists: int | None = None,
+    n_probes=(1, 2, 4, 8, 16, 32),
+) -> dict:
+    """
+    Recall@k and mean per-query latency of an IVF index at several n_probe
+    settings, against exact search over the same embeddings.
+    """
+
+    def timed(index, k):
+        started = time.perf_counter()
+        index.search(queries, k)
+        return (time.perf_counter() - started) * 1000 / len(queries)
+
+    exact = ExactIndex(embeddings)
+    ivf = IVFIndex(embeddings, n_lists=n_lists)
+    report = {
+        "catalog_size": len(embeddings),
+        "queries": len(queries),
+        "n_lists": ivf.n_lists,
+        "exact_ms_per_query": timed(exact, max(ks)),
+        "ivf": [],
+    }
+    for n_probe in n_probes:
+        if n_probe > ivf.n_lists:
+            break
+        ivf.n_probe = n_probe
+        report["ivf"].append(
+            {
+                "n_probe": n_probe,
+                "ms_per_query": timed(ivf, max(ks)),
+                **{f"recall@{k}": recall_at_k(ivf, exact, queries, k) for k in ks},
+            }
+        )
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Recall@k of the IVF career index versus exact search."
+    )
+    parser.add_argument(
+        "--embeddings", default=os.path.join("cache", "career_embeddings.npy")
+    )
+    parser.add_argument("--n-lists", type=int, default=None)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    career_embeddings = np.load(args.embeddings)
+    rng = np.random.default_rng(args.seed)
+    # Perturbed catalog rows stand in for quiz answers near real careers.
+    picks = rng.choice(len(career_embeddings), args.queries)
+    noise = rng.normal(scale=0.05, size=(args.queries, career_embeddings.shape[1]))
+    sample_queries = career_embeddings[picks] + noise.astype(np.float32)
+    print(
+        json.dumps(
+            recall_report(career_embeddings, sample_queries, n_lists=args.n_lists),
+            indent=2,
+        )
+    )
@@ -0,0 +1,72 @@
+import numpy as np
+
+STORAGE_DTYPES = ("float32", "float16", "int8")
+
+# Rows converted back to float32 at a time while scoring a quantized matrix.
+DEQUANT_CHUNK = 4096
+
+
+class QuantizedMatrix:
+    """
+    Compact copy of an L2-normalized embedding matrix.
+
+    float16 halves the memory of float32; int8 quarters it using one scale per
+    dimension (x[:, d] ~= codes[:, d] * scale[d]). Scoring folds the scale into
+    the query and converts the codes back to float32 DEQUANT_CHUNK rows at a
+    time, so BLAS still does the work without a full float32 copy in memory.
+    Indexing (matrix[rows]) returns dequantized float32 rows.
+    """
+
+    def __init__(self, vectors: np.ndarray, dtype: str):
+        if dtype not in ("float16", "int8"):
+            raise ValueError(f"Unsupported quantized dtype {dtype!r}")
+        self.dtype = dtype
+        self.shape = vectors.shape
+        if dtype == "float16":
+            self.codes = np.ascontiguousarray(vectors, dtype=np.float16)
+            self.scale = None
+        else:
+            max_abs = (
+                np.abs(vectors).max(axis=0)
+                if len(vectors)
+                else np.zeros(vectors.shape[1:], dtype=np.float32)
+            )
+            # An empty matrix keeps a scale of 1, so it still scores to nothing.
+            scale = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+            self.codes = np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+            self.scale = scale
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (self.scale.nbytes if self.scale is not None else 0)
+
+    def __getitem__(self, rows) -> np.ndarray:
+        block = self.codes[rows].astype(np.float32)
+        if self.scale is not None:
+            block *= self.scale
+        return block
+
+    def score_into(self, queries: np.ndarray, out: np.ndarray):
+        if self.scale is not None:
+            queries = queries * self.scale
+        for start in range(0, len(self), DEQUANT_CHUNK):
+            block = self.codes[start : start + DEQUANT_CHUNK].astype(np.float32)
+            out[:, start : start + len(block)] = queries @ block.T
+        return out
+
+
+def quantize(vectors: np.ndarray, dtype: str = "float32"):
+    """
+    Storage for a normalized float32 matrix in the given dtype: the matrix itself
+    for float32, otherwise a QuantizedMatrix.
+    """
+    if dtype not in STORAGE_DTYPES:
+        raise ValueError(
+            f"Unknown embedding dtype {dtype!r}; expected one of {STORAGE_DTYPES}"
+        )
+    if dtype == "float32":
+        return vectors
+    return QuantizedMatrix(vectors, dtype)
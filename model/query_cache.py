@@ -0,0 +1,97 @@
+import re
+import threading
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_quiz_text(text: str) -> str:
+    """
+    Case- and whitespace-insensitive form of a quiz submission, so answers that
+    only differ in spacing or capitalisation share a cache entry.
+    """
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+class QueryCacheEntry:
+    __slots__ = ("embedding", "ranked_indices", "ranked_scores", "nbytes")
+
+    def __init__(self, embedding, ranked_indices, ranked_scores, key_size):
+        self.embedding = embedding
+        self.ranked_indices = ranked_indices
+        self.ranked_scores = ranked_scores
+        self.nbytes = (
+            embedding.nbytes + ranked_indices.nbytes + ranked_scores.nbytes + key_size
+        )
+
+
+class QueryCache:
+    """
+    LRU cache of quiz-text embeddings and their ranked career indices, bounded
+    both by entry count and by the approximate bytes held.
+    Keys are tuples holding the model name, catalog version and normalized text
+    (plus, for recommendations, the filters), so entries built against an older
+    set of career embeddings can never be served.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, embedding, ranked_indices, ranked_scores):
+        entry = QueryCacheEntry(
+            embedding,
+            ranked_indices,
+            ranked_scores,
+            sum(len(part) for part in key if isinstance(part, str)) + 64,
+        )
+        if entry.nbytes > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,90 +1,239 @@
 import os
 
-import joblib
 import numpy as np
-import pandas as pd
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from model.catalog import CareerCatalog
+from model.encoder import LocalEncoder
+from model.fields import FieldIndex, load_field_embeddings, normalize_field_weights
+from model.filters import normalize_filters
+from model.query_cache import QueryCache, normalize_quiz_text
+from model.search import SemanticIndex
+
+
+class _RankedResult:
+    __slots__ = ("ranked_indices", "ranked_scores")
+
+    def __init__(self, ranked_indices, ranked_scores):
+        self.ranked_indices = ranked_indices
+        self.ranked_scores = ranked_scores
+
+
+class _CatalogState:
+    """
+    A catalog together with the indexes built from it. Replaced as a whole, so
+    a request that took a reference keeps a consistent set while a re-index
+    swaps in the next one.
+    """
+
+    __slots__ = ("catalog", "career_index", "field_index")
+
+    def __init__(
+        self,
+        catalog: CareerCatalog,
+        career_index: SemanticIndex,
+        field_index: FieldIndex | None = None,
+    ):
+        self.catalog = catalog
+        self.career_index = career_index
+        self.field_index = field_index
 
 
 class SemanticRecommender:
     """
-    Loads dataset, builds embeddings for career items, and exposes a recommend() method.
-    Can be saved and loaded using joblib for persistence.
+    Builds embeddings for a CareerCatalog and exposes a recommend() method.
+    Embeddings are cached on disk per career text, so restarts (and reload()
+    with an edited catalog) only encode careers that were added or edited.
+    With field_scoring, description, skills and personality_match are also
+    embedded separately so requests can weigh them (see model.fields).
     """
 
-    def __init__(self, df: pd.DataFrame, model_name="all-MiniLM-L6-v2"):
-        self.df = df
+    def __init__(
+        self,
+        catalog: CareerCatalog,
+        model_name="all-MiniLM-L6-v2",
+        query_cache: QueryCache | None = None,
+        index_type: str = "exact",
+        index_params: dict | None = None,
+        cache_dir: str = "cache",
+        embedding_dtype: str = "float32",
+        encoder=None,
+        field_scoring: bool = True,
+    ):
         self.model_name = model_name
-        self.cache_dir = "cache"
+        self.field_scoring = field_scoring
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.embedding_dtype = embedding_dtype
+        self.query_cache = query_cache if query_cache is not None else QueryCache()
+        self.cache_dir = cache_dir
         os.makedirs(self.cache_dir, exist_ok=True)
 
-        self.df["combined_text"] = self.df.apply(
-            lambda row: " ".join(
-                [
-                    str(row.get("description", "")),
-                    str(row.get("skills", "")),
-                    str(row.get("personality_match", "")),
-                ]
-            ),
-            axis=1,
-        )
+        # Any object with encode(texts); see model.encoder for the in-process
+        # and process-pool implementations.
+        self.encoder = encoder if encoder is not None else LocalEncoder(model_name)
 
-        print("Loading sentence-transformers model:", self.model_name)
-        self.model = SentenceTransformer(self.model_name)
-
-        self.embeddings_path = os.path.join(self.cache_dir, "career_embeddings.npy")
-        self.titles_path = os.path.join(self.cache_dir, "career_titles.pkl")
-
-        if os.path.exists(self.embeddings_path) and os.path.exists(self.titles_path):
-            try:
-                self.career_embeddings = np.load(self.embeddings_path)
-                self.career_titles = joblib.load(self.titles_path)
-                if len(self.career_embeddings) != len(self.df):
-                    raise ValueError("Cached embeddings length mismatch; recomputing.")
-                print("Loaded cached career embeddings.")
-            except Exception as e:
-                print("Failed to load cache - recomputing embeddings:", e)
-                self._compute_and_cache_embeddings()
-        else:
-            self._compute_and_cache_embeddings()
-
-    def _compute_and_cache_embeddings(self):
-        texts = self.df["combined_text"].tolist()
-        print(f"Computing embeddings for {len(texts)} careers...")
-        self.career_embeddings = self.model.encode(
-            texts, show_progress_bar=True, convert_to_numpy=True
+        self._state = None
+        self.reload(catalog)
+
+    def reload(self, catalog: CareerCatalog):
+        """
+        Loads embeddings for catalog from the content-hash cache, encoding only
+        the careers whose text is new or changed, builds its index and then
+        swaps it in with a single assignment: requests already running finish
+        against the previous catalog and nothing waits for the build. Query
+        cache keys include the catalog version, so cached rankings of the
+        previous catalog are never served.
+        """
+        career_index = SemanticIndex(
+            "career",
+            catalog.texts(),
+            self.encoder,
+            self.model_name,
+            cache_dir=self.cache_dir,
+            index_type=self.index_type,
+            index_params=self.index_params,
+            embedding_dtype=self.embedding_dtype,
         )
-        np.save(self.embeddings_path, self.career_embeddings)
-        joblib.dump(self.df["career_title"].tolist(), self.titles_path)
-        print("Saved career embeddings to cache.")
-
-    def recommend(self, quiz_answers_text: str, top_n: int = 5):
-        user_emb = self.model.encode([quiz_answers_text], convert_to_numpy=True)
-        sims = cosine_similarity(user_emb, self.career_embeddings)[0]
-        top_idx = sims.argsort()[-top_n:][::-1]
-
-        recommendations = []
-        for idx in top_idx:
-            row = self.df.iloc[idx]
-            item = {
-                "career_title": row["career_title"],
-                "description": row.get("description", ""),
-                "skills": row.get("skills", ""),
-                "personality_match": row.get("personality_match", ""),
-                "education_required": row.get("education_required", ""),
-                "average_salary_usd": float(row.get("average_salary_usd", 0) or 0),
-                "job_outlook": row.get("job_outlook", ""),
-                "learning_resources": row.get("learning_resources", ""),
-                "similarity_score": float(sims[idx]),
-            }
-            recommendations.append(item)
-        return recommendations
-
-
-data = pd.read_csv(r"C:\Users\ayemi\Documents\CareerHub\data\careers.csv")
-recommender = SemanticRecommender(data)
-
-
-def get_recommendations(quiz_answers_text: str, top_n: int = 5):
-    return recommender.recommend(quiz_answers_text, top_n)
+        field_index = None
+        if self.field_scoring:
+            field_index = FieldIndex(
+                load_field_embeddings(
+                    catalog, self.encoder, self.model_name, self.cache_dir
+                ),
+                storage=self.embedding_dtype,
+            )
+        self._state = _CatalogState(catalog, career_index, field_index)
+        self.query_cache.clear()
+        return career_index.cache.last_stats
+
+    @property
+    def catalog(self) -> CareerCatalog:
+        return self._state.catalog
+
+    @property
+    def career_index(self) -> SemanticIndex:
+        return self._state.career_index
+
+    @property
+    def catalog_version(self) -> str:
+        return self._state.career_index.version
+
+    @property
+    def index(self):
+        return self._state.career_index.index
+
+    @property
+    def career_embeddings(self):
+        # The index holds the (possibly quantized) copy used for scoring; keeping
+        # only that one is what makes float16/int8 storage save memory.
+        return self._state.career_index.index.vectors
+
+    def recommend(
+        self,
+        quiz_answers_text: str,
+        top_n: int = 5,
+        filters: dict | None = None,
+        field_weights: dict | None = None,
+    ):
+        """
+        Top careers for one quiz answer. filters restricts the candidates before
+        scoring, e.g. {"min_salary": 90000, "max_education": "master"}; see
+        model.filters for the supported fields. field_weights scores the
+        answer against each field separately instead of the combined text,
+        e.g. {"personality_match": 0.6, "skills": 0.3, "description": 0.1}.
+        """
+        return self.recommend_batch(
+            [quiz_answers_text], top_n, [filters], [field_weights]
+        )[0]
+
+    def recommend_batch(
+        self,
+        quiz_answers_texts: list[str],
+        top_n: int = 5,
+        filters: list[dict | None] | None = None,
+        field_weights: list[dict | None] | None = None,
+    ):
+        """
+        Ranks careers for several quiz answers at once: one encode() call for all
+        texts not already in the query cache and one index search per distinct
+        (filters, field weights) pair among the queries whose cached ranking is
+        missing or too short. filters and field_weights, if given, hold one
+        dict (or None) per text.
+        Returns one list of recommendations per input text, in input order.
+        """
+        # One snapshot for the whole batch, so a concurrent reload() cannot
+        # pair rankings from one catalog with rows from another.
+        state = self._state
+        catalog, index = state.catalog, state.career_index.index
+        if not len(catalog):
+            # Nothing to rank: skip encoding the queries.
+            return [[] for _ in quiz_answers_texts]
+        if filters is None:
+            filters = [None] * len(quiz_answers_texts)
+        if field_weights is None:
+            field_weights = [None] * len(quiz_answers_texts)
+        keys = [
+            (
+                self.model_name,
+                state.career_index.version,
+                normalize_quiz_text(text),
+                normalize_filters(text_filters),
+                normalize_field_weights(weights),
+            )
+            for text, text_filters, weights in zip(
+                quiz_answers_texts, filters, field_weights
+            )
+        ]
+        if state.field_index is None and any(key[4] for key in keys):
+            raise ValueError("Field-weighted scoring is disabled")
+        entries = {}
+        texts = {}
+        for key, text in zip(keys, quiz_answers_texts):
+            if key not in entries:
+                entries[key] = self.query_cache.get(key)
+                texts[key] = text
+
+        to_encode = [key for key, entry in entries.items() if entry is None]
+        embeddings = {}
+        if to_encode:
+            # The same answers under different filters are only encoded once.
+            unique = {key[2]: texts[key] for key in to_encode}
+            encoded = dict(zip(unique, self.encoder.encode(list(unique.values()))))
+            embeddings.update((key, encoded[key[2]]) for key in to_encode)
+        for key, entry in entries.items():
+            if entry is not None and len(entry.ranked_indices) < top_n:
+                embeddings[key] = entry.embedding
+
+        groups = {}
+        for key in embeddings:
+            groups.setdefault(key[3:], []).append(key)
+        for (key_filters, weights), to_score in groups.items():
+            # Filters become a mask over precomputed columns, so the index only
+            # scores careers that can be returned and top_n stays exact.
+            vectors = np.stack([embeddings[key] for key in to_score])
+            mask = catalog.attributes.mask(key_filters)
+            if weights:
+                scores, indices = state.field_index.search(
+                    vectors, top_n, mask, weights=weights
+                )
+            else:
+                scores, indices = index.search(vectors, top_n, mask=mask)
+            for key, row_scores, row_indices in zip(to_score, scores, indices):
+                found = row_indices >= 0
+                top_idx = row_indices[found]
+                top_scores = row_scores[found].astype(np.float32)
+                self.query_cache.put(key, embeddings[key], top_idx, top_scores)
+                entries[key] = _RankedResult(top_idx, top_scores)
+
+        results = []
+        for key in keys:
+            entry = entries[key]
+            results.append(
+                [
+                    catalog.result(idx, score)
+                    for idx, score in zip(
+                        entry.ranked_indices[:top_n], entry.ranked_scores[:top_n]
+                    )
+                ]
+            )
+        return results
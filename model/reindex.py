@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ReindexJob:
+    __slots__ = (
+        "id",
+        "action",
+        "status",
+        "submitted_at",
+        "started_at",
+        "finished_at",
+        "stats",
+        "error",
+    )
+
+    def __init__(self, job_id: int, action: str):
+        self.id = job_id
+        self.action = action
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.stats = None
+        self.error = None
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ReindexWorker:
+    """
+    Runs re-index jobs (of the career catalog, or of one search table) in one
+    background thread. rebuild() re-reads the whole source, so jobs queued
+    while a rebuild is running are coalesced into the next one; each job
+    reports the stats of the rebuild that covered it. The last `history` jobs
+    stay queryable by id.
+    """
+
+    def __init__(self, rebuild, history: int = 100, name: str = "catalog-reindex"):
+        self._rebuild = rebuild
+        self.history = history
+        self.name = name
+        self._jobs = OrderedDict()
+        self._pending = []
+        self._next_id = 1
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, action: str) -> ReindexJob:
+        with self._cond:
+            job = ReindexJob(self._next_id, action)
+            self._next_id += 1
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+            self._pending.append(job)
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: int) -> ReindexJob | None:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def recent(self, limit: int = 20) -> list[ReindexJob]:
+        with self._cond:
+            return list(self._jobs.values())[-limit:][::-1]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                started = time.time()
+                for job in batch:
+                    job.status = "running"
+                    job.started_at = started
+
+            try:
+                stats, status, error = self._rebuild(), "done", None
+            except Exception as e:
+                print(f"Re-index failed ({self.name}):", e)
+                stats, status, error = None, "failed", repr(e)
+
+            with self._cond:
+                finished = time.time()
+                for job in batch:
+                    job.status = status
+                    job.stats = stats
+                    job.error = error
+                    job.finished_at = finished
+
+    def close(self):
+        """Finishes queued jobs, then stops the thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
@@ -0,0 +1,83 @@
+import threading
+
+import numpy as np
+
+from model.quantization import QuantizedMatrix
+
+# Columns handled per argpartition call in top_k(); bounds its scratch memory.
+TOP_K_CHUNK = 16384
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    Returns vectors as a C-contiguous float32 matrix with unit-length rows.
+    Input that already has that layout and norm is returned without a copy.
+    """
+    vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1)
+    if np.allclose(norms, 1.0, atol=1e-4):
+        return vectors
+    norms[norms == 0] = 1.0
+    return vectors / norms[:, None]
+
+
+class _Workspace(threading.local):
+    def __init__(self):
+        self.buffer = np.empty(0, dtype=np.float32)
+
+    def take(self, rows: int, cols: int) -> np.ndarray:
+        if self.buffer.size < rows * cols:
+            self.buffer = np.empty(rows * cols, dtype=np.float32)
+        return self.buffer[: rows * cols].reshape(rows, cols)
+
+
+_workspace = _Workspace()
+
+
+def score(queries: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Dot products of every (normalized) query against every row of matrix in one
+    BLAS call (chunked for a QuantizedMatrix). The result lives in a per-thread
+    buffer that is reused by the next call, so callers must copy out anything
+    they keep.
+    """
+    out = _workspace.take(len(queries), len(matrix))
+    if isinstance(matrix, QuantizedMatrix):
+        return matrix.score_into(queries, out)
+    np.matmul(queries, matrix.T, out=out)
+    return out
+
+
+def top_k(scores: np.ndarray, k: int):
+    """
+    (top_scores, top_indices) of the k largest entries of each row of scores,
+    best first. Uses argpartition over column chunks so the scratch memory is
+    bounded by TOP_K_CHUNK rather than by the number of columns.
+    """
+    scores = np.atleast_2d(scores)
+    n_cols = scores.shape[1]
+    k = min(k, n_cols)
+    if k <= 0:
+        empty = np.empty((len(scores), 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+
+    candidates = []
+    for start in range(0, n_cols, TOP_K_CHUNK):
+        block = scores[:, start : start + TOP_K_CHUNK]
+        kk = min(k, block.shape[1])
+        part = np.argpartition(block, block.shape[1] - kk, axis=1)[:, -kk:]
+        candidates.append(part + start)
+    candidates = np.concatenate(candidates, axis=1)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+
+    if candidates.shape[1] > k:
+        best = np.argpartition(candidate_scores, candidates.shape[1] - k, axis=1)
+        best = best[:, -k:]
+        candidates = np.take_along_axis(candidates, best, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, best, axis=1)
+
+    order = np.argsort(-candidate_scores, axis=1)
+    return (
+        np.take_along_axis(candidate_scores, order, axis=1),
+        np.take_along_axis(candidates, order, axis=1),
+    )
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import threading
+
+import numpy as np
+
+from model.embedding_cache import EmbeddingCache, text_hash
+from model.encoder import encoder_version
+from model.index import load_or_build_index
+from model.query_cache import QueryCache, normalize_quiz_text
+from model.scoring import normalize_rows
+
+
+class SemanticIndex:
+    """
+    Embeddings of one table's texts, cached on disk by content hash under
+    <name>_embeddings.npy, plus a search index over them. `version`
+    fingerprints the model and every row's text, so it changes whenever the
+    embeddings do.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        texts: list[str],
+        encoder,
+        model_name: str,
+        cache_dir: str = "cache",
+        index_type: str = "exact",
+        index_params: dict | None = None,
+        embedding_dtype: str = "float32",
+    ):
+        self.name = name
+        self.cache = EmbeddingCache(
+            cache_dir,
+            f"{name}_embeddings",
+            model_name=model_name,
+            model_version=encoder_version(encoder),
+        )
+        embeddings = self.cache.load_or_encode(
+            texts, lambda missing: encoder.encode(missing, show_progress_bar=True)
+        )
+        print(f"{name} embeddings ready:", self.cache.last_stats)
+
+        # Normalized once here so every search is a single float32 dot product.
+        embeddings = normalize_rows(embeddings)
+        digest = hashlib.sha1(f"{model_name}\x1f{self.cache.model_version}".encode())
+        for text in texts:
+            digest.update(text_hash(text).encode())
+        self.version = digest.hexdigest()
+        self.index = load_or_build_index(
+            index_type,
+            embeddings,
+            cache_dir,
+            self.version,
+            name=name,
+            storage=embedding_dtype,
+            **(index_params or {}),
+        )
+
+    def __len__(self):
+        return len(self.index)
+
+    def search(self, query_vectors: np.ndarray, k: int, mask=None):
+        if not len(self.index):
+            empty = np.empty((len(query_vectors), 0))
+            return empty.astype(np.float32), empty.astype(np.int64)
+        return self.index.search(query_vectors, k, mask)
+
+
+class _Table:
+    __slots__ = ("ids", "index")
+
+    def __init__(self, ids: np.ndarray, index: SemanticIndex):
+        self.ids = ids
+        self.index = index
+
+
+class IndexManager:
+    """
+    Semantic search over several tables (courses, gigs, ...) with one shared
+    encoder. Each table is registered with a load_rows() callable returning
+    (row_id, text) pairs and gets its own SemanticIndex and cache files.
+    refresh() re-reads a table, encodes only new or changed rows and swaps the
+    result in; searches keep using the previous index until then. A table is
+    not searchable until its first refresh() has finished.
+    """
+
+    def __init__(
+        self,
+        encoder,
+        model_name: str,
+        cache_dir: str = "cache",
+        index_type: str = "exact",
+        index_params: dict | None = None,
+        embedding_dtype: str = "float32",
+        query_cache: QueryCache | None = None,
+    ):
+        self.encoder = encoder
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.embedding_dtype = embedding_dtype
+        # Query embeddings only: they do not depend on the table searched.
+        self.query_cache = query_cache if query_cache is not None else QueryCache()
+        self._sources = {}
+        self._tables = {}
+        self._build_lock = threading.Lock()
+
+    def register(self, name: str, load_rows):
+        self._sources[name] = load_rows
+
+    def refresh(self, name: str) -> dict:
+        """
+        (Re)builds the named table's index from its load_rows() source;
+        returns the embedding cache's stats for the build.
+        """
+        with self._build_lock:
+            rows = list(self._sources[name]())
+            ids = np.array([row_id for row_id, _ in rows], dtype=np.int64)
+            index = SemanticIndex(
+                name,
+                [text for _, text in rows],
+                self.encoder,
+                self.model_name,
+                cache_dir=self.cache_dir,
+                index_type=self.index_type,
+                index_params=self.index_params,
+                embedding_dtype=self.embedding_dtype,
+            )
+            self._tables[name] = _Table(ids, index)
+            return index.cache.last_stats
+
+    def is_ready(self, name: str) -> bool:
+        return name in self._tables
+
+    def _cached_vector(self, key):
+        entry = self.query_cache.get(key)
+        return None if entry is None else entry.embedding
+
+    def _remember(self, key, vector):
+        empty = np.empty(0, dtype=np.int64)
+        self.query_cache.put(key, vector, empty, empty.astype(np.float32))
+
+    def _ranked(self, name: str, vector, k: int) -> list[tuple[int, float]]:
+        table = self._tables[name]
+        scores, indices = table.index.search(vector[None, :], k)
+        found = indices[0] >= 0
+        return [
+            (int(row_id), float(score))
+            for row_id, score in zip(table.ids[indices[0][found]], scores[0][found])
+        ]
+
+    def search(self, name: str, text: str, k: int = 10) -> list[tuple[int, float]]:
+        """(row_id, similarity) of the k rows of table `name` closest to text."""
+        key = (self.model_name, normalize_quiz_text(text))
+        vector = self._cached_vector(key)
+        if vector is None:
+            vector = self.encoder.encode([text])[0]
+            self._remember(key, vector)
+        return self._ranked(name, vector, k)
+
+    async def search_async(self, name: str, text: str, k: int = 10):
+        key = (self.model_name, normalize_quiz_text(text))
+        vector = self._cached_vector(key)
+        if vector is None:
+            vector = (await self.encoder.encode_async([text]))[0]
+            self._remember(key, vector)
+        # Scoring scans the whole table; in a thread, the event loop keeps
+        # serving other requests meanwhile.
+        return await asyncio.to_thread(self._ranked, name, vector, k)
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "rows": len(table.ids),
+                "version": table.index.version,
+                "index": table.index.index.params(),
+                "last_build": table.index.cache.last_stats,
+            }
+            for name, table in self._tables.items()
+        }
@@ -0,0 +1,461 @@
+import asyncio
+import os
+import threading
+import time
+
+from model.batching import MicroBatcher
+from model.encoder import create_encoder, embedding_parity
+from model.fields import normalize_field_weights
+from model.query_cache import QueryCache
+from model.reindex import ReindexWorker
+from model.search import IndexManager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARITY_SAMPLE = 256
+
+
+class RecommenderNotReady(RuntimeError):
+    pass
+
+
+class RecommenderService:
+    """
+    Owns the process-wide SemanticRecommender and its MicroBatcher, plus the
+    IndexManager used for course/gig search, all sharing one encoder.
+    Nothing heavy happens at construction: the model and embeddings are loaded
+    by start_warmup() in a background thread, or by the first get() call.
+    The course/gig search indexes are only built once recommendations are
+    being served, each by its own ReindexWorker.
+    """
+
+    def __init__(
+        self,
+        data_path: str,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: str = "cache",
+        index_type: str = "exact",
+        index_params: dict | None = None,
+        cache_max_entries: int = 10000,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+        embedding_dtype: str = "float32",
+        encoder_type: str = "local",
+        encoder_options: dict | None = None,
+        max_queue: int = 0,
+        parity_tolerance: float | None = None,
+        build_workers: int = 0,
+        build_chunk_size: int = 1024,
+        field_scoring: bool = True,
+    ):
+        self.data_path = data_path
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.cache_max_entries = cache_max_entries
+        self.cache_max_bytes = cache_max_bytes
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.embedding_dtype = embedding_dtype
+        self.encoder_type = encoder_type
+        self.encoder_options = encoder_options or {}
+        self.max_queue = max_queue
+        self.parity_tolerance = parity_tolerance
+        self.build_workers = build_workers
+        self.build_chunk_size = build_chunk_size
+        self.field_scoring = field_scoring
+
+        self.encoder = None
+        self.recommender = None
+        self.batcher = None
+        self.index_manager = None
+        self.search_sources = {}
+        self.search_workers = {}
+        self.career_source = None
+        self.reindexer = None
+        self._careers_dirty = False
+        self._reindex_lock = threading.Lock()
+        self.status = "not_started"
+        self.error = None
+        self.load_seconds = None
+        self.parity = None
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_env(cls):
+        index_type = os.getenv("RECOMMEND_INDEX", "exact")
+        encoder_type = os.getenv("RECOMMEND_ENCODER", "local")
+        encoder_threads = os.getenv("RECOMMEND_ENCODER_THREADS")
+        parity_tolerance = os.getenv("RECOMMEND_ENCODER_PARITY_TOLERANCE")
+        return cls(
+            data_path=os.getenv(
+                "CAREERS_CSV_PATH", os.path.join(PROJECT_ROOT, "data", "careers.csv")
+            ),
+            model_name=os.getenv("RECOMMEND_MODEL", "all-MiniLM-L6-v2"),
+            cache_dir=os.getenv(
+                "RECOMMEND_CACHE_DIR", os.path.join(PROJECT_ROOT, "cache")
+            ),
+            index_type=index_type,
+            index_params=(
+                {
+                    "n_lists": int(os.getenv("RECOMMEND_IVF_LISTS", "0")) or None,
+                    "n_probe": int(os.getenv("RECOMMEND_IVF_PROBE", "8")),
+                }
+                if index_type == "ivf"
+                else {}
+            ),
+            cache_max_entries=int(os.getenv("RECOMMEND_CACHE_MAX_ENTRIES", "10000")),
+            cache_max_bytes=int(
+                float(os.getenv("RECOMMEND_CACHE_MAX_MB", "64")) * 1024 * 1024
+            ),
+            max_batch_size=int(os.getenv("RECOMMEND_MAX_BATCH_SIZE", "32")),
+            max_wait_ms=float(os.getenv("RECOMMEND_MAX_WAIT_MS", "5")),
+            embedding_dtype=os.getenv("RECOMMEND_EMBEDDING_DTYPE", "float32"),
+            encoder_type=encoder_type,
+            encoder_options=(
+                {
+                    "workers": int(os.getenv("RECOMMEND_ENCODER_WORKERS", "2")),
+                    "max_pending": int(os.getenv("RECOMMEND_ENCODER_MAX_PENDING", "0"))
+                    or None,
+                    "threads_per_worker": int(encoder_threads or "1"),
+                    "backend": os.getenv("RECOMMEND_ENCODER_BACKEND", "torch"),
+                }
+                if encoder_type == "process"
+                else {
+                    "num_threads": int(encoder_threads or "0"),
+                    "backend": os.getenv("RECOMMEND_ENCODER_BACKEND", "torch"),
+                }
+            ),
+            parity_tolerance=float(parity_tolerance) if parity_tolerance else None,
+            build_workers=int(os.getenv("RECOMMEND_BUILD_WORKERS", "0")),
+            build_chunk_size=int(os.getenv("RECOMMEND_BUILD_CHUNK_SIZE", "1024")),
+            field_scoring=os.getenv("RECOMMEND_FIELD_SCORING", "1") != "0",
+            max_queue=int(os.getenv("RECOMMEND_MAX_QUEUE", "1024")),
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def load(self):
+        """
+        Builds the recommender and batcher if that has not happened yet.
+        Safe to call from several threads; only the first caller does the work.
+        """
+        with self._lock:
+            if self.status == "ready":
+                return self.recommender
+            self.status = "loading"
+            started = time.perf_counter()
+            try:
+                from model.recommender import SemanticRecommender
+
+                if self.encoder is None:
+                    self.encoder = create_encoder(
+                        self.model_name, self.encoder_type, **self.encoder_options
+                    )
+                with self._reindex_lock:
+                    # Careers changed from here on may be missed by this read.
+                    self._careers_dirty = False
+                catalog = self._load_catalog()
+                if self.parity_tolerance is not None:
+                    self.parity = self._check_parity(catalog.texts())
+                if self.build_workers:
+                    self._prebuild_embeddings(catalog)
+                recommender = SemanticRecommender(
+                    catalog,
+                    model_name=self.model_name,
+                    query_cache=QueryCache(
+                        max_entries=self.cache_max_entries,
+                        max_bytes=self.cache_max_bytes,
+                    ),
+                    index_type=self.index_type,
+                    index_params=self.index_params,
+                    cache_dir=self.cache_dir,
+                    embedding_dtype=self.embedding_dtype,
+                    encoder=self.encoder,
+                    field_scoring=self.field_scoring,
+                )
+                # One throwaway query so the first real request does not pay
+                # for lazy kernel/tokenizer initialisation.
+                recommender.recommend("warm up", top_n=1)
+            except Exception as e:
+                self.status = "failed"
+                self.error = repr(e)
+                print("Failed to load recommender:", e)
+                raise
+            finally:
+                self.load_seconds = time.perf_counter() - started
+
+            self.recommender = recommender
+            self.index_manager = self._search_manager()
+            with self._reindex_lock:
+                self.reindexer = ReindexWorker(self._reindex_careers)
+                if self._careers_dirty:
+                    self.reindexer.submit("reload")
+            self.batcher = MicroBatcher(
+                recommender,
+                max_batch_size=self.max_batch_size,
+                max_wait_ms=self.max_wait_ms,
+                workers=self.encoder.max_workers,
+                max_queue=self.max_queue,
+            )
+            self.error = None
+            self.status = "ready"
+            self._loaded.set()
+            print(f"Recommender ready in {self.load_seconds:.2f}s")
+            self._start_search_builds()
+            return recommender
+
+    def _check_parity(self, texts: list[str]) -> dict | None:
+        """
+        Compares the serving encoder against the torch reference on (up to
+        PARITY_SAMPLE of) the career texts; raises if any embedding drifts past parity_tolerance.
+        """
+        if getattr(self.encoder, "backend", "torch") == "torch":
+            return None
+        reference = create_encoder(self.model_name, "local")
+        try:
+            parity = embedding_parity(
+                reference, self.encoder, texts[:PARITY_SAMPLE], self.parity_tolerance
+            )
+        finally:
+            reference.close()
+        print("Encoder parity:", parity)
+        if not parity["ok"]:
+            raise RuntimeError(
+                f"{self.encoder.backend} embeddings drift from torch: "
+                f"min cosine {parity['min_cosine']:.6f} < {1 - self.parity_tolerance:.6f}"
+            )
+        return parity
+
+    def _prebuild_embeddings(self, catalog):
+        """
+        Encodes careers missing from the embedding caches (the combined text
+        and, with field scoring, each field) with the parallel bulk builder,
+        so the recommender below finds them all cached.
+        """
+        from model.build_embeddings import build_cache, career_caches
+
+        for name, texts in career_caches(catalog, self.field_scoring):
+            stats = build_cache(
+                name,
+                texts,
+                self.model_name,
+                cache_dir=self.cache_dir,
+                workers=self.build_workers,
+                chunk_size=self.build_chunk_size,
+                backend=self.encoder_options.get("backend", "torch"),
+                threads_per_worker=self.encoder_options.get("threads_per_worker")
+                or self.encoder_options.get("num_threads")
+                or 1,
+                fallback=self.encoder,
+            )
+            print(f"{name} pre-built:", stats)
+
+    def register_career_source(self, load_records):
+        """
+        Makes load_records() (dicts keyed like data/careers.csv columns) the
+        source of the career catalog instead of the CSV at data_path.
+        """
+        self.career_source = load_records
+
+    def _load_catalog(self):
+        from model.catalog import CareerCatalog
+
+        if self.career_source is not None:
+            return CareerCatalog.from_records(self.career_source())
+        return CareerCatalog.from_csv(self.data_path)
+
+    def reindex_careers(self, action: str):
+        """
+        Queues a background rebuild of the career index after careers were
+        created, updated or deleted; the rebuild re-reads the whole table.
+        Returns the job, or None while the service is loading: the change is
+        then picked up by one rebuild queued as soon as loading finishes.
+        """
+        with self._reindex_lock:
+            if self.reindexer is None:
+                self._careers_dirty = True
+                return None
+            return self.reindexer.submit(action)
+
+    def _reindex_careers(self) -> dict:
+        return self.recommender.reload(self._load_catalog())
+
+    def register_search_source(self, name: str, load_rows):
+        """
+        Makes table `name` searchable: load_rows() returns (row_id, text) pairs
+        and is called by every build of its index.
+        """
+        self.search_sources[name] = load_rows
+
+    def _search_manager(self) -> IndexManager:
+        manager = IndexManager(
+            self.encoder,
+            self.model_name,
+            cache_dir=self.cache_dir,
+            index_type=self.index_type,
+            index_params=self.index_params,
+            embedding_dtype=self.embedding_dtype,
+            query_cache=QueryCache(
+                max_entries=self.cache_max_entries, max_bytes=self.cache_max_bytes
+            ),
+        )
+        for name, load_rows in self.search_sources.items():
+            manager.register(name, load_rows)
+        return manager
+
+    def _start_search_builds(self):
+        """
+        Builds each search index in its own background thread, after the
+        recommender is ready: on a cold cache a large table takes long to
+        encode, and neither /ready nor the other tables wait for it. A table's
+        /search endpoint answers 503 until its first build is done, and keeps
+        doing so if that build fails, until a refresh succeeds.
+        """
+        for name in self.search_sources:
+            worker = ReindexWorker(
+                lambda name=name: self.index_manager.refresh(name),
+                name=f"{name}-search-index",
+            )
+            self.search_workers[name] = worker
+            worker.submit("build")
+
+    def start_warmup(self):
+        """Starts load() in a daemon thread; returns immediately."""
+        if self._thread is None and not self.ready:
+            self._thread = threading.Thread(
+                target=self._warmup, name="recommender-warmup", daemon=True
+            )
+            self._thread.start()
+        return self._thread
+
+    def _warmup(self):
+        try:
+            self.load()
+        except Exception:
+            pass
+
+    def get(self):
+        """
+        The loaded recommender. If a warm-up is running, raises
+        RecommenderNotReady instead of blocking; if none was started, loads inline.
+        """
+        if self.ready:
+            return self.recommender
+        if self._thread is not None and self._thread.is_alive():
+            raise RecommenderNotReady("Recommender is still loading")
+        return self.load()
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        return self._loaded.wait(timeout)
+
+    def _check_field_weights(self, field_weights: dict | None):
+        # Rejected here rather than in the batch, where it would fail every
+        # other request batched with this one.
+        if normalize_field_weights(field_weights) and not self.field_scoring:
+            raise ValueError("Field-weighted scoring is disabled on this server")
+
+    def recommend(
+        self,
+        quiz_answers_text: str,
+        top_n: int = 5,
+        filters: dict | None = None,
+        field_weights: dict | None = None,
+    ):
+        self._check_field_weights(field_weights)
+        self.get()
+        return self.batcher.recommend(quiz_answers_text, top_n, filters, field_weights)
+
+    async def recommend_async(
+        self,
+        quiz_answers_text: str,
+        top_n: int = 5,
+        filters: dict | None = None,
+        field_weights: dict | None = None,
+    ):
+        """
+        Awaitable recommend(): the caller's event loop is free while the batch
+        is encoded (in another thread or process) and scored.
+        """
+        self._check_field_weights(field_weights)
+        if not self.ready:
+            await asyncio.to_thread(self.get)
+        return await asyncio.wrap_future(
+            self.batcher.submit(quiz_answers_text, top_n, filters, field_weights)
+        )
+
+    def _search_table(self, name: str) -> IndexManager:
+        if not self.index_manager.is_ready(name):
+            raise RecommenderNotReady(f"The {name} search index is not available")
+        return self.index_manager
+
+    def search(self, name: str, text: str, k: int = 10) -> list[tuple[int, float]]:
+        self.get()
+        return self._search_table(name).search(name, text, k)
+
+    async def search_async(self, name: str, text: str, k: int = 10):
+        if not self.ready:
+            await asyncio.to_thread(self.get)
+        return await self._search_table(name).search_async(name, text, k)
+
+    def refresh_search(self, name: str):
+        """
+        Queues a rebuild of table `name`'s index after rows were written (only
+        new or changed rows are encoded). Writes arriving while a rebuild runs
+        are coalesced into one more rebuild, so a burst of N writes costs at
+        most two. A no-op until the service has loaded: the first build reads
+        the current table anyway.
+        """
+        worker = self.search_workers.get(name)
+        if worker is not None:
+            worker.submit("refresh")
+
+    def readiness(self) -> dict:
+        return {
+            "status": self.status,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+            "model_name": self.model_name,
+            "embedding_dtype": self.embedding_dtype,
+            "encoder": self.encoder.stats() if self.encoder else None,
+            "encoder_parity": self.parity,
+            "catalog_size": len(self.recommender.catalog) if self.recommender else None,
+        }
+
+    def close(self):
+        for worker in self.search_workers.values():
+            worker.close()
+        if self.reindexer is not None:
+            self.reindexer.close()
+        if self.batcher is not None:
+            self.batcher.close()
+        if self.encoder is not None:
+            self.encoder.close()
+
+
+service = RecommenderService.from_env()
+
+
+def get_recommendations(
+    quiz_answers_text: str,
+    top_n: int = 5,
+    filters: dict | None = None,
+    field_weights: dict | None = None,
+):
+    return service.recommend(quiz_answers_text, top_n, filters, field_weights)
+
+
+async def get_recommendations_async(
+    quiz_answers_text: str,
+    top_n: int = 5,
+    filters: dict | None = None,
+    field_weights: dict | None = None,
+):
+    return await service.recommend_async(
+        quiz_answers_text, top_n, filters, field_weights
+    )